@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Benchmark de precisão x velocidade do Whisper em CPU: fp32 vs. int8 dinâmico.
+
+Transcreve um conjunto fixo de amostras locais (áudio ou vídeo) com cada
+modelo nos dois modos e compara tempo, RTF e:
+- WER, só nas amostras com referência humana (arquivo .txt de mesmo nome);
+- concordância com o fp32 do mesmo modelo (1 - distância de edição entre as
+  palavras das duas transcrições), em todas as amostras. Concordância não é
+  precisão: mede só o quanto a quantização muda a saída.
+
+Uso:
+    python benchmark_quantization.py amostras/ --models tiny base small --language pt
+"""
+import sys
+import os
+import re
+import json
+import time
+import argparse
+import unicodedata
+
+# Adiciona o diretório atual ao path para importar módulos locais
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import torch
+import whisper
+import config
+from transcription import load_whisper_model, SAMPLE_RATE
+
+
+def normalize_words(text):
+    """Minúsculas, sem acentos e sem pontuação"""
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return re.findall(r"\w+", text)
+
+
+def word_error_rate(reference, hypothesis):
+    """WER por distância de edição entre sequências de palavras"""
+    ref = normalize_words(reference)
+    hyp = normalize_words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word)
+            )
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def find_samples(directory):
+    """Arquivos de áudio/vídeo do diretório, em ordem fixa"""
+    extensions = set(config.AUDIO_EXTENSIONS + config.VIDEO_EXTENSIONS)
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if os.path.splitext(name)[1].lower() in extensions
+    )
+
+
+def load_reference(sample_path):
+    text_path = os.path.splitext(sample_path)[0] + '.txt'
+    if os.path.exists(text_path):
+        with open(text_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    return None
+
+
+def run_mode(model_size, quantize, samples, language):
+    """Carrega o modelo em um modo e transcreve todas as amostras"""
+    load_start = time.time()
+    model = load_whisper_model(model_size, "cpu", quantize)
+    load_time = time.time() - load_start
+
+    outputs = []
+    for path, audio in samples:
+        start = time.time()
+        result = model.transcribe(audio, language=language, fp16=False)
+        outputs.append({
+            'sample': os.path.basename(path),
+            'text': result['text'],
+            'time': time.time() - start
+        })
+    del model
+    return load_time, outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Whisper fp32 vs. int8 em CPU')
+    parser.add_argument('samples', help='Diretório com as amostras de áudio/vídeo (e .txt de referência opcionais)')
+    parser.add_argument('--models', nargs='+', default=['tiny', 'base', 'small'], help='Modelos a comparar')
+    parser.add_argument('--language', default='pt', help='Idioma das amostras')
+    parser.add_argument('--threads', type=int, default=os.cpu_count(), help='Threads do PyTorch')
+    parser.add_argument('--output', help='Grava os resultados detalhados em JSON')
+    args = parser.parse_args()
+
+    torch.set_num_threads(args.threads)
+
+    paths = find_samples(args.samples)
+    if not paths:
+        print(f"❌ Nenhuma amostra encontrada em {args.samples}")
+        return 1
+
+    print(f"🎧 Carregando {len(paths)} amostras...")
+    samples = [(path, whisper.load_audio(path)) for path in paths]
+    total_audio = sum(len(audio) for _, audio in samples) / SAMPLE_RATE
+    references = {os.path.basename(path): load_reference(path) for path in paths}
+    print(f"   {total_audio:.1f}s de áudio, {sum(1 for r in references.values() if r)} referências .txt")
+
+    report = []
+    for model_size in args.models:
+        baseline = None
+        for quantize in (False, True):
+            mode = 'int8' if quantize else 'fp32'
+            print(f"\n🚀 {model_size} ({mode})...")
+            load_time, outputs = run_mode(model_size, quantize, samples, args.language)
+
+            if baseline is None:
+                baseline = {o['sample']: o['text'] for o in outputs}
+
+            errors = []
+            agreements = []
+            for output in outputs:
+                reference = references[output['sample']]
+                output['wer'] = word_error_rate(reference, output['text']) if reference else None
+                if output['wer'] is not None:
+                    errors.append(output['wer'])
+                output['agreement'] = max(0.0, 1 - word_error_rate(baseline[output['sample']], output['text']))
+                agreements.append(output['agreement'])
+
+            elapsed = sum(o['time'] for o in outputs)
+            report.append({
+                'model': model_size,
+                'mode': mode,
+                'load_time': load_time,
+                'time': elapsed,
+                'rtf': elapsed / total_audio if total_audio else 0.0,
+                'wer': sum(errors) / len(errors) if errors else None,
+                'agreement': sum(agreements) / len(agreements),
+                'samples': outputs
+            })
+
+    print("\n📊 Resultado (WER só contra .txt; concordância contra o fp32 do mesmo modelo)")
+    print(f"{'Modelo':<8} {'Modo':<5} {'Carga(s)':>9} {'Tempo(s)':>9} {'RTF':>6} {'WER':>7} {'Concord.':>9}")
+    for row in report:
+        wer = f"{row['wer'] * 100:>6.1f}%" if row['wer'] is not None else f"{'-':>7}"
+        print(f"{row['model']:<8} {row['mode']:<5} {row['load_time']:>9.1f} {row['time']:>9.1f} "
+              f"{row['rtf']:>6.3f} {wer} {row['agreement'] * 100:>8.1f}%")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Detalhes gravados em {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
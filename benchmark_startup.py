@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark do tempo de inicialização do modo de consulta (somente leitura).
+
+Em processos novos mede:
+- o tempo de importar orchestrator, search_engine e web_interface, e quais
+  pacotes pesados (torch, whisper, transformers, cv2, sklearn) entraram no
+  grafo de imports;
+- o tempo total de `orchestrator.py summary` e `orchestrator.py search -q`.
+
+Sai com código 1 se algum comando de consulta passar de --max-seconds ou se
+algum import de consulta carregar um pacote pesado.
+
+Uso:
+    python benchmark_startup.py --query "aula" --repeat 3 --max-seconds 1.0
+"""
+import sys
+import os
+import time
+import argparse
+import subprocess
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+HEAVY_MODULES = ['torch', 'whisper', 'transformers', 'cv2', 'sklearn', 'moviepy', 'librosa']
+
+IMPORT_PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(f"{{elapsed:.4f}} {{','.join(heavy)}}")
+"""
+
+
+def measure_import(module):
+    """
+    Importa o módulo em um processo novo; retorna (segundos, pacotes pesados)
+    """
+    code = IMPORT_PROBE.format(module=module, heavy=HEAVY_MODULES)
+    result = subprocess.run([sys.executable, '-c', code], cwd=BASE_DIR,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        return None, result.stderr.strip().splitlines()[-1:] or ['erro']
+    elapsed, _, heavy = result.stdout.strip().splitlines()[-1].partition(' ')
+    return float(elapsed), [m for m in heavy.split(',') if m]
+
+
+def measure_command(args, repeat):
+    """
+    Menor tempo de parede de `python orchestrator.py <args>` em `repeat` execuções
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, 'orchestrator.py'] + args, cwd=BASE_DIR,
+                                capture_output=True, text=True)
+        elapsed = time.perf_counter() - start
+        if result.returncode != 0:
+            return None
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de inicialização do modo de consulta')
+    parser.add_argument('--query', '-q', default='aula', help='Termo usado no comando search')
+    parser.add_argument('--repeat', type=int, default=3, help='Execuções por comando (usa a menor)')
+    parser.add_argument('--max-seconds', type=float, default=1.0, help='Limite por comando de consulta')
+    args = parser.parse_args()
+
+    failed = False
+
+    print("📦 Imports (processo novo):")
+    for module in ['search_engine', 'orchestrator', 'web_interface']:
+        elapsed, heavy = measure_import(module)
+        if elapsed is None:
+            print(f"   {module:<15} não importado ({heavy[0]})")
+            continue
+        status = f"pesados: {', '.join(heavy)}" if heavy else "sem pacotes pesados"
+        print(f"   {module:<15} {elapsed:6.3f}s  {status}")
+        if heavy:
+            failed = True
+
+    print("\n⏱️  Comandos de consulta:")
+    for command in (['summary'], ['search', '-q', args.query]):
+        elapsed = measure_command(command, args.repeat)
+        label = ' '.join(command)
+        if elapsed is None:
+            print(f"   {label:<25} falhou")
+            failed = True
+            continue
+        ok = elapsed <= args.max_seconds
+        print(f"   {label:<25} {elapsed:6.3f}s  {'✅' if ok else '❌'}")
+        failed = failed or not ok
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,10 +4,67 @@ import os
 WHISPER_MODEL = "tiny"  # Pode ser: tiny, base, small, medium, large (tiny é mais rápido)
 USE_GPU = True  # True para usar GPU (CUDA), False para usar CPU
 GPU_DEVICE = "cuda:0"  # Dispositivo GPU a ser usado (cuda:0, cuda:1, etc.)
+# Quantização dinâmica int8 das camadas lineares do Whisper quando roda em CPU:
+# mais rápido e com menos memória (permite base/small no custo do tiny), com
+# pequena perda de precisão (compare com benchmark_quantization.py)
+WHISPER_CPU_QUANTIZATION = False
 VIDEO_EXTENSIONS = ['.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv']
 AUDIO_EXTENSIONS = ['.mp3', '.wav', '.flac', '.aac', '.m4a']
 IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.bmp', '.webp', '.tiff', '.gif']
 
+# Executável do ffmpeg usado para decodificar áudio direto para memória
+FFMPEG_BINARY = "ffmpeg"
+
+# Leitura de metadados (duração, fps, streams) via ffprobe, com fallback OpenCV
+FFPROBE_BINARY = "ffprobe"
+MEDIA_PROBE_CACHE_SIZE = 4096  # arquivos mantidos no cache de metadados
+MEDIA_PROBE_GOP_WINDOW = 30  # segundos iniciais lidos para estimar o intervalo entre keyframes
+
+# Amostragem de frames para análise visual:
+# 'auto' escolhe pelo GOP/duração; 'seek' posiciona em cada frame (exato, caro
+# com GOP longo); 'sequential' percorre o stream uma vez com grab() e só
+# decodifica em cor os frames escolhidos; 'keyframe' usa o keyframe mais próximo
+FRAME_SAMPLING_STRATEGY = 'auto'
+FRAME_SAMPLING_SEEK_MAX_GOP = 30  # GOP (em frames) até o qual o seek exato é barato
+FRAME_SAMPLING_DEFAULT_GOP = 250  # GOP assumido (frames) quando não é possível medir
+# Orçamento de frames da análise visual, proporcional à duração do vídeo
+FRAME_SAMPLING_PER_MINUTE = 4  # frames amostrados por minuto de vídeo
+FRAME_SAMPLING_MIN_FRAMES = 6  # mínimo por vídeo (vídeos curtos)
+FRAME_SAMPLING_MAX_FRAMES = 120  # máximo por vídeo (vídeos longos)
+FRAME_SAMPLING_DEFAULT_FRAMES = 10  # quando a duração é desconhecida
+FRAME_SAMPLING_TIME_BUDGET = 20  # segundos de decodificação por vídeo na amostragem (0 = sem limite)
+
+# Análise visual dos frames amostrados (visual_features.py)
+VISUAL_ANALYSIS_WIDTH = 480  # largura (px) para onde os frames são reduzidos antes da análise
+FACE_DETECTION_WIDTH = 960  # largura máxima (px) dos frames na detecção de faces (0 = resolução original)
+SCENE_CHANGE_CORRELATION = 0.7  # correlação de histograma abaixo da qual há mudança de cena
+
+# Leitura única do container (media_reader.py): um só ffmpeg entrega o áudio
+# para a transcrição e frames reduzidos para a análise visual (POSIX)
+SINGLE_PASS_MEDIA_READ = True
+MEDIA_READER_FPS = 4  # frames por segundo entregues à análise visual / detecção de cortes
+
+# Detecção de voz (VAD) antes do Whisper: só trechos com fala são transcritos
+VAD_ENABLED = True
+VAD_FRAME_MS = 30  # duração de cada quadro analisado
+VAD_ENERGY_MARGIN_DB = 12  # dB acima do ruído de fundo estimado
+VAD_MIN_ENERGY_DB = -50  # energia mínima absoluta (dBFS) para considerar fala
+VAD_MAX_SPECTRAL_FLATNESS = 0.5  # acima disso o quadro é tratado como ruído
+VAD_MIN_SPEECH_BAND_RATIO = 0.5  # fração mínima da energia na banda de voz (150-4000 Hz)
+VAD_MIN_ENERGY_MODULATION_DB = 3.0  # desvio de energia mínimo (fala oscila, música contínua não)
+VAD_MIN_SPEECH_MS = 250  # trechos de fala mais curtos são descartados
+VAD_MIN_SILENCE_MS = 500  # pausas mais curtas não separam trechos
+VAD_PADDING_MS = 300  # margem adicionada em volta de cada trecho
+
+# Transcrição multilíngue: um segundo idioma só é transcrito se a detecção
+# de idioma indicar pelo menos esta probabilidade (ou se for forçado)
+MULTILINGUAL_MIN_LANGUAGE_PROB = 0.2
+
+# Cache de transcrições endereçado pelo conteúdo do áudio (+ modelo e opções)
+TRANSCRIPTION_CACHE_ENABLED = True
+TRANSCRIPTION_CACHE_DIR = "transcription_cache"
+TRANSCRIPTION_CACHE_MAX_MB = 512  # acima disso as entradas menos usadas são removidas
+
 # Configurações de banco de dados
 DB_PATH = "video_database.db"
 
@@ -16,10 +73,72 @@ USE_MONGO = True  # True para usar MongoDB, False para SQLite
 MONGODB_URI = "mongodb://localhost:27017"  # URI de conexão do MongoDB
 MONGODB_DATABASE = "video_orchestrator"  # Nome da base de dados
 
+# Modelos de IA (carregados sob demanda pelo model_registry.py)
+IMAGE_CAPTION_MODEL = "nlpconnect/vit-gpt2-image-captioning"  # legendas de imagens
+IMAGE_CLASSIFIER_MODEL = "google/vit-base-patch16-224"  # classificação de imagens
+MODEL_REGISTRY_MAX_RSS_MB = 0  # acima deste RSS descarrega os modelos menos usados (0 = sem limite)
+IMAGE_BATCH_SIZE = 8  # imagens por lote nos pipelines de legenda/classificação
+IMAGE_PREFETCH_WORKERS = 4  # threads que leem e pré-processam as imagens do próximo lote
+IMAGE_DECODE_MIN_SIDE = 448  # JPEG decodificado em escala reduzida mantendo este lado mínimo (0 = resolução cheia)
+IMAGE_ANALYSIS_MAX_SIDE = 1024  # maior lado (px) da cópia usada nas features visuais e nos modelos (0 = sem limite)
+IMAGE_SHARPNESS_SIDE = 512  # escala fixa (maior lado, px) em que a nitidez é medida
+IMAGE_SHARPNESS_THRESHOLD = 100  # variância do Laplaciano acima da qual a imagem é considerada nítida
+IMAGE_MAX_PAGES = 16  # páginas de TIFF / quadros de GIF analisados por imagem (espaçados uniformemente)
+IMAGE_MAX_PIXELS = 1_000_000_000  # limite do PIL contra "decompression bomb" (pixels por página; 0 = sem limite)
+# Imagens quase idênticas (pHash/dHash) reaproveitam legenda e classificação
+IMAGE_DEDUP_ENABLED = True
+IMAGE_DEDUP_MAX_DISTANCE = 6  # distância de Hamming máxima (de 64 bits) em cada hash
+IMAGE_DEDUP_MIN_STD = 3.0  # desvio padrão mínimo de cinza (cópia 32x32) para gerar hashes; abaixo, imagem lisa
+IMAGE_DEDUP_FLAT_BITS = 4  # dHash com até este nº de bits 1 (ou 0) vem de imagem lisa e não é indexado
+
 # Configurações de processamento
 BATCH_SIZE = 16
 MAX_WORKERS = 4
-CHUNK_DURATION = 30  # segundos para dividir vídeos muito longos
+CHUNK_DURATION = 30  # segundos por bloco na transcrição em blocos de áudios longos
+
+# Transcrição em blocos paralelos (apenas quando o Whisper roda em CPU)
+CHUNKED_TRANSCRIPTION = True
+CHUNKED_TRANSCRIPTION_MIN_DURATION = 600  # áudios mais longos que isso (s) são divididos
+CHUNK_OVERLAP = 2  # segundos de sobreposição entre blocos vizinhos
+CHUNK_SILENCE_SEARCH = 5  # segundos ao redor do corte nominal para procurar silêncio
+
+# Pool de processos de transcrição (cada worker carrega o Whisper uma vez)
+TRANSCRIPTION_WORKERS = MAX_WORKERS  # workers quando o Whisper roda em CPU
+TRANSCRIPTION_GPU_WORKERS = 1  # workers quando roda em GPU (cada um ocupa memória da placa)
+TRANSCRIPTION_WORKER_LOAD_TIMEOUT = 600  # prazo (s) para um worker carregar o modelo
+TRANSCRIPTION_PROGRESS_INTERVAL = 1.0  # intervalo (s) de atualização da barra de progresso
+
+# Prazos da transcrição: duração do áudio x RTF medido x segurança + margem.
+# O RTF (segundos de processamento por segundo de áudio) é medido por
+# modelo/dispositivo e persistido entre execuções.
+TRANSCRIPTION_RTF_FILE = "transcription_rtf.json"
+TRANSCRIPTION_DEFAULT_RTF = 1.0  # estimativa conservadora antes da primeira medição
+TRANSCRIPTION_RTF_SMOOTHING = 0.2  # peso de cada nova medição na média móvel
+TRANSCRIPTION_RTF_MIN_AUDIO = 5  # áudios mais curtos (s) não entram na estatística
+TRANSCRIPTION_DEADLINE_SAFETY = 3.0  # multiplicador sobre o tempo esperado
+TRANSCRIPTION_DEADLINE_MARGIN = 30  # segundos fixos somados ao prazo
+TRANSCRIPTION_UNKNOWN_DURATION_TIMEOUT = 600  # prazo quando a duração não pode ser lida
+
+# Configurações do pipeline em estágios (orchestrator.py process --pipeline)
+PIPELINE_QUEUE_SIZE = 4  # itens aguardando entre um estágio e outro
+PIPELINE_STAGE_WORKERS = {
+    'decode': MAX_WORKERS,  # leitura do container (áudio + frames para a análise visual)
+    'transcribe': MAX_WORKERS,  # threads que despacham jobs para o pool de transcrição
+    'analyze': MAX_WORKERS,  # análise visual, classificação e keywords
+    'persist': 1  # SQLite aceita apenas um escritor por vez
+}
+
+# Detecção de cortes no vídeo inteiro (VideoAnalyzer.detect_scenes)
+SCENE_DETECTION_ENABLED = True
+SCENE_DETECTION_FPS = 4  # frames analisados por segundo de vídeo
+SCENE_DETECTION_WIDTH = 160  # largura (px) dos frames analisados
+SCENE_DETECTION_THRESHOLD = 0.6  # correlação de histograma abaixo da qual há corte
+SCENE_MIN_DURATION = 1.0  # segundos mínimos entre dois cortes
+SCENE_DETECTION_WORKERS = MAX_WORKERS  # threads, cada uma em um trecho da linha do tempo
+SCENE_MIN_SEGMENT_DURATION = 60  # trechos mais curtos (s) não são divididos entre threads
+SCENE_DETECTION_KEYFRAME_MAX_GOP = 2.0  # GOP (s) até o qual só os keyframes são decodificados (-skip_frame nokey); 0 = sempre decodifica tudo
+SCENE_DYNAMIC_RATE = 8  # cortes por minuto acima dos quais o vídeo é "dinâmico"
+SCENE_STATIC_RATE = 1  # cortes por minuto abaixo dos quais o vídeo é "estático"
 
 # Configurações de categorização
 CATEGORIES = [
@@ -52,5 +171,55 @@ IMAGE_CATEGORIES = [
     "outros"
 ]
 
+# Palavras-chave por categoria usadas na classificação de vídeos (pela
+# transcrição). A busca casa palavras inteiras e ignora acentos e maiúsculas.
+VIDEO_CATEGORY_KEYWORDS = {
+    'educacao': ['aula', 'ensino', 'aprender', 'estudar', 'explicar', 'conhecimento', 'educação'],
+    'entretenimento': ['diversão', 'entretenimento', 'filme', 'série', 'comédia', 'drama'],
+    'noticias': ['notícia', 'jornal', 'informação', 'reportagem', 'atualidade'],
+    'esportes': ['futebol', 'basquete', 'esporte', 'jogo', 'competição', 'atleta'],
+    'tecnologia': ['tecnologia', 'computador', 'software', 'programação', 'digital'],
+    'culinaria': ['receita', 'cozinhar', 'comida', 'ingrediente', 'culinária'],
+    'musica': ['música', 'cantar', 'instrumento', 'banda', 'som', 'melodia'],
+    'gaming': ['game', 'jogo', 'jogar', 'gamer', 'gameplay', 'videogame'],
+    'tutorial': ['como fazer', 'tutorial', 'passo a passo', 'ensinar', 'guia'],
+    'documentario': ['documentário', 'história', 'realidade', 'investigação'],
+    'adulto': ['sexo', 'adulto', 'íntimo', 'sensual', 'erótico', 'pornô'],
+    'outros': []
+}
+
+# Palavras-chave por categoria usadas na classificação de imagens (pela
+# legenda e pelos rótulos do classificador)
+IMAGE_CATEGORY_KEYWORDS = {
+    'educacao': ['classroom', 'book', 'study', 'education', 'aula', 'livro', 'estudo'],
+    'entretenimento': ['entertainment', 'fun', 'party', 'diversão', 'festa'],
+    'arte': ['art', 'painting', 'drawing', 'sculpture', 'arte', 'pintura', 'desenho'],
+    'natureza': ['nature', 'landscape', 'tree', 'flower', 'natureza', 'paisagem', 'árvore'],
+    'pessoas': ['person', 'people', 'face', 'portrait', 'pessoa', 'pessoas', 'rosto'],
+    'tecnologia': ['computer', 'technology', 'device', 'computador', 'tecnologia'],
+    'comida': ['food', 'meal', 'cooking', 'comida', 'refeição', 'cozinha'],
+    'veiculos': ['car', 'vehicle', 'transportation', 'carro', 'veículo', 'transporte'],
+    'arquitetura': ['building', 'house', 'architecture', 'prédio', 'casa', 'arquitetura'],
+    'outros': []
+}
+
+# Impressão digital perceptual de vídeos (reaproveita cópias já processadas)
+VIDEO_FINGERPRINT_ENABLED = True
+VIDEO_FINGERPRINT_POSITIONS = 16  # frames (dHash de 64 bits) ao longo da linha do tempo
+VIDEO_FINGERPRINT_THRESHOLD = 0.9  # similaridade mínima (1 - Hamming médio) para considerar duplicata
+VIDEO_FINGERPRINT_DURATION_TOLERANCE = 0.02  # diferença máxima de duração (fração) entre as cópias
+VIDEO_FINGERPRINT_FLAT_BITS = 4  # dHash com até este nº de bits diferentes de 0 (ou de 1) vem de frame liso
+VIDEO_FINGERPRINT_STATIC_BITS = 4  # posições a até esta distância da primeira contam como a mesma imagem
+# Confirmação pelo áudio: curva de energia (dBFS) em trechos iguais da duração
+AUDIO_SIGNATURE_SEGMENTS = 64
+AUDIO_SIGNATURE_MIN_STD_DB = 1.0  # abaixo disso (silêncio, tom constante) não há assinatura
+AUDIO_SIGNATURE_THRESHOLD = 0.9  # correlação mínima entre as curvas para confirmar a duplicata
+
+# Extração de keywords: frequência de documentos (IDF) acumulada por corpus
+# (vídeos, imagens) e persistida entre execuções
+KEYWORD_MODEL_DIR = "keyword_models"
+KEYWORD_MODEL_SAVE_EVERY = 20  # documentos novos entre gravações do modelo em disco
+KEYWORD_STOP_WORDS = ['de', 'da', 'do', 'para', 'com', 'em', 'no', 'na', 'um', 'uma', 'o', 'a', 'e', 'que']
+
 # Modelo de classificação de texto (HuggingFace)
 TEXT_CLASSIFIER_MODEL = "neuralmind/bert-base-portuguese-cased"
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text, Float
+from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text, Float, inspect, text, func
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
@@ -25,6 +25,11 @@ class VideoRecord(Base):
     confidence_score = Column(Float)
     keywords = Column(Text)  # JSON string com keywords
     
+    # Impressão digital perceptual (dHashes em hex, ver video_analysis.py)
+    fingerprint = Column(String)
+    # Curva de energia do áudio que confirma a duplicata (ver transcription.audio_signature)
+    audio_signature = Column(String)
+    
     # Metadados
     processed_at = Column(DateTime, default=datetime.utcnow)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -32,13 +37,37 @@ class VideoRecord(Base):
     def __repr__(self):
         return f"<VideoRecord(file_name='{self.file_name}', category='{self.category}')>"
 
+class VideoFingerprintBand(Base):
+    """
+    Índice de quase-duplicatas: uma linha por faixa de cada hash da
+    impressão digital do vídeo
+    """
+    __tablename__ = 'video_fingerprint_bands'
+    
+    id = Column(Integer, primary_key=True)
+    video_id = Column(Integer, nullable=False, index=True)
+    band = Column(String, nullable=False, index=True)
+
 class DatabaseManager:
     def __init__(self, db_path=config.DB_PATH):
         self.engine = create_engine(f'sqlite:///{db_path}')
         Base.metadata.create_all(self.engine)
+        self._add_missing_columns()
         Session = sessionmaker(bind=self.engine)
         self.session = Session()
     
+    def _add_missing_columns(self):
+        """
+        Bancos criados antes de novas colunas: create_all não altera tabelas
+        existentes, então as colunas que faltam são adicionadas aqui
+        """
+        existing = {column['name'] for column in inspect(self.engine).get_columns('videos')}
+        with self.engine.begin() as connection:
+            for column in VideoRecord.__table__.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(dialect=self.engine.dialect)
+                    connection.execute(text(f"ALTER TABLE videos ADD COLUMN {column.name} {column_type}"))
+    
     def add_video(self, video_record):
         self.session.add(video_record)
         self.session.commit()
@@ -64,5 +93,39 @@ class DatabaseManager:
     def get_all_videos(self):
         return self.session.query(VideoRecord).all()
     
+    def update_videos(self, updates):
+        """
+        Atualização em lote: lista de dicts com 'id' e as colunas a alterar,
+        gravada em uma única transação
+        """
+        self.session.bulk_update_mappings(VideoRecord, updates)
+        self.session.commit()
+    
+    def save_fingerprint(self, video_id, fingerprint, bands):
+        """
+        Grava a impressão digital do vídeo e suas faixas no índice
+        """
+        self.session.query(VideoRecord).filter_by(id=video_id).update({'fingerprint': fingerprint})
+        self.session.query(VideoFingerprintBand).filter_by(video_id=video_id).delete()
+        self.session.bulk_save_objects([VideoFingerprintBand(video_id=video_id, band=band) for band in bands])
+        self.session.commit()
+    
+    def get_fingerprint_candidates(self, bands, limit=10):
+        """
+        Vídeos que compartilham faixas com a impressão digital, do que tem
+        mais faixas em comum ao que tem menos
+        """
+        if not bands:
+            return []
+        matches = self.session.query(
+            VideoFingerprintBand.video_id, func.count(VideoFingerprintBand.id).label('shared')
+        ).filter(
+            VideoFingerprintBand.band.in_(bands)
+        ).group_by(VideoFingerprintBand.video_id).order_by(text('shared DESC')).limit(limit).all()
+        
+        ids = [video_id for video_id, _ in matches]
+        records = {v.id: v for v in self.session.query(VideoRecord).filter(VideoRecord.id.in_(ids)).all()}
+        return [records[video_id] for video_id in ids if video_id in records]
+    
     def close(self):
         self.session.close()
@@ -137,7 +137,8 @@ class MongoManager:
             image_doc = self.images.find_one({"file_path": doc["file_path"]}, {"_id": 1})
             return str(image_doc["_id"]) if image_doc else None
             
-        except Exception as e:\n            self.logger.error(f"Erro ao salvar imagem: {e}")
+        except Exception as e:
+            self.logger.error(f"Erro ao salvar imagem: {e}")
             return None
     
     def get_video_by_path(self, file_path: str) -> Optional[Dict]:
@@ -246,6 +247,22 @@ class MongoManager:
             self.logger.error(f"Erro ao buscar todas as imagens: {e}")
             return []
     
+    def get_image_hashes(self, directory: Optional[str] = None) -> List[Dict]:
+        """
+        Imagens com hash perceptual salvo (para o índice de duplicatas),
+        opcionalmente só de um diretório
+        """
+        try:
+            query = {"perceptual_hash": {"$exists": True}}
+            if directory:
+                query["directory"] = directory
+            projection = {"file_path": 1, "directory": 1, "perceptual_hash": 1,
+                          "caption": 1, "keywords": 1, "classification": 1}
+            return list(self.images.find(query, projection))
+        except Exception as e:
+            self.logger.error(f"Erro ao buscar hashes de imagens: {e}")
+            return []
+    
     def get_directory_summary(self, directory: str) -> Dict[str, Any]:
         """
         Retorna resumo estatístico de um diretório específico
@@ -3,9 +3,233 @@ import cv2
 import numpy as np
 from PIL import Image
 import logging
-from transformers import pipeline
-from sklearn.feature_extraction.text import TfidfVectorizer
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import config
+from model_registry import get_model_registry, load_pipeline
+from visual_features import get_face_detector
+from text_matcher import KeywordMatcher
+from keyword_model import get_keyword_model
+from video_analysis import frame_dhash
+
+
+def image_phash(gray):
+    """
+    pHash de 64 bits: DCT da imagem em 32x32 tons de cinza e comparação das
+    8x8 frequências mais baixas com a mediana. Resiste a redimensionamento,
+    recompressão e pequenos ajustes de brilho.
+    """
+    small = cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA).astype(np.float32)
+    low = cv2.dct(small)[:8, :8].flatten()
+    bits = low > np.median(low[1:])
+    return int(''.join('1' if bit else '0' for bit in bits), 2)
+
+
+def image_hashes(rgb):
+    """
+    Hashes perceptuais da imagem: {'phash', 'dhash'} em hex (16 dígitos).
+    None para imagens quase lisas (desvio de cinza abaixo de
+    config.IMAGE_DEDUP_MIN_STD): os hashes delas são todos iguais (ou ruído)
+    e transformariam imagens diferentes em "duplicatas".
+    """
+    # Reduz antes de converter para cinza (os hashes só usam 32x32)
+    small = cv2.resize(rgb, (32, 32), interpolation=cv2.INTER_AREA)
+    gray = cv2.cvtColor(small, cv2.COLOR_RGB2GRAY)
+    if gray.std() < config.IMAGE_DEDUP_MIN_STD:
+        return None
+    return {'phash': f"{image_phash(gray):016x}", 'dhash': f"{frame_dhash(gray):016x}"}
+
+
+def hashes_are_informative(hashes):
+    """
+    False sem hashes ou com dHash de imagem lisa (quase todos os bits iguais),
+    como os já salvos de imagens que saturavam na decodificação
+    """
+    if not hashes:
+        return False
+    bits = bin(int(hashes['dhash'], 16)).count('1')
+    return config.IMAGE_DEDUP_FLAT_BITS < bits < 64 - config.IMAGE_DEDUP_FLAT_BITS
+
+
+def hamming_distance(first, second):
+    return bin(first ^ second).count('1')
+
+
+class BKTree:
+    """
+    Árvore BK sobre hashes de 64 bits com distância de Hamming: a busca por
+    raio só visita os ramos que podem conter hashes dentro do raio
+    (desigualdade triangular), em vez de comparar com todos.
+    """
+    
+    def __init__(self):
+        self.root = None  # [hash, valor, {distância: filho}]
+        self.size = 0
+    
+    def add(self, key, value):
+        self.size += 1
+        if self.root is None:
+            self.root = [key, value, {}]
+            return
+        node = self.root
+        while True:
+            distance = hamming_distance(key, node[0])
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [key, value, {}]
+                return
+            node = child
+    
+    def search(self, key, max_distance):
+        """
+        [(distância, valor)] dos hashes a até max_distance bits, do mais próximo ao mais distante
+        """
+        results = []
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node_key, value, children = stack.pop()
+            distance = hamming_distance(key, node_key)
+            if distance <= max_distance:
+                results.append((distance, value))
+            for child_distance, child in children.items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    stack.append(child)
+        results.sort(key=lambda result: result[0])
+        return results
+
+
+class ImageHashIndex:
+    """
+    Índice das imagens já descritas por hash perceptual. A árvore BK é
+    indexada pelo pHash; o dHash confirma a correspondência para evitar
+    falsos positivos. Cada entrada guarda a descrição reaproveitável
+    (legenda, keywords, classificação) da imagem.
+    """
+    
+    def __init__(self, max_distance=config.IMAGE_DEDUP_MAX_DISTANCE):
+        self.max_distance = max_distance
+        self._tree = BKTree()
+        self._lock = threading.Lock()
+    
+    def __len__(self):
+        return self._tree.size
+    
+    def add(self, hashes, description):
+        if not hashes_are_informative(hashes):
+            return
+        with self._lock:
+            self._tree.add(int(hashes['phash'], 16), (int(hashes['dhash'], 16), description))
+    
+    def find_all(self, hashes):
+        """
+        [(distância pHash + dHash, descrição)] das imagens conhecidas dentro
+        do limite nos dois hashes (nenhuma para imagens lisas)
+        """
+        if not hashes_are_informative(hashes):
+            return []
+        dhash = int(hashes['dhash'], 16)
+        with self._lock:
+            candidates = self._tree.search(int(hashes['phash'], 16), self.max_distance)
+        return [(distance + hamming_distance(dhash, known_dhash), description)
+                for distance, (known_dhash, description) in candidates
+                if hamming_distance(dhash, known_dhash) <= self.max_distance]
+    
+    def find(self, hashes):
+        """
+        (distância, descrição) da imagem conhecida mais próxima, ou None
+        """
+        matches = self.find_all(hashes)
+        return min(matches, key=lambda match: match[0]) if matches else None
+
+
+def duplicate_clusters(images, max_distance=config.IMAGE_DEDUP_MAX_DISTANCE):
+    """
+    Grupos de imagens quase idênticas. images: [{'file_path', 'perceptual_hash'}].
+    Retorna listas de file_path (só grupos com 2+ imagens), maiores primeiro.
+    """
+    index = ImageHashIndex(max_distance)
+    parent = {}
+    
+    def root(path):
+        while parent[path] != path:
+            parent[path] = parent[parent[path]]
+            path = parent[path]
+        return path
+    
+    for image in images:
+        hashes = image.get('perceptual_hash')
+        if not hashes:
+            continue
+        path = image['file_path']
+        parent[path] = path
+        for _, known_path in index.find_all(hashes):
+            parent[root(known_path)] = root(path)
+        index.add(hashes, path)
+    
+    groups = defaultdict(list)
+    for path in parent:
+        groups[root(path)].append(path)
+    return sorted((sorted(group) for group in groups.values() if len(group) > 1), key=len, reverse=True)
+
+
+class PixelLimit:
+    """
+    Troca o limite de pixels do PIL contra "decompression bomb" (padrão
+    ~179 MP, que recusa scans grandes como um TIFF 14000x13000) por
+    config.IMAGE_MAX_PIXELS enquanto houver alguma decodificação em
+    andamento. O PIL confere o limite no open e de novo ao carregar a
+    página, e Image.MAX_IMAGE_PIXELS é global: as threads de prefetch
+    contam quantas estão dentro e a última a sair restaura o valor anterior.
+    A memória é controlada reduzindo cada página no modo nativo.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._users = 0
+        self._previous = None
+    
+    def __enter__(self):
+        with self._lock:
+            if self._users == 0:
+                self._previous = Image.MAX_IMAGE_PIXELS
+                Image.MAX_IMAGE_PIXELS = config.IMAGE_MAX_PIXELS or None
+            self._users += 1
+        return self
+    
+    def __exit__(self, *exc_info):
+        with self._lock:
+            self._users -= 1
+            if self._users == 0:
+                Image.MAX_IMAGE_PIXELS = self._previous
+        return False
+
+
+_pixel_limit = PixelLimit()
+
+
+def to_8bit(page):
+    """
+    Converte páginas de 16 bits, inteiras (I) ou float (F) para tons de
+    cinza de 8 bits (modo L) escalando os valores: convert('RGB') apenas
+    satura (um gradiente de 16 bits vira branco, um TIFF float vira preto).
+    16 bits e inteiros em 0..65535 usam >> 8 (como o cv2.imread); float em
+    0..1 usa * 255; outras faixas são esticadas do mínimo ao máximo.
+    """
+    if page.mode.startswith('I;16'):
+        return page.point(lambda value: value * (1 / 256), 'L')
+    low, high = page.getextrema()
+    if page.mode == 'F' and low >= 0 and high <= 1:
+        scale, offset = 255.0, 0.0
+    elif page.mode == 'I' and low >= 0 and high <= 65535:
+        scale, offset = (1 / 256 if high > 255 else 1.0), 0.0
+    else:
+        scale = 255.0 / (high - low) if high > low else 0.0
+        offset = -low * scale
+    if page.mode == 'I':
+        return page.point(lambda value: value * scale + offset, 'L')
+    return page.point(lambda value: value * scale + offset).convert('L')
+
 
 class ImageAnalyzer:
     """
@@ -18,78 +242,253 @@ class ImageAnalyzer:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         
-        # Pipeline de geração de legendas
-        try:
-            self.captioner = pipeline(
-                "image-to-text",
-                model="nlpconnect/vit-gpt2-image-captioning"
-            )
-            self.logger.info("Pipeline de legendas carregado com sucesso")
-        except Exception as e:
-            self.logger.warning(f"Erro ao carregar modelo de legendas: {e}")
-            self.captioner = None
+        # Pipelines de legenda e classificação vêm do registro (carga no primeiro uso)
+        self.models = get_model_registry()
         
-        # Pipeline de classificação de imagens (opcional)
-        try:
-            self.image_classifier = pipeline(
-                "image-classification",
-                model="google/vit-base-patch16-224"
-            )
-        except Exception as e:
-            self.logger.warning(f"Erro ao carregar classificador de imagens: {e}")
-            self.image_classifier = None
+        # Estatísticas de documentos do corpus de imagens para extração de keywords
+        self.keyword_model = get_keyword_model('images')
         
-        # Vectorizador para extração de keywords
-        self.vectorizer = TfidfVectorizer(
-            max_features=50,
-            stop_words=['de', 'da', 'do', 'para', 'com', 'em', 'no', 'na', 'um', 'uma', 'o', 'a', 'e', 'que']
+        # Palavras-chave das categorias compiladas uma única vez
+        self.category_matcher = KeywordMatcher(config.IMAGE_CATEGORY_KEYWORDS)
+        
+        # Hashes perceptuais das imagens já descritas (quase-duplicatas reaproveitam a descrição)
+        self.hash_index = ImageHashIndex()
+    
+    @property
+    def captioner(self):
+        """
+        Pipeline de geração de legendas (None se o modelo não carregar)
+        """
+        return self.models.get(
+            f"image-to-text:{config.IMAGE_CAPTION_MODEL}",
+            load_pipeline("image-to-text", config.IMAGE_CAPTION_MODEL)
         )
     
+    @property
+    def image_classifier(self):
+        """
+        Pipeline de classificação de imagens (opcional)
+        """
+        return self.models.get(
+            f"image-classification:{config.IMAGE_CLASSIFIER_MODEL}",
+            load_pipeline("image-classification", config.IMAGE_CLASSIFIER_MODEL)
+        )
+    
+    def register_known_image(self, image_doc):
+        """
+        Inclui no índice de duplicatas uma imagem já salva (documento com
+        file_path, perceptual_hash, caption, keywords e classification)
+        """
+        if image_doc.get('perceptual_hash'):
+            self.hash_index.add(image_doc['perceptual_hash'], image_doc)
+    
     def describe_image(self, image_path):
         """
         Gera descrição completa de uma imagem
         """
+        return self.describe_images([image_path], batch_size=1)[0]
+    
+    def describe_images(self, image_paths, batch_size=config.IMAGE_BATCH_SIZE,
+                        workers=config.IMAGE_PREFETCH_WORKERS):
+        """
+        Descrição de várias imagens, na ordem de entrada (None nas que falharem)
+        """
+        return [result for _, result in self.iter_describe_images(image_paths, batch_size, workers)]
+    
+    def iter_describe_images(self, image_paths, batch_size=config.IMAGE_BATCH_SIZE,
+                             workers=config.IMAGE_PREFETCH_WORKERS):
+        """
+        Gera (caminho, descrição) na ordem de entrada. As imagens são lidas e
+        pré-processadas por um pool de threads (o lote seguinte é lido enquanto
+        os modelos processam o atual) e legenda e classificação rodam em lotes
+        de batch_size imagens.
+        Imagens quase idênticas (hash perceptual) a uma já descrita, salva ou
+        do mesmo lote, reaproveitam a legenda, as keywords e a classificação
+        sem passar pelos modelos ('duplicate_of' indica a origem).
+        """
+        image_paths = list(image_paths)
+        batches = [image_paths[i:i + batch_size] for i in range(0, len(image_paths), batch_size)]
+        if not batches:
+            return
+        
+        captioner = self.captioner
+        image_classifier = self.image_classifier
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = [executor.submit(self._prepare_image, path) for path in batches[0]]
+            for index, batch in enumerate(batches):
+                prepared = [future.result() for future in pending]
+                if index + 1 < len(batches):
+                    pending = [executor.submit(self._prepare_image, path) for path in batches[index + 1]]
+                
+                loaded = []
+                duplicates = []
+                for item in prepared:
+                    if item is None:
+                        continue
+                    match = self.hash_index.find(item['result']['perceptual_hash']) if config.IMAGE_DEDUP_ENABLED else None
+                    if match:
+                        duplicates.append((item, match[1]))
+                    else:
+                        loaded.append(item)
+                        if config.IMAGE_DEDUP_ENABLED:
+                            # A descrição é preenchida abaixo, antes de ser copiada pelas duplicatas do lote
+                            self.hash_index.add(item['result']['perceptual_hash'], item['result'])
+                images = [item['image'] for item in loaded]
+                
+                # Geração de legenda
+                if captioner and images:
+                    for item, caption in zip(loaded, self._caption_batch(images, captioner)):
+                        item['result']['caption'] = caption
+                        if caption:
+                            item['result']['keywords'] = self._extract_keywords_from_text(caption)
+                
+                # Classificação de conteúdo
+                if image_classifier and images:
+                    for item, classification in zip(loaded, self._classify_batch(images, image_classifier)):
+                        item['result']['classification'] = classification
+                
+                for item, source in duplicates:
+                    self._copy_description(item['result'], source)
+                
+                for path, item in zip(batch, prepared):
+                    yield path, item['result'] if item is not None else None
+    
+    def _prepare_image(self, image_path):
+        """
+        Leitura e análise visual básica de uma imagem (roda nas threads de prefetch)
+        """
         try:
             # Verifica se o arquivo existe
             if not os.path.exists(image_path):
                 self.logger.error(f"Arquivo de imagem não encontrado: {image_path}")
                 return None
             
+            # Páginas/quadros decodificados um a um; a primeira página alimenta
+            # os modelos e o hash, as features são agregadas sobre todas
+            rgb = None
+            page_features = []
+            for page_rgb, original_size, page_count in self.iter_image_pages(image_path):
+                if rgb is None:
+                    rgb = page_rgb
+                page_features.append(self._analyze_image_features(page_rgb, original_size))
+            
             result = {
                 'file_path': image_path,
                 'file_name': os.path.basename(image_path),
                 'file_size': os.path.getsize(image_path),
                 'caption': '',
                 'keywords': [],
-                'visual_features': {},
-                'classification': {}
+                'visual_features': self._merge_page_features(page_features, page_count),
+                'classification': {},
+                'perceptual_hash': image_hashes(rgb)
             }
-            
-            # Análise visual básica
-            result['visual_features'] = self._analyze_image_features(image_path)
-            
-            # Geração de legenda
-            if self.captioner:
-                result['caption'] = self._generate_caption(image_path)
-                if result['caption']:
-                    result['keywords'] = self._extract_keywords_from_text(result['caption'])
-            
-            # Classificação de conteúdo
-            if self.image_classifier:
-                result['classification'] = self._classify_image(image_path)
-            
-            return result
+            # Image.fromarray reaproveita a memória do array (sem cópia)
+            return {'image': Image.fromarray(rgb), 'result': result}
             
         except Exception as e:
             self.logger.error(f"Erro ao analisar imagem {image_path}: {str(e)}")
             return None
     
-    def _generate_caption(self, image_path):
+    def load_image(self, image_path):
+        """
+        Decodifica a imagem (primeira página) uma única vez em um array RGB
+        uint8 com o maior lado limitado a config.IMAGE_ANALYSIS_MAX_SIDE.
+        Quem precisar de BGR usa a visão rgb[..., ::-1].
+        Retorna (rgb, (largura, altura) originais).
+        """
+        rgb, original_size, _ = next(self.iter_image_pages(image_path, max_pages=1))
+        return rgb, original_size
+    
+    def iter_image_pages(self, image_path, max_pages=config.IMAGE_MAX_PAGES):
         """
-        Gera legenda para a imagem usando IA
+        Gera (rgb, (largura, altura) originais, total de páginas) para até
+        max_pages páginas de TIFF multipágina ou quadros de GIF animado,
+        espaçados uniformemente. Cada página é reduzida para no máximo
+        config.IMAGE_ANALYSIS_MAX_SIDE ainda no modo nativo (reduce() inteiro
+        + filtro final) e só depois convertida para RGB: não
+        existe cópia RGB em resolução cheia, e só uma página fica decodificada
+        por vez. Em JPEG, o modo draft do PIL já decodifica em escala reduzida
+        (1/2, 1/4 ou 1/8), mantendo os dois lados >= config.IMAGE_DECODE_MIN_SIDE
+        (os modelos usam 224 px). Nenhuma página é descartada pelo tamanho.
+        """
+        max_side = config.IMAGE_ANALYSIS_MAX_SIDE
+        with _pixel_limit, Image.open(image_path) as opened:
+            page_count = getattr(opened, 'n_frames', 1)
+            count = min(page_count, max_pages)
+            indices = sorted({round(i * (page_count - 1) / (count - 1)) for i in range(count)}) if count > 1 else [0]
+            
+            for index in indices:
+                opened.seek(index)
+                original_size = opened.size
+                if config.IMAGE_DECODE_MIN_SIDE:
+                    opened.draft('RGB', (config.IMAGE_DECODE_MIN_SIDE, config.IMAGE_DECODE_MIN_SIDE))
+                
+                page = opened
+                if page.mode in ('1', 'P'):
+                    # Modos sem filtro de redimensionamento: 1 bit vira tons de
+                    # cinza (1 byte/pixel) e paleta vira RGB(A) antes de reduzir
+                    page = page.convert('L' if page.mode == '1' else
+                                        'RGBA' if 'transparency' in page.info else 'RGB')
+                elif page.mode.startswith('I;16'):
+                    # Sem filtro de redimensionamento em 16 bits: 8 bits antes de reduzir
+                    page = to_8bit(page)
+                if max_side and max(page.size) > max_side:
+                    width, height = page.size
+                    scale = max_side / max(width, height)
+                    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+                    # reducing_gap: redução inteira (reduce) no modo nativo antes
+                    # do filtro final; resize devolve uma nova imagem e não mexe
+                    # no quadro aberto (GIF usa o anterior para compor o próximo)
+                    page = page.resize(size, Image.BILINEAR, reducing_gap=2.0)
+                if page.mode in ('I', 'F'):
+                    # Escala depois de reduzir (min/máx da cópia reduzida)
+                    page = to_8bit(page)
+                rgb = np.asarray(page.convert('RGB') if page.mode != 'RGB' else page)
+                yield rgb, original_size, page_count
+                del page, rgb
+    
+    def _copy_description(self, result, source):
+        """
+        Reaproveita a descrição de uma quase-duplicata já descrita
+        """
+        result['caption'] = source.get('caption', '')
+        result['keywords'] = list(source.get('keywords') or [])
+        classification = source.get('classification') or {}
+        # Só os campos do classificador (a categoria é recalculada ao salvar)
+        result['classification'] = {key: classification[key] for key in ('labels', 'top_label', 'confidence')
+                                    if key in classification}
+        result['duplicate_of'] = source.get('file_path')
+    
+    def _caption_batch(self, images, captioner):
+        """
+        Legendas de um lote em uma única chamada do pipeline; se o lote falhar,
+        cada imagem é tentada isoladamente
         """
         try:
-            captions = self.captioner(image_path, max_new_tokens=50)
+            outputs = captioner(images, batch_size=len(images), max_new_tokens=50)
+            return [captions[0]['generated_text'] if captions else "" for captions in outputs]
+        except Exception as e:
+            self.logger.warning(f"Erro na legenda em lote, processando uma a uma: {str(e)}")
+            return [self._generate_caption(image, captioner) for image in images]
+    
+    def _classify_batch(self, images, image_classifier):
+        """
+        Classificação de um lote em uma única chamada do pipeline
+        """
+        try:
+            outputs = image_classifier(images, top_k=5, batch_size=len(images))
+            return [self._format_classification(classifications) for classifications in outputs]
+        except Exception as e:
+            self.logger.warning(f"Erro na classificação em lote, processando uma a uma: {str(e)}")
+            return [self._classify_image(image, image_classifier) for image in images]
+    
+    def _generate_caption(self, image, captioner):
+        """
+        Gera legenda para a imagem (caminho ou PIL.Image) usando IA
+        """
+        try:
+            captions = captioner(image, max_new_tokens=50)
             if captions and len(captions) > 0:
                 return captions[0]['generated_text']
             return ""
@@ -97,50 +496,47 @@ class ImageAnalyzer:
             self.logger.error(f"Erro ao gerar legenda: {str(e)}")
             return ""
     
-    def _classify_image(self, image_path):
+    def _classify_image(self, image, image_classifier):
         """
-        Classifica o conteúdo da imagem
+        Classifica o conteúdo da imagem (caminho ou PIL.Image)
         """
         try:
-            classifications = self.image_classifier(image_path, top_k=5)
-            return {
-                'labels': classifications,
-                'top_label': classifications[0]['label'] if classifications else 'unknown',
-                'confidence': classifications[0]['score'] if classifications else 0.0
-            }
+            return self._format_classification(image_classifier(image, top_k=5))
         except Exception as e:
             self.logger.error(f"Erro ao classificar imagem: {str(e)}")
             return {}
     
-    def _analyze_image_features(self, image_path):
+    def _format_classification(self, classifications):
+        return {
+            'labels': classifications,
+            'top_label': classifications[0]['label'] if classifications else 'unknown',
+            'confidence': classifications[0]['score'] if classifications else 0.0
+        }
+    
+    def _analyze_image_features(self, rgb, original_size):
         """
-        Análise visual básica da imagem
+        Análise visual básica da imagem já decodificada (array RGB de load_image)
         """
         try:
-            # Carrega imagem
-            image = cv2.imread(image_path)
-            if image is None:
-                return {}
-            
-            # Dimensões
-            height, width, channels = image.shape
+            # Dimensões do arquivo (a decodificação pode ter reduzido a escala)
+            width, height = original_size
+            channels = rgb.shape[2]
             
-            # Análise de cores
-            colors = image.reshape(-1, 3)
-            dominant_color = np.mean(colors, axis=0).tolist()
+            # Análise de cores (média em ordem BGR, como antes)
+            colors = rgb.reshape(-1, 3)
+            dominant_color = np.mean(colors, axis=0)[::-1].tolist()
             
             # Brilho médio
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            gray = cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
             brightness = np.mean(gray)
             
-            # Detecção de faces
-            face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-            faces = face_cascade.detectMultiScale(gray, 1.1, 4)
+            # Detecção de faces (detector carregado uma vez e compartilhado)
+            faces = get_face_detector().detect(gray)
             has_faces = len(faces) > 0
             
-            # Análise de nitidez (usando variância do Laplaciano)
-            laplacian_var = cv2.Laplacian(gray, cv2.CV_64F).var()
-            is_sharp = laplacian_var > 100  # Threshold empírico
+            # Análise de nitidez (variância do Laplaciano em escala fixa)
+            laplacian_var = self._sharpness(gray)
+            is_sharp = laplacian_var > config.IMAGE_SHARPNESS_THRESHOLD
             
             return {
                 'width': width,
@@ -158,29 +554,49 @@ class ImageAnalyzer:
             self.logger.error(f"Erro na análise de features: {str(e)}")
             return {}
     
+    def _sharpness(self, gray, side=config.IMAGE_SHARPNESS_SIDE):
+        """
+        Variância do Laplaciano medida sempre com o maior lado em `side` px
+        (nível fixo da pirâmide de análise): a mesma foto em resoluções
+        diferentes dá valores comparáveis. Imagens menores são medidas como estão.
+        """
+        height, width = gray.shape
+        scale = side / max(height, width)
+        if scale < 1:
+            size = (max(1, int(round(width * scale))), max(1, int(round(height * scale))))
+            gray = cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+        return cv2.Laplacian(gray, cv2.CV_64F).var()
+    
+    def _merge_page_features(self, page_features, page_count):
+        """
+        Features de uma imagem multipágina: médias de cor, brilho e nitidez
+        e maior número de faces entre as páginas analisadas (dimensões da primeira)
+        """
+        page_features = [features for features in page_features if features]
+        if len(page_features) <= 1:
+            return page_features[0] if page_features else {}
+        
+        merged = dict(page_features[0])
+        merged['dominant_color'] = np.mean([f['dominant_color'] for f in page_features], axis=0).tolist()
+        merged['brightness'] = float(np.mean([f['brightness'] for f in page_features]))
+        merged['sharpness'] = float(np.mean([f['sharpness'] for f in page_features]))
+        merged['is_sharp'] = merged['sharpness'] > config.IMAGE_SHARPNESS_THRESHOLD
+        merged['face_count'] = max(f['face_count'] for f in page_features)
+        merged['has_faces'] = merged['face_count'] > 0
+        merged['pages'] = page_count
+        merged['pages_analyzed'] = len(page_features)
+        return merged
+    
     def _extract_keywords_from_text(self, text, max_keywords=15):
         """
-        Extrai palavras-chave do texto usando TF-IDF
+        Extrai palavras-chave do texto usando TF-IDF sobre o corpus de imagens
         """
         if not text or len(text.strip()) < 3:
             return []
         
         try:
-            # Preprocessa o texto
-            text_clean = text.lower().strip()
-            
-            # Extrai keywords usando TF-IDF
-            tfidf_matrix = self.vectorizer.fit_transform([text_clean])
-            feature_names = self.vectorizer.get_feature_names_out()
-            tfidf_scores = tfidf_matrix.toarray()[0]
-            
-            # Cria lista de (palavra, score) e ordena por score
-            word_scores = list(zip(feature_names, tfidf_scores))
-            word_scores.sort(key=lambda x: x[1], reverse=True)
-            
-            # Retorna as top palavras-chave
-            keywords = [word for word, score in word_scores[:max_keywords] if score > 0]
-            return keywords
+            # TF da legenda x IDF do corpus (a legenda entra no corpus antes)
+            return self.keyword_model.extract(text, max_keywords)
             
         except Exception as e:
             self.logger.error(f"Erro na extração de keywords: {str(e)}")
@@ -191,46 +607,21 @@ class ImageAnalyzer:
         Categoriza imagem baseada na legenda e features visuais
         """
         try:
-            # Palavras-chave por categoria (similar ao video_analysis.py)
-            category_keywords = {
-                'educacao': ['classroom', 'book', 'study', 'education', 'aula', 'livro', 'estudo'],
-                'entretenimento': ['entertainment', 'fun', 'party', 'diversão', 'festa'],
-                'arte': ['art', 'painting', 'drawing', 'sculpture', 'arte', 'pintura', 'desenho'],
-                'natureza': ['nature', 'landscape', 'tree', 'flower', 'natureza', 'paisagem', 'árvore'],
-                'pessoas': ['person', 'people', 'face', 'portrait', 'pessoa', 'pessoas', 'rosto'],
-                'tecnologia': ['computer', 'technology', 'device', 'computador', 'tecnologia'],
-                'comida': ['food', 'meal', 'cooking', 'comida', 'refeição', 'cozinha'],
-                'veiculos': ['car', 'vehicle', 'transportation', 'carro', 'veículo', 'transporte'],
-                'arquitetura': ['building', 'house', 'architecture', 'prédio', 'casa', 'arquitetura'],
-                'outros': []
-            }
+            # Uma passada pela legenda conta as palavras-chave de todas as categorias
+            scores = dict(self.category_matcher.count(caption))
             
-            text_lower = caption.lower() if caption else ""
-            scores = {}
+            # Usa classificação do modelo se disponível (rótulos ponderados pelo score)
+            if classification and 'labels' in classification:
+                for label_info in classification['labels']:
+                    for category, count in self.category_matcher.count(label_info['label']).items():
+                        scores[category] += count * label_info['score'] * 2
             
-            # Calcula score para cada categoria
-            for category, keywords in category_keywords.items():
-                score = 0
-                for keyword in keywords:
-                    if keyword in text_lower:
-                        score += text_lower.count(keyword)
-                
-                # Adiciona bonus baseado em features visuais
-                if visual_features:
-                    if category == 'pessoas' and visual_features.get('has_faces'):
-                        score += 3
-                    elif category == 'arte' and visual_features.get('brightness', 0) > 120:
-                        score += 1
-                
-                # Usa classificação do modelo se disponível
-                if classification and 'labels' in classification:
-                    for label_info in classification['labels']:
-                        label = label_info['label'].lower()
-                        for keyword in keywords:
-                            if keyword in label:
-                                score += label_info['score'] * 2
-                
-                scores[category] = score
+            # Adiciona bonus baseado em features visuais
+            if visual_features:
+                if visual_features.get('has_faces'):
+                    scores['pessoas'] += 3
+                if visual_features.get('brightness', 0) > 120:
+                    scores['arte'] += 1
             
             # Encontra a categoria com maior score
             if max(scores.values()) == 0:
@@ -0,0 +1,118 @@
+import os
+import re
+import json
+import math
+import atexit
+import hashlib
+import heapq
+import logging
+import threading
+from collections import Counter
+import config
+
+# Mesmo padrão de token do TfidfVectorizer (palavras com 2+ caracteres)
+_TOKEN_RE = re.compile(r"(?u)\b\w\w+\b")
+
+
+class CorpusKeywordModel:
+    """
+    Frequência de documentos (DF) de cada termo em um corpus (vídeos ou
+    imagens), atualizada de forma incremental a cada novo texto e persistida
+    em JSON. As keywords de um texto saem de uma única passada TF x IDF,
+    sem reajustar nenhum vetorizador.
+    """
+
+    def __init__(self, path, stop_words=config.KEYWORD_STOP_WORDS):
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self.stop_words = set(stop_words)
+        self.document_count = 0
+        self.document_frequency = Counter()
+        self._seen = set()
+        self._pending = 0
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.document_count = data['document_count']
+                self.document_frequency = Counter(data['document_frequency'])
+                self._seen = set(data.get('documents', []))
+            except Exception as e:
+                self.logger.warning(f"Modelo de keywords inválido em {path}: {e}")
+
+    def tokenize(self, text):
+        return [t for t in _TOKEN_RE.findall(text.lower()) if t not in self.stop_words]
+
+    def add_document(self, text):
+        """
+        Inclui um texto no corpus (o mesmo texto só é contado uma vez)
+        """
+        tokens = self.tokenize(text)
+        if not tokens:
+            return
+        digest = hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+        with self._lock:
+            if digest in self._seen:
+                return
+            self._seen.add(digest)
+            self.document_count += 1
+            self.document_frequency.update(set(tokens))
+            self._pending += 1
+            if self._pending >= config.KEYWORD_MODEL_SAVE_EVERY:
+                self._save_locked()
+
+    def idf(self, term):
+        # IDF suavizado, como o TfidfVectorizer(smooth_idf=True)
+        return math.log((1 + self.document_count) / (1 + self.document_frequency.get(term, 0))) + 1
+
+    def extract(self, text, max_keywords=20, update=True):
+        """
+        Top termos do texto por TF x IDF do corpus.
+        update=True inclui o texto no corpus antes de pontuar.
+        """
+        if update:
+            self.add_document(text)
+        term_counts = Counter(self.tokenize(text))
+        with self._lock:
+            scored = [(count * self.idf(term), term) for term, count in term_counts.items()]
+        return [term for _, term in heapq.nlargest(max_keywords, scored)]
+
+    def save(self):
+        with self._lock:
+            if self._pending:
+                self._save_locked()
+
+    def _save_locked(self):
+        data = {
+            'document_count': self.document_count,
+            'document_frequency': self.document_frequency,
+            'documents': sorted(self._seen)
+        }
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+            self._pending = 0
+        except Exception as e:
+            self.logger.warning(f"Erro ao gravar modelo de keywords: {e}")
+
+
+_shared_models = {}
+_shared_models_lock = threading.Lock()
+
+
+def get_keyword_model(corpus):
+    """
+    Modelo compartilhado por corpus ('videos' ou 'images'), gravado em
+    config.KEYWORD_MODEL_DIR; alterações pendentes são salvas ao sair
+    """
+    with _shared_models_lock:
+        if corpus not in _shared_models:
+            model = CorpusKeywordModel(os.path.join(config.KEYWORD_MODEL_DIR, f"{corpus}.json"))
+            atexit.register(model.save)
+            _shared_models[corpus] = model
+        return _shared_models[corpus]
@@ -0,0 +1,297 @@
+import os
+import json
+import bisect
+import shutil
+import logging
+import subprocess
+import threading
+from collections import OrderedDict
+import config
+
+
+def find_ffmpeg():
+    """
+    Localiza o executável do ffmpeg: primeiro no PATH (config.FFMPEG_BINARY),
+    depois o binário empacotado pelo imageio-ffmpeg (dependência do moviepy)
+    """
+    path = shutil.which(config.FFMPEG_BINARY)
+    if path:
+        return path
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return None
+
+
+def find_ffprobe():
+    """
+    Localiza o executável do ffprobe no PATH (config.FFPROBE_BINARY) ou ao
+    lado do ffmpeg configurado
+    """
+    path = shutil.which(config.FFPROBE_BINARY)
+    if path:
+        return path
+    ffmpeg = shutil.which(config.FFMPEG_BINARY)
+    if ffmpeg:
+        candidate = os.path.join(os.path.dirname(ffmpeg), os.path.basename(ffmpeg).replace('ffmpeg', 'ffprobe'))
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def _parse_rate(rate):
+    """
+    Converte taxas no formato do ffprobe ("30000/1001") para float
+    """
+    try:
+        num, _, den = str(rate).partition('/')
+        num, den = float(num), float(den or 1)
+        return num / den if den else 0.0
+    except ValueError:
+        return 0.0
+
+
+class MediaProbe:
+    """
+    Leitura rápida dos cabeçalhos do container (duração, fps, nº de frames,
+    resolução e streams), feita uma única vez por arquivo.
+    O cache é indexado por caminho + mtime + tamanho, então um arquivo
+    alterado é lido de novo automaticamente.
+    """
+
+    def __init__(self, max_entries=config.MEDIA_PROBE_CACHE_SIZE):
+        self.logger = logging.getLogger(__name__)
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self._gop_cache = OrderedDict()
+        self._keyframe_cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._ffprobe = find_ffprobe()
+
+    def probe(self, path):
+        """
+        Retorna dict com duration, fps, frame_count, width, height, has_video,
+        has_audio (None quando não é possível saber), video_codec, audio_codec
+        e source; ou None se o arquivo não puder ser lido
+        """
+        try:
+            key = self._cache_key(path)
+        except OSError as e:
+            self.logger.error(f"Arquivo não encontrado para leitura de metadados {path}: {e}")
+            return None
+
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        info = None
+        if self._ffprobe:
+            info = self._probe_ffprobe(path)
+        if info is None:
+            info = self._probe_opencv(path)
+
+        with self._lock:
+            self._cache[key] = info
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return info
+
+    def _cache_key(self, path):
+        stat = os.stat(path)
+        return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+    def _read_packets(self, path, intervals=None):
+        """
+        Lista (pts_time, é_keyframe) dos pacotes de vídeo nos intervalos pedidos
+        (-read_intervals do ffprobe; None = arquivo inteiro): só demux, nada é
+        decodificado. Os tempos são os do container (sem descontar start_time).
+        """
+        cmd = [self._ffprobe, '-v', 'error', '-select_streams', 'v:0']
+        if intervals:
+            cmd += ['-read_intervals', intervals]
+        cmd += ['-show_entries', 'packet=pts_time,flags', '-of', 'csv=p=0', path]
+        output = subprocess.run(cmd, capture_output=True, check=True, timeout=60).stdout
+        packets = []
+        for line in output.decode('utf-8', 'ignore').splitlines():
+            pts, _, flags = line.strip().partition(',')
+            if pts and pts != 'N/A':
+                packets.append((float(pts), 'K' in flags))
+        return packets
+
+    def gop_seconds(self, path):
+        """
+        Intervalo médio entre keyframes (s) nos primeiros
+        config.MEDIA_PROBE_GOP_WINDOW segundos, ou None se desconhecido
+        """
+        if not self._ffprobe:
+            return None
+        try:
+            key = self._cache_key(path)
+        except OSError:
+            return None
+        with self._lock:
+            if key in self._gop_cache:
+                return self._gop_cache[key]
+
+        gop = None
+        try:
+            packets = self._read_packets(path, f"%+{config.MEDIA_PROBE_GOP_WINDOW}")
+            keyframes = sorted(pts for pts, is_key in packets if is_key)
+            if len(keyframes) >= 2:
+                gop = (keyframes[-1] - keyframes[0]) / (len(keyframes) - 1)
+            elif packets:
+                # Um único keyframe na janela: GOP pelo menos do tamanho da janela
+                gop = max(pts for pts, _ in packets) - min(pts for pts, _ in packets)
+        except Exception as e:
+            self.logger.warning(f"Erro ao estimar GOP de {path}: {e}")
+
+        with self._lock:
+            self._gop_cache[key] = gop
+            while len(self._gop_cache) > self.max_entries:
+                self._gop_cache.popitem(last=False)
+        return gop
+
+    def keyframes(self, path):
+        """
+        Instantes (s, a partir de 0) de todos os keyframes do vídeo, lidos em
+        uma única chamada do ffprobe (só demux) e guardados em cache.
+        O start_time do stream é descontado, então os tempos valem para seek
+        no OpenCV mesmo em MPEG-TS. Retorna None sem ffprobe.
+        """
+        if not self._ffprobe:
+            return None
+        try:
+            key = self._cache_key(path)
+        except OSError:
+            return None
+        with self._lock:
+            if key in self._keyframe_cache:
+                self._keyframe_cache.move_to_end(key)
+                return self._keyframe_cache[key]
+
+        try:
+            start_time = (self.probe(path) or {}).get('start_time') or 0.0
+            packets = self._read_packets(path)
+            keyframes = sorted({max(0.0, pts - start_time) for pts, is_key in packets if is_key})
+        except Exception as e:
+            self.logger.warning(f"Erro ao localizar keyframes de {path}: {e}")
+            return None
+
+        with self._lock:
+            self._keyframe_cache[key] = keyframes
+            while len(self._keyframe_cache) > self.max_entries:
+                self._keyframe_cache.popitem(last=False)
+        return keyframes
+
+    def keyframe_times(self, path, targets):
+        """
+        Para cada instante em targets (s), o keyframe em que um seek até ele
+        cai (o último keyframe em ou antes do instante). Retorna None sem ffprobe.
+        """
+        if not targets:
+            return None
+        keyframes = self.keyframes(path)
+        if not keyframes:
+            return None
+        times = []
+        for target in targets:
+            index = bisect.bisect_right(keyframes, target + 1e-6) - 1
+            times.append(keyframes[max(index, 0)])
+        return times
+
+    def _probe_ffprobe(self, path):
+        cmd = [
+            self._ffprobe, '-v', 'error', '-print_format', 'json',
+            '-show_format', '-show_streams', path
+        ]
+        try:
+            output = subprocess.run(cmd, capture_output=True, check=True, timeout=60).stdout
+            data = json.loads(output or b'{}')
+        except Exception as e:
+            self.logger.warning(f"ffprobe falhou para {path}: {e}")
+            return None
+
+        streams = data.get('streams', [])
+        video = next((s for s in streams if s.get('codec_type') == 'video'
+                      and not s.get('disposition', {}).get('attached_pic')), None)
+        audio = next((s for s in streams if s.get('codec_type') == 'audio'), None)
+
+        duration = float(data.get('format', {}).get('duration') or 0) or None
+        # Início dos timestamps do stream (MPEG-TS costuma começar em ~1.4 s)
+        start_time = (video or {}).get('start_time') or data.get('format', {}).get('start_time')
+        try:
+            start_time = float(start_time) if start_time not in (None, 'N/A') else None
+        except ValueError:
+            start_time = None
+        if duration is None and video and video.get('duration'):
+            duration = float(video['duration'])
+
+        fps = frame_count = width = height = None
+        if video:
+            fps = _parse_rate(video.get('avg_frame_rate')) or _parse_rate(video.get('r_frame_rate')) or None
+            width, height = video.get('width'), video.get('height')
+            if video.get('nb_frames'):
+                frame_count = int(video['nb_frames'])
+            elif duration and fps:
+                frame_count = int(round(duration * fps))
+
+        return {
+            'duration': duration,
+            'fps': fps,
+            'frame_count': frame_count,
+            'width': width,
+            'height': height,
+            'has_video': video is not None,
+            'has_audio': audio is not None,
+            'start_time': start_time,
+            'video_codec': video.get('codec_name') if video else None,
+            'audio_codec': audio.get('codec_name') if audio else None,
+            'source': 'ffprobe'
+        }
+
+    def _probe_opencv(self, path):
+        # Fallback sem ffprobe: OpenCV lê vídeo, mas não informa áudio
+        try:
+            import cv2
+            cap = cv2.VideoCapture(path)
+            if not cap.isOpened():
+                return None
+            fps = cap.get(cv2.CAP_PROP_FPS) or None
+            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) or None
+            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or None
+            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or None
+            cap.release()
+        except Exception as e:
+            self.logger.warning(f"Erro ao ler metadados de {path} com OpenCV: {e}")
+            return None
+
+        return {
+            'duration': frame_count / fps if frame_count and fps else None,
+            'fps': fps,
+            'frame_count': frame_count,
+            'width': width,
+            'height': height,
+            'has_video': frame_count is not None,
+            'has_audio': None,
+            'start_time': None,
+            'video_codec': None,
+            'audio_codec': None,
+            'source': 'opencv'
+        }
+
+
+_shared_probe = None
+_shared_probe_lock = threading.Lock()
+
+
+def get_media_probe():
+    """
+    Instância compartilhada (e seu cache) por todos os componentes do processo
+    """
+    global _shared_probe
+    with _shared_probe_lock:
+        if _shared_probe is None:
+            _shared_probe = MediaProbe()
+        return _shared_probe
@@ -0,0 +1,157 @@
+import os
+import logging
+import subprocess
+import threading
+import numpy as np
+import config
+from media_probe import get_media_probe, find_ffmpeg
+
+
+class MediaReader:
+    """
+    Leitura do container em uma única passada: um processo ffmpeg entrega o
+    áudio (PCM mono s16le) no stdout e os frames reduzidos (BGR cru, em
+    config.MEDIA_READER_FPS quadros por segundo) em um pipe extra (pass_fds).
+    O arquivo é lido do disco uma vez só, em vez de uma vez por consumidor.
+    """
+
+    def __init__(self, frame_fps=config.MEDIA_READER_FPS, frame_width=config.VISUAL_ANALYSIS_WIDTH,
+                 sample_rate=16000):
+        self.logger = logging.getLogger(__name__)
+        self.frame_fps = frame_fps
+        self.frame_width = frame_width
+        self.sample_rate = sample_rate
+
+    def is_available(self):
+        """
+        O pipe extra de vídeo depende de pass_fds (apenas POSIX)
+        """
+        return os.name == 'posix' and find_ffmpeg() is not None
+
+    def _frame_size(self, info):
+        width, height = info.get('width'), info.get('height')
+        if not width or not height:
+            return None
+        target_width = min(width, self.frame_width)
+        target_height = max(1, int(round(height * target_width / width)))
+        return target_width, target_height
+
+    def read(self, video_path, on_frame=None):
+        """
+        Lê o vídeo uma vez. on_frame(frame, timestamp) recebe cada frame
+        reduzido à medida que é decodificado (nada é acumulado).
+        Retorna {'audio': PCM float32 ou None, 'has_audio', 'frames_read',
+        'duration'}, ou None quando a leitura única não é possível (o chamador
+        volta a ler áudio e frames separadamente).
+        """
+        if not self.is_available():
+            return None
+
+        info = get_media_probe().probe(video_path)
+        if not info:
+            return None
+
+        with_audio = info.get('has_audio') is not False
+        frame_size = self._frame_size(info) if on_frame and info.get('has_video') else None
+        if not with_audio and not frame_size:
+            return None
+
+        result, stderr = self._run(video_path, info, with_audio, frame_size, on_frame)
+        if result is None and with_audio and info.get('has_audio') is None and frame_size:
+            # Sem ffprobe não se sabe se há áudio: tenta de novo só com o vídeo
+            result, stderr = self._run(video_path, info, False, frame_size, on_frame)
+        if result is None:
+            self.logger.error(f"Erro na leitura única de {video_path}: {stderr}")
+        return result
+
+    def _run(self, video_path, info, with_audio, frame_size, on_frame):
+        """
+        Executa o ffmpeg e consome os streams. Retorna (resultado ou None, stderr)
+        """
+        cmd = [find_ffmpeg(), '-nostdin', '-loglevel', 'error', '-noautorotate', '-i', video_path]
+        if with_audio:
+            cmd += ['-map', '0:a:0', '-ac', '1', '-ar', str(self.sample_rate),
+                    '-f', 's16le', '-acodec', 'pcm_s16le', 'pipe:1']
+
+        video_reader = video_writer = None
+        pass_fds = ()
+        if frame_size:
+            video_reader, video_writer = os.pipe()
+            pass_fds = (video_writer,)
+            width, height = frame_size
+            cmd += ['-map', '0:v:0', '-vf', f"fps={self.frame_fps},scale={width}:{height}",
+                    '-pix_fmt', 'bgr24', '-f', 'rawvideo', f"pipe:{video_writer}"]
+
+        try:
+            process = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE if with_audio else subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                pass_fds=pass_fds
+            )
+        except Exception as e:
+            for fd in (video_reader, video_writer):
+                if fd is not None:
+                    os.close(fd)
+            return None, str(e)
+        if video_writer is not None:
+            # Só o ffmpeg escreve no pipe; fechar aqui permite detectar o EOF
+            os.close(video_writer)
+
+        # Áudio e stderr são drenados em threads para o ffmpeg nunca bloquear
+        audio_buffer = bytearray()
+        stderr_buffer = bytearray()
+
+        def drain(stream, buffer):
+            while True:
+                chunk = stream.read(1 << 20)
+                if not chunk:
+                    break
+                buffer.extend(chunk)
+
+        drains = [threading.Thread(target=drain, args=(process.stderr, stderr_buffer), daemon=True)]
+        if with_audio:
+            drains.append(threading.Thread(target=drain, args=(process.stdout, audio_buffer), daemon=True))
+        for thread in drains:
+            thread.start()
+
+        frames_read = 0
+        if video_reader is not None:
+            width, height = frame_size
+            frame_bytes = width * height * 3
+            consumer_ok = True
+            with os.fdopen(video_reader, 'rb') as video_stream:
+                while True:
+                    data = video_stream.read(frame_bytes)
+                    if len(data) < frame_bytes:
+                        break
+                    if consumer_ok:
+                        frame = np.frombuffer(data, dtype=np.uint8).reshape(height, width, 3)
+                        try:
+                            on_frame(frame, frames_read / self.frame_fps)
+                        except Exception as e:
+                            # Continua drenando o pipe para o áudio não travar
+                            self.logger.error(f"Erro no consumidor de frames de {video_path}: {str(e)}")
+                            consumer_ok = False
+                    frames_read += 1
+
+        for thread in drains:
+            thread.join()
+        process.wait()
+
+        stderr = stderr_buffer.decode(errors='ignore').strip()
+        if process.returncode != 0 and not audio_buffer and not frames_read:
+            return None, stderr
+
+        audio = None
+        if with_audio:
+            usable = len(audio_buffer) - (len(audio_buffer) % 2)
+            audio = np.frombuffer(bytes(audio_buffer[:usable]), dtype=np.int16).astype(np.float32) / 32768.0
+            self.logger.info(f"Leitura única: {len(audio) / self.sample_rate:.1f}s de áudio, {frames_read} frames")
+
+        return {
+            'audio': audio,
+            'has_audio': with_audio,
+            'frames_read': frames_read,
+            'duration': info.get('duration')
+        }, stderr
@@ -0,0 +1,183 @@
+import os
+import gc
+import sys
+import time
+import logging
+import threading
+from collections import OrderedDict
+import config
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def resident_memory_mb():
+    """
+    Memória residente (RSS) do processo atual em MB, ou None se indisponível
+    """
+    try:
+        if psutil is not None:
+            return psutil.Process().memory_info().rss / (1024 * 1024)
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except Exception:
+        return None
+
+
+class ModelRegistry:
+    """
+    Registro de modelos do processo: cada modelo é carregado no primeiro
+    uso (get), compartilhado por todos os componentes que pedem o mesmo nome
+    e pode ser descarregado (unload) para liberar memória.
+    Registra tempo de carga e o aumento de memória residente de cada modelo.
+    """
+
+    def __init__(self, max_rss_mb=config.MODEL_REGISTRY_MAX_RSS_MB):
+        self.logger = logging.getLogger(__name__)
+        self.max_rss_mb = max_rss_mb
+        self._models = OrderedDict()  # nome -> modelo, do menos ao mais recente
+        self._stats = {}
+        self._failed = set()
+        self._lock = threading.Lock()
+        self._load_locks = {}
+
+    def get(self, name, loader):
+        """
+        Retorna o modelo `name`, chamando loader() na primeira vez.
+        Falhas de carga são registradas uma vez e retornam None.
+        """
+        with self._lock:
+            if name in self._models:
+                self._models.move_to_end(name)
+                self._stats[name]['uses'] += 1
+                return self._models[name]
+            if name in self._failed:
+                return None
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+
+        # Cargas de modelos diferentes podem ocorrer em paralelo
+        with load_lock:
+            with self._lock:
+                if name in self._models:
+                    self._models.move_to_end(name)
+                    return self._models[name]
+                if name in self._failed:
+                    return None
+
+            self._release_memory()
+
+            rss_before = resident_memory_mb()
+            start = time.time()
+            try:
+                model = loader()
+            except Exception as e:
+                self.logger.warning(f"Erro ao carregar modelo {name}: {e}")
+                with self._lock:
+                    self._failed.add(name)
+                return None
+            load_time = time.time() - start
+            rss_after = resident_memory_mb()
+            rss_delta = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+
+            with self._lock:
+                self._models[name] = model
+                self._stats[name] = {
+                    'load_time': load_time,
+                    'rss_mb': rss_delta,
+                    'uses': 1,
+                    'loaded_at': time.time()
+                }
+
+            memory = f", +{rss_delta:.0f} MB RSS" if rss_delta is not None else ""
+            self.logger.info(f"Modelo {name} carregado em {load_time:.1f}s{memory}")
+            return model
+
+    def is_loaded(self, name):
+        with self._lock:
+            return name in self._models
+
+    def unload(self, name):
+        """
+        Descarrega um modelo; o próximo get() volta a carregá-lo
+        """
+        with self._lock:
+            model = self._models.pop(name, None)
+            self._stats.pop(name, None)
+        if model is None:
+            return False
+        del model
+        self._collect()
+        self.logger.info(f"Modelo {name} descarregado")
+        return True
+
+    def unload_all(self):
+        with self._lock:
+            names = list(self._models)
+        for name in names:
+            self.unload(name)
+
+    def _release_memory(self):
+        """
+        Acima de config.MODEL_REGISTRY_MAX_RSS_MB, descarrega os modelos
+        usados há mais tempo antes de carregar um novo
+        """
+        if not self.max_rss_mb:
+            return
+        while True:
+            rss = resident_memory_mb()
+            with self._lock:
+                oldest = next(iter(self._models), None)
+            if rss is None or rss <= self.max_rss_mb or oldest is None:
+                return
+            self.logger.info(f"Memória em {rss:.0f} MB (limite {self.max_rss_mb} MB): liberando {oldest}")
+            self.unload(oldest)
+
+    def _collect(self):
+        gc.collect()
+        # Só mexe no CUDA se o torch já tiver sido importado por alguém
+        torch = sys.modules.get('torch')
+        if torch is not None and torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    def stats(self):
+        """
+        Modelos carregados: {nome: {load_time, rss_mb, uses, loaded_at}}
+        """
+        with self._lock:
+            return {name: dict(values) for name, values in self._stats.items()}
+
+    def print_stats(self):
+        stats = self.stats()
+        rss = resident_memory_mb()
+        print(f"\n🧠 Modelos carregados: {len(stats)}" + (f" | RSS do processo: {rss:.0f} MB" if rss else ""))
+        for name, values in stats.items():
+            memory = f"{values['rss_mb']:.0f} MB" if values['rss_mb'] is not None else "?"
+            print(f"  - {name}: {values['load_time']:.1f}s, {memory}, {values['uses']} usos")
+
+
+def load_pipeline(task, model):
+    """
+    Loader de pipeline HuggingFace (transformers só é importado na carga)
+    """
+    def loader():
+        from transformers import pipeline
+        return pipeline(task, model=model)
+    return loader
+
+
+_model_registry = None
+_model_registry_lock = threading.Lock()
+
+
+def get_model_registry():
+    """
+    Registro compartilhado pelo processo inteiro
+    """
+    global _model_registry
+    with _model_registry_lock:
+        if _model_registry is None:
+            _model_registry = ModelRegistry()
+        return _model_registry
@@ -4,16 +4,19 @@ import logging
 import json
 import argparse
 import time
+import re
+import threading
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 
-# Importa módulos do sistema
-from transcription import TranscriptionEngine
-from video_analysis import VideoAnalyzer
+# Importa módulos do sistema (transcription, video_analysis e media_reader
+# são importados só quando o orquestrador vai processar vídeos)
 # from images import ImageAnalyzer
 from database import DatabaseManager, VideoRecord
 from search_engine import ContentSearchEngine
+from pipeline import PipelineStage, StagedPipeline
+from model_registry import get_model_registry
 import config
 
 # Configuração de logging
@@ -28,21 +31,284 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Marcação no contexto de vídeos em que o VAD não encontrou fala
+NO_SPEECH_CONTEXT = "Sem fala detectada"
+
 class VideoOrchestrator:
-    def __init__(self):
-        self.transcription_engine = TranscriptionEngine()
-        self.video_analyzer = VideoAnalyzer()
+    def __init__(self, read_only=False):
+        """
+        read_only=True: apenas consultas (busca e resumo), sem carregar os
+        motores de transcrição e análise nem importar torch/whisper/OpenCV
+        """
+        self.read_only = read_only
+        # Motores criados no primeiro uso (ver propriedades): reclassify só
+        # precisa do VideoAnalyzer e não deve subir o pool do Whisper
+        self._transcription_engine = None
+        self._video_analyzer = None
+        self._media_reader = None
+        self._components_lock = threading.Lock()
         # # Aqui eu acabei de colocar o esquema da imagem , preciso agora adicionar no meio do processamento do diretório a analise das imagens
         # self.image_analyzer = ImageAnalyzer()
         self.db_manager = DatabaseManager()
         self.search_engine = ContentSearchEngine(self.db_manager)
+        self.last_pipeline_stats = []
         
-        logger.info("Inicializando orquestrador de vídeos")
+        logger.info("Inicializando orquestrador de vídeos" + (" (somente leitura)" if read_only else ""))
+    
+    def _require_processing(self):
+        if self.read_only:
+            raise RuntimeError("Orquestrador em modo somente leitura: crie VideoOrchestrator() para processar vídeos")
+    
+    @property
+    def transcription_engine(self):
+        """
+        Motor de transcrição; o TranscriptionEngine sobe os processos do
+        Whisper, então só é criado quando há vídeo a transcrever
+        """
+        if self._transcription_engine is None:
+            self._require_processing()
+            with self._components_lock:
+                if self._transcription_engine is None:
+                    from transcription import TranscriptionEngine
+                    self._transcription_engine = TranscriptionEngine()
+        return self._transcription_engine
+    
+    @property
+    def video_analyzer(self):
+        if self._video_analyzer is None:
+            self._require_processing()
+            with self._components_lock:
+                if self._video_analyzer is None:
+                    from video_analysis import VideoAnalyzer
+                    self._video_analyzer = VideoAnalyzer()
+        return self._video_analyzer
+    
+    @property
+    def media_reader(self):
+        if self._media_reader is None:
+            self._require_processing()
+            with self._components_lock:
+                if self._media_reader is None:
+                    from media_reader import MediaReader
+                    self._media_reader = MediaReader()
+        return self._media_reader
+    
+    def _create_record(self, video_path):
+        """
+        Cria o registro inicial do vídeo com tamanho e duração
+        """
+        video_record = VideoRecord(
+            file_path=video_path,
+            file_name=os.path.basename(video_path),
+            file_size=os.path.getsize(video_path)
+        )
+        
+        # Obtém duração do vídeo
+        duration = self.transcription_engine.get_video_duration(video_path)
+        if duration:
+            video_record.duration = duration
+        
+        return video_record
+    
+    def _apply_transcription(self, video_record, transcription_results):
+        """
+        Copia as transcrições obtidas para o registro
+        """
+        if 'pt' in transcription_results:
+            video_record.transcript_pt = transcription_results['pt']['text']
+        
+        if 'en' in transcription_results:
+            video_record.transcript_en = transcription_results['en']['text']
+    
+    def _analyze_visual(self, video_path):
+        """
+        Extrai frames, analisa o conteúdo visual e detecta os cortes
+        """
+        return self.video_analyzer.analyze_video(video_path)
+    
+    def _read_media(self, video_path):
+        """
+        Lê o container uma única vez: áudio para a transcrição e frames
+        reduzidos para a análise visual e a impressão digital. Retorna None
+        quando a leitura única não está disponível (sem ffmpeg ou fora de POSIX)
+        ou quando o probe não informa a duração: sem ela não há instantes de
+        amostragem, e a amostragem normal (OpenCV) é usada.
+        """
+        if not config.SINGLE_PASS_MEDIA_READ:
+            return None
+        
+        stream_analysis = self.video_analyzer.stream_analysis(video_path)
+        if not stream_analysis.duration:
+            logger.info(f"Duração desconhecida para {video_path}: usando a amostragem normal em vez da leitura única")
+            return None
+        media = self.media_reader.read(video_path, on_frame=stream_analysis.feed)
+        if media is None:
+            return None
+        media['visual_analysis'] = stream_analysis.result()
+        media['fingerprint'] = stream_analysis.fingerprint()
+        if config.VIDEO_FINGERPRINT_ENABLED:
+            from transcription import audio_signature
+            media['audio_signature'] = audio_signature(media['audio']) if media['has_audio'] else None
+        return media
+    
+    def _transcribe_media(self, media, progress_callback=None, languages=['pt']):
+        """
+        Transcreve o áudio obtido na leitura única
+        """
+        if not media['has_audio']:
+            return self.transcription_engine.no_audio_results(languages)
+        return self.transcription_engine.transcribe_languages(media['audio'], languages, progress_callback)
+    
+    def _classify_record(self, video_record, visual_analysis):
+        """
+        Classifica o vídeo, extrai keywords e gera o contexto no registro.
+        Vídeos sem fala (transcrição vazia) são classificados só pelo visual.
+        """
+        if video_record.transcript_pt is None:
+            return
+        
+        classification = self.video_analyzer.classify_content(
+            video_record.transcript_pt, 
+            visual_analysis
+        )
+        
+        video_record.category = classification['category']
+        video_record.confidence_score = classification['confidence']
+        
+        # Extração de keywords
+        keywords = self.video_analyzer.extract_keywords(video_record.transcript_pt)
+        video_record.keywords = json.dumps(keywords)
+        
+        # Geração de contexto
+        video_record.video_context = self.video_analyzer.generate_video_context(
+            video_record.transcript_pt,
+            visual_analysis,
+            classification
+        )
+        if not video_record.transcript_pt:
+            video_record.video_context = f"{NO_SPEECH_CONTEXT} | {video_record.video_context}"
+    
+    def _fingerprint(self, video_path, media=None):
+        """
+        Impressão digital perceptual do vídeo (None se desativada ou
+        indisponível). Com a leitura única, vem dos frames já decodificados
+        nela; sem, o vídeo é amostrado por compute_fingerprint. Vídeos de
+        frames lisos ou imagem estática (tela preta, capa de podcast) ficam
+        sem impressão digital: ela seria igual à de qualquer outro assim.
+        """
+        if not config.VIDEO_FINGERPRINT_ENABLED:
+            return None
+        from video_analysis import fingerprint_is_informative
+        if media is not None:
+            fingerprint = media.get('fingerprint')
+        else:
+            fingerprint = self.video_analyzer.compute_fingerprint(video_path)
+        if fingerprint and not fingerprint_is_informative(fingerprint):
+            logger.info(f"Impressão digital de {video_path} sem informação (frames lisos/estáticos): sem deduplicação")
+            return None
+        return fingerprint
+    
+    def _fingerprint_match(self, fingerprint, record, other_fingerprint, other_record):
+        """
+        Similaridade entre as impressões digitais de dois vídeos, ou None se
+        as durações não forem compatíveis ou o áudio não confirmar: se um dos
+        dois tem assinatura de áudio, os dois precisam ter e ser correlatas
+        """
+        from video_analysis import fingerprint_similarity, fingerprint_is_informative
+        from transcription import audio_signature_similarity
+        if not fingerprint_is_informative(other_fingerprint):
+            return None
+        duration, other_duration = record.duration, other_record.duration
+        if duration and other_duration:
+            tolerance = config.VIDEO_FINGERPRINT_DURATION_TOLERANCE * max(duration, other_duration)
+            if abs(duration - other_duration) > max(tolerance, 1.0):
+                return None
+        signature, other_signature = record.audio_signature, other_record.audio_signature
+        if signature or other_signature:
+            if not (signature and other_signature):
+                return None
+            if audio_signature_similarity(signature, other_signature) < config.AUDIO_SIGNATURE_THRESHOLD:
+                return None
+        return fingerprint_similarity(fingerprint, other_fingerprint)
+    
+    def _find_duplicate(self, fingerprint, record):
+        """
+        Vídeo já processado com a mesma filmagem (outra resolução/bitrate):
+        candidatos pelo índice de faixas, confirmados pela similaridade
+        completa, pela duração e pelo áudio. Retorna o registro ou None.
+        """
+        if not fingerprint:
+            return None
+        from video_analysis import fingerprint_bands
+        
+        best, best_similarity = None, config.VIDEO_FINGERPRINT_THRESHOLD
+        for candidate in self.db_manager.get_fingerprint_candidates(fingerprint_bands(fingerprint)):
+            if not candidate.fingerprint or not (candidate.transcript_pt or candidate.video_context):
+                continue
+            similarity = self._fingerprint_match(fingerprint, record, candidate.fingerprint, candidate)
+            if similarity is not None and similarity >= best_similarity:
+                best, best_similarity = candidate, similarity
+        
+        if best is not None:
+            logger.info(f"Duplicata de {best.file_name} (similaridade {best_similarity:.2f}): reaproveitando análise")
+        return best
+    
+    def _find_run_duplicate(self, fingerprint, record, run_index):
+        """
+        Vídeo original do processamento em andamento (ainda não salvo no
+        banco) com a mesma filmagem: candidatos pelas faixas do índice em
+        memória, confirmados como em _find_duplicate. Retorna o job ou None.
+        """
+        if not fingerprint:
+            return None
+        from video_analysis import fingerprint_bands
+        
+        candidates = {}
+        for band in fingerprint_bands(fingerprint):
+            for job in run_index.get(band, ()):
+                candidates[id(job)] = job
+        
+        best, best_similarity = None, config.VIDEO_FINGERPRINT_THRESHOLD
+        for job in candidates.values():
+            similarity = self._fingerprint_match(fingerprint, record, job['fingerprint'], job['record'])
+            if similarity is not None and similarity >= best_similarity:
+                best, best_similarity = job, similarity
+        
+        if best is not None:
+            logger.info(f"Duplicata de {os.path.basename(best['path'])} no mesmo processamento "
+                        f"(similaridade {best_similarity:.2f}): reaproveitando análise")
+        return best
+    
+    def _index_run_fingerprint(self, run_index, job):
+        """
+        Adiciona um vídeo original ao índice em memória do processamento
+        """
+        if job['fingerprint']:
+            from video_analysis import fingerprint_bands
+            for band in fingerprint_bands(job['fingerprint']):
+                run_index.setdefault(band, []).append(job)
+    
+    def _copy_from_duplicate(self, video_record, source):
+        """
+        Reaproveita transcrição, contexto, categoria e keywords do vídeo original
+        """
+        video_record.transcript_pt = source.transcript_pt
+        video_record.transcript_en = source.transcript_en
+        video_record.video_context = source.video_context
+        video_record.category = source.category
+        video_record.confidence_score = source.confidence_score
+        video_record.keywords = source.keywords
+    
+    def _save_fingerprint(self, video_id, fingerprint):
+        if video_id and fingerprint:
+            from video_analysis import fingerprint_bands
+            self.db_manager.save_fingerprint(video_id, fingerprint, fingerprint_bands(fingerprint))
     
     def process_video(self, video_path, progress_bar=None):
         """
         Processa um único vídeo: transcrição, análise, categorização e armazenamento
         """
+        self._require_processing()
         try:
             video_name = os.path.basename(video_path)
             
@@ -65,24 +331,36 @@ class VideoOrchestrator:
             progress_bar.set_description(f"📊 Criando registro: {video_name[:30]}...")
             
             # Cria registro para o vídeo
-            video_record = VideoRecord(
-                file_path=video_path,
-                file_name=os.path.basename(video_path),
-                file_size=os.path.getsize(video_path)
-            )
+            video_record = self._create_record(video_path)
             
-            # Obtém duração do vídeo
-            duration = self.transcription_engine.get_video_duration(video_path)
-            if duration:
-                video_record.duration = duration
+            # Leitura única do container (áudio + frames), quando disponível;
+            # a impressão digital sai dos mesmos frames
+            media = self._read_media(video_path)
+            
+            # Mesma filmagem já processada (outra resolução/bitrate): reaproveita
+            fingerprint = self._fingerprint(video_path, media)
+            video_record.audio_signature = media.get('audio_signature') if media is not None else None
+            duplicate = self._find_duplicate(fingerprint, video_record)
+            if duplicate is not None:
+                self._copy_from_duplicate(video_record, duplicate)
+                video_id = self.db_manager.add_video(video_record)
+                self._save_fingerprint(video_id, fingerprint)
+                self.search_engine._update_search_index()
+                progress_bar.update(6)
+                progress_bar.set_description(f"♻️ Duplicata de {duplicate.file_name[:20]}: {video_name[:30]}")
+                progress_bar.close()
+                return video_id
             
             progress_bar.update(1)
             progress_bar.set_description(f"🎤 Transcrevendo: {video_name[:30]}...")
             
             # Transcrição
-            transcription_results = self.transcription_engine.transcribe_video(
-                video_path, languages=['pt'], progress_callback=progress_bar
-            )
+            if media is not None:
+                transcription_results = self._transcribe_media(media, progress_bar)
+            else:
+                transcription_results = self.transcription_engine.transcribe_video(
+                    video_path, languages=['pt'], progress_callback=progress_bar
+                )
             
             if not transcription_results:
                 progress_bar.set_description(f"❌ Falha na transcrição: {video_name[:30]}")
@@ -93,48 +371,29 @@ class VideoOrchestrator:
             progress_bar.set_description(f"💾 Salvando transcrição: {video_name[:30]}...")
             
             # Salva transcrições
-            if 'pt' in transcription_results:
-                video_record.transcript_pt = transcription_results['pt']['text']
-            
-            if 'en' in transcription_results:
-                video_record.transcript_en = transcription_results['en']['text']
+            self._apply_transcription(video_record, transcription_results)
             
             progress_bar.update(1)
             progress_bar.set_description(f"👁️ Analisando visual: {video_name[:30]}...")
             
-            # Análise visual
-            frames = self.video_analyzer.extract_video_frames(video_path)
-            visual_analysis = self.video_analyzer.analyze_visual_content(frames)
+            # Análise visual (já feita durante a leitura única, se houve)
+            if media is not None:
+                visual_analysis = media['visual_analysis']
+            else:
+                visual_analysis = self._analyze_visual(video_path)
             
             progress_bar.update(1)
             progress_bar.set_description(f"🏷️ Classificando: {video_name[:30]}...")
             
-            # Classificação
-            if video_record.transcript_pt:
-                classification = self.video_analyzer.classify_content(
-                    video_record.transcript_pt, 
-                    visual_analysis
-                )
-                
-                video_record.category = classification['category']
-                video_record.confidence_score = classification['confidence']
-                
-                # Extração de keywords
-                keywords = self.video_analyzer.extract_keywords(video_record.transcript_pt)
-                video_record.keywords = json.dumps(keywords)
-                
-                # Geração de contexto
-                video_record.video_context = self.video_analyzer.generate_video_context(
-                    video_record.transcript_pt,
-                    visual_analysis,
-                    classification
-                )
+            # Classificação, keywords e contexto
+            self._classify_record(video_record, visual_analysis)
             
             progress_bar.update(1)
             progress_bar.set_description(f"💾 Salvando no banco: {video_name[:30]}...")
             
             # Salva no banco de dados
             video_id = self.db_manager.add_video(video_record)
+            self._save_fingerprint(video_id, fingerprint)
             
             # Atualiza índice de busca
             self.search_engine._update_search_index()
@@ -152,10 +411,13 @@ class VideoOrchestrator:
             logger.error(f"Erro ao processar vídeo {video_path}: {str(e)}")
             return None
     
-    def process_directory(self, directory_path, recursive=True):
+    def process_directory(self, directory_path, recursive=True, pipeline=False, stage_workers=None):
         """
         Processa todos os vídeos em um diretório
+        pipeline: True para usar o pipeline em estágios paralelos
+        stage_workers: dict opcional sobrescrevendo config.PIPELINE_STAGE_WORKERS
         """
+        self._require_processing()
         try:
             print(f"📁 Escaneando diretório: {directory_path}")
             
@@ -176,6 +438,9 @@ class VideoOrchestrator:
             
             print(f"🎬 Encontrados {len(video_paths)} vídeos para processamento\n")
             
+            if pipeline:
+                return self._process_with_pipeline([str(p) for p in video_paths], stage_workers)
+            
             # Barra de progresso geral para todos os vídeos
             overall_progress = tqdm(
                 total=len(video_paths), 
@@ -201,6 +466,7 @@ class VideoOrchestrator:
             overall_progress.set_description(f"✅ Processamento concluído: {len(results)}/{len(video_paths)} vídeos processados")
             overall_progress.close()
             
+            self._print_cache_report()
             print(f"\n🎉 Processamento concluído! {len(results)} vídeos processados com sucesso.")
             return results
             
@@ -208,6 +474,192 @@ class VideoOrchestrator:
             logger.error(f"Erro ao processar diretório {directory_path}: {str(e)}")
             return []
     
+    def _process_with_pipeline(self, video_paths, stage_workers=None):
+        """
+        Processa os vídeos em estágios sobrepostos:
+        decodificação -> transcrição -> análise visual/classificação -> persistência
+        """
+        workers = dict(config.PIPELINE_STAGE_WORKERS)
+        if stage_workers:
+            workers.update({k: v for k, v in stage_workers.items() if v})
+        
+        # Vídeos já processados não entram no pipeline (mesmo retorno do modo sequencial)
+        results = []
+        pending = []
+        for video_path in video_paths:
+            existing_record = self.db_manager.get_video_by_path(video_path)
+            if existing_record:
+                results.append(existing_record.id)
+            else:
+                pending.append(video_path)
+        
+        if not pending:
+            print(f"\n✅ Todos os {len(video_paths)} vídeos já estavam processados.")
+            return results
+        
+        # A sessão do banco é compartilhada entre os estágios (threads)
+        db_lock = threading.Lock()
+        # Índice em memória (faixa -> jobs) dos vídeos originais deste
+        # processamento, que só chegam ao banco na persistência; protegido
+        # pelo mesmo db_lock da tabela de faixas
+        run_index = {}
+        
+        def is_copy(job):
+            return job['duplicate'] is not None or job['duplicate_job'] is not None
+        
+        def decode(job):
+            job['record'] = self._create_record(job['path'])
+            job['followers'] = []
+            # A impressão digital sai dos frames da leitura única
+            media = self._read_media(job['path'])
+            job['fingerprint'] = self._fingerprint(job['path'], media)
+            job['record'].audio_signature = media.get('audio_signature') if media is not None else None
+            with db_lock:
+                job['duplicate'] = self._find_duplicate(job['fingerprint'], job['record'])
+                job['duplicate_job'] = None
+                if job['duplicate'] is None:
+                    job['duplicate_job'] = self._find_run_duplicate(job['fingerprint'], job['record'], run_index)
+                if not is_copy(job):
+                    self._index_run_fingerprint(run_index, job)
+            if is_copy(job):
+                # Cópia de outro vídeo: não transcreve nem analisa
+                return job
+            if media is not None:
+                job['audio'] = media['audio']
+                job['visual_analysis'] = media['visual_analysis']
+                return job
+            if not self.transcription_engine.has_audio(job['path']):
+                # Sem faixa de áudio: pula a decodificação e a transcrição
+                job['audio'] = None
+                return job
+            job['audio'] = self.transcription_engine.load_audio(job['path'])
+            if job['audio'] is None:
+                return None
+            return job
+        
+        def transcribe(job):
+            if is_copy(job):
+                return job
+            if job['audio'] is None:
+                self._apply_transcription(job['record'], self.transcription_engine.no_audio_results(['pt']))
+                return job
+            # As threads deste estágio despacham jobs para o pool de processos
+            # do motor de transcrição, que serializa o acesso a cada modelo
+            try:
+                transcription_results = self.transcription_engine.transcribe_languages(job['audio'], languages=['pt'])
+            finally:
+                self.transcription_engine.release_audio(job.pop('audio'))
+            if not transcription_results:
+                logger.error(f"Falha na transcrição: {job['path']}")
+                return None
+            self._apply_transcription(job['record'], transcription_results)
+            return job
+        
+        def analyze(job):
+            if job['duplicate_job'] is not None:
+                # Copiada na persistência do original
+                return job
+            if job['duplicate'] is not None:
+                # Os atributos do registro original podem ser relidos do banco
+                with db_lock:
+                    self._copy_from_duplicate(job['record'], job['duplicate'])
+                return job
+            if 'visual_analysis' in job:
+                visual_analysis = job.pop('visual_analysis')
+            else:
+                visual_analysis = self._analyze_visual(job['path'])
+            self._classify_record(job['record'], visual_analysis)
+            return job
+        
+        def persist(job):
+            with db_lock:
+                source = job['duplicate_job']
+                if source is not None:
+                    if not source.get('video_id'):
+                        # Original ainda não salvo: a cópia é salva junto com
+                        # ele (esperar aqui travaria o pipeline com filas cheias)
+                        source['followers'].append(job)
+                        return job
+                    self._copy_from_duplicate(job['record'], source['record'])
+                job['video_id'] = self.db_manager.add_video(job['record'])
+                self._save_fingerprint(job['video_id'], job['fingerprint'])
+                for follower in job['followers']:
+                    self._copy_from_duplicate(follower['record'], job['record'])
+                    follower['video_id'] = self.db_manager.add_video(follower['record'])
+                    self._save_fingerprint(follower['video_id'], follower['fingerprint'])
+                job['followers'] = []
+            return job
+        
+        stages = [
+            PipelineStage('decode', decode, workers['decode'], "Decodificação"),
+            PipelineStage('transcribe', transcribe, workers['transcribe'], "Transcrição"),
+            PipelineStage('analyze', analyze, workers['analyze'], "Análise/Classificação"),
+            PipelineStage('persist', persist, workers['persist'], "Persistência"),
+        ]
+        
+        overall_progress = tqdm(
+            total=len(pending),
+            desc="📺 Pipeline em estágios",
+            unit="vídeo",
+            position=0,
+            leave=True
+        )
+        
+        def on_item_done(job, ok):
+            if not ok:
+                logger.error(f"Erro ao processar vídeo {job['path']}")
+            overall_progress.update(1)
+        
+        staged = StagedPipeline(stages, on_item_done=on_item_done)
+        finished = staged.run({'path': path} for path in pending)
+        overall_progress.close()
+        
+        results.extend(job['video_id'] for job in finished if job.get('video_id'))
+        
+        # Cópias de um original que falhou neste processamento: processadas sozinhas
+        orphans = [job['path'] for job in finished if job.get('duplicate_job') is not None and not job.get('video_id')]
+        for video_path in orphans:
+            logger.info(f"Original da duplicata {video_path} falhou: processando o vídeo completo")
+            video_id = self.process_video(video_path)
+            if video_id:
+                results.append(video_id)
+        
+        # Atualiza o índice de busca uma única vez ao final
+        self.search_engine._update_search_index()
+        
+        self.last_pipeline_stats = staged.stats()
+        self._print_stage_report(self.last_pipeline_stats)
+        self._print_cache_report()
+        
+        print(f"\n🎉 Processamento concluído! {len(results)} vídeos processados com sucesso.")
+        return results
+    
+    def _print_stage_report(self, stats):
+        """
+        Imprime a vazão de cada estágio do pipeline
+        """
+        print("\n=== VAZÃO POR ESTÁGIO ===")
+        for stage in stats:
+            print(
+                f"  - {stage['label']:<22} workers: {stage['workers']}  "
+                f"ok: {stage['processed']}  falhas: {stage['failed']}  "
+                f"{stage['throughput'] * 60:.1f} vídeos/min  "
+                f"({stage['avg_item_time']:.1f}s/vídeo)"
+            )
+    
+    def _print_cache_report(self):
+        """
+        Imprime os contadores do cache de transcrições
+        """
+        cache = self.transcription_engine.cache
+        if cache is None:
+            return
+        stats = cache.stats()
+        print(
+            f"\n🗃️ Cache de transcrições: {stats['hits']} acertos, {stats['misses']} falhas "
+            f"({stats['entries']} entradas, {stats['size_mb']:.1f} MB)"
+        )
+    
     def search_videos(self, query):
         """
         Interface para busca de vídeos por texto
@@ -264,6 +716,48 @@ class VideoOrchestrator:
         Retorna um resumo do conteúdo processado
         """
         return self.search_engine.get_content_summary()
+    
+    def reclassify_videos(self):
+        """
+        Reclassifica em lote todas as transcrições salvas com as palavras-chave
+        atuais de config.VIDEO_CATEGORY_KEYWORDS (sem reprocessar os vídeos).
+        A análise visual não é armazenada, então só a transcrição é usada.
+        Retorna o número de vídeos cuja categoria mudou.
+        """
+        self._require_processing()
+        videos = [v for v in self.db_manager.get_all_videos() if v.transcript_pt]
+        if not videos:
+            print("⚠️  Nenhuma transcrição salva para reclassificar")
+            return 0
+        
+        start_time = time.time()
+        classifications = self.video_analyzer.classify_many([v.transcript_pt for v in videos])
+        
+        updates = []
+        changed = 0
+        for video, classification in zip(videos, classifications):
+            if video.category != classification['category']:
+                changed += 1
+            update = {
+                'id': video.id,
+                'category': classification['category'],
+                'confidence_score': classification['confidence']
+            }
+            # Mantém o contexto coerente com a nova categoria
+            if video.video_context:
+                update['video_context'] = re.sub(
+                    r"Classificado como: \S+ \(confiança: [\d.]+\)",
+                    f"Classificado como: {classification['category']} (confiança: {classification['confidence']:.2f})",
+                    video.video_context
+                )
+            updates.append(update)
+        
+        self.db_manager.update_videos(updates)
+        self.search_engine._update_search_index()
+        
+        elapsed = time.time() - start_time
+        print(f"🏷️  {len(videos)} vídeos reclassificados em {elapsed:.2f}s ({changed} mudaram de categoria)")
+        return changed
 
 def main():
     # Configuração dos argumentos de linha de comando
@@ -276,6 +770,10 @@ def main():
     process_parser = subparsers.add_parser('process', help='Processar vídeos')
     process_parser.add_argument('directory', help='Diretório contendo vídeos para processamento')
     process_parser.add_argument('--recursive', '-r', action='store_true', help='Buscar vídeos recursivamente em subdiretórios')
+    process_parser.add_argument('--pipeline', '-p', action='store_true', help='Processar em estágios paralelos (decodificação, transcrição, análise, persistência)')
+    process_parser.add_argument('--decode-workers', type=int, help='Workers do estágio de decodificação (padrão: config.PIPELINE_STAGE_WORKERS)')
+    process_parser.add_argument('--transcribe-workers', type=int, help='Workers do estágio de transcrição')
+    process_parser.add_argument('--analyze-workers', type=int, help='Workers do estágio de análise visual/classificação')
     
     # Comando para buscar vídeos
     search_parser = subparsers.add_parser('search', help='Buscar vídeos')
@@ -286,18 +784,27 @@ def main():
     # Comando para obter resumo
     subparsers.add_parser('summary', help='Mostrar resumo do conteúdo processado')
     
+    # Comando para reclassificar as transcrições já salvas
+    subparsers.add_parser('reclassify', help='Reclassificar vídeos salvos com as palavras-chave atuais')
+    
     # Parseia os argumentos
     args = parser.parse_args()
     
-    # Inicializa o orquestrador
-    orchestrator = VideoOrchestrator()
+    # Inicializa o orquestrador (busca e resumo não carregam os modelos)
+    orchestrator = VideoOrchestrator(read_only=args.command in ('search', 'summary'))
     
     # Executa o comando especificado
     if args.command == 'process':
         start_time = time.time()
-        orchestrator.process_directory(args.directory, args.recursive)
+        stage_workers = {
+            'decode': args.decode_workers,
+            'transcribe': args.transcribe_workers,
+            'analyze': args.analyze_workers
+        }
+        orchestrator.process_directory(args.directory, args.recursive, args.pipeline, stage_workers)
         elapsed_time = time.time() - start_time
         logger.info(f"Processamento concluído em {elapsed_time:.2f} segundos")
+        get_model_registry().print_stats()
         
     elif args.command == 'search':
         if args.query:
@@ -343,6 +850,9 @@ def main():
         print(f"  - Português: {languages.get('pt', 0)} vídeos")
         print(f"  - Inglês: {languages.get('en', 0)} vídeos")
     
+    elif args.command == 'reclassify':
+        orchestrator.reclassify_videos()
+    
     else:
         parser.print_help()
 
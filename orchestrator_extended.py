@@ -12,10 +12,11 @@ from tqdm import tqdm
 from transcription import TranscriptionEngine
 from video_analysis import VideoAnalyzer
 from search_engine import ContentSearchEngine
+from model_registry import get_model_registry
 import config
 
 # Novos módulos para extensão
-from images import ImageAnalyzer
+from images import ImageAnalyzer, duplicate_clusters
 from db_mongo import MongoManager
 
 # Configuração de logging
@@ -42,12 +43,10 @@ class ExtendedOrchestrator:
     def __init__(self, use_mongo=True):
         self.use_mongo = use_mongo
         
-        # Componentes originais
-        self.transcription_engine = TranscriptionEngine()
-        self.video_analyzer = VideoAnalyzer()
-        
-        # Novo componente para imagens
-        self.image_analyzer = ImageAnalyzer()
+        # Componentes de vídeo e imagem criados no primeiro uso (ver propriedades)
+        self._transcription_engine = None
+        self._video_analyzer = None
+        self._image_analyzer = None
         
         # Database manager (MongoDB ou SQLite)
         if use_mongo:
@@ -72,6 +71,36 @@ class ExtendedOrchestrator:
         
         logger.info("Orquestrador estendido inicializado com sucesso")
     
+    @property
+    def transcription_engine(self):
+        """
+        Motor de transcrição (Whisper), criado só quando há vídeo a processar
+        """
+        if self._transcription_engine is None:
+            self._transcription_engine = TranscriptionEngine()
+        return self._transcription_engine
+    
+    @property
+    def video_analyzer(self):
+        if self._video_analyzer is None:
+            self._video_analyzer = VideoAnalyzer()
+        return self._video_analyzer
+    
+    @property
+    def image_analyzer(self):
+        """
+        Analisador de imagens; os modelos de legenda/classificação só carregam
+        na primeira imagem (model_registry). O índice de duplicatas começa com
+        os hashes perceptuais das imagens já salvas.
+        """
+        if self._image_analyzer is None:
+            self._image_analyzer = ImageAnalyzer()
+            if self.use_mongo and config.IMAGE_DEDUP_ENABLED:
+                for image_doc in self.db_manager.get_image_hashes():
+                    self._image_analyzer.register_known_image(image_doc)
+                logger.info(f"Índice de duplicatas de imagens: {len(self._image_analyzer.hash_index)} imagens")
+        return self._image_analyzer
+    
     def process_video(self, video_path, progress_bar=None):
         """
         Processa um único vídeo (versão adaptada para MongoDB)
@@ -92,15 +121,610 @@ class ExtendedOrchestrator:
                 existing_record = self.db_manager.get_video_by_path(video_path)
             
             if existing_record:
-                progress_bar.set_description(f"✅ Já processado: {video_name[:30]}")\n                progress_bar.update(7)\n                progress_bar.close()\n                return existing_record.get('_id') if self.use_mongo else existing_record.id\n            \n            progress_bar.update(1)\n            progress_bar.set_description(f"📊 Criando registro: {video_name[:30]}...")\n            \n            # Cria documento para o vídeo\n            video_doc = {\n                'file_path': video_path,\n                'file_name': os.path.basename(video_path),\n                'file_size': os.path.getsize(video_path),\n                'directory': str(Path(video_path).parent)\n            }\n            \n            # Obtém duração do vídeo\n            duration = self.transcription_engine.get_video_duration(video_path)\n            if duration:\n                video_doc['duration'] = duration\n            \n            progress_bar.update(1)\n            progress_bar.set_description(f"🎤 Transcrevendo: {video_name[:30]}...")\n            \n            # Transcrição\n            transcription_results = self.transcription_engine.transcribe_video(\n                video_path, languages=['pt'], progress_callback=progress_bar\n            )\n            \n            if not transcription_results:\n                progress_bar.set_description(f"❌ Falha na transcrição: {video_name[:30]}")\n                progress_bar.close()\n                return None\n            \n            video_doc['transcript'] = transcription_results\n            \n            progress_bar.update(1)\n            progress_bar.set_description(f"👁️ Analisando visual: {video_name[:30]}...")\n            \n            # Análise visual\n            frames = self.video_analyzer.extract_video_frames(video_path)\n            visual_analysis = self.video_analyzer.analyze_visual_content(frames)\n            video_doc['visual_analysis'] = visual_analysis\n            \n            progress_bar.update(1)\n            progress_bar.set_description(f"🏷️ Classificando: {video_name[:30]}...")\n            \n            # Classificação\n            transcript_text = transcription_results.get('pt', {}).get('text', '')\n            if transcript_text:\n                classification = self.video_analyzer.classify_content(\n                    transcript_text, \n                    visual_analysis\n                )\n                video_doc['classification'] = classification\n                \n                # Extração de keywords\n                keywords = self.video_analyzer.extract_keywords(transcript_text)\n                video_doc['keywords'] = keywords\n                \n                # Geração de contexto\n                video_doc['video_context'] = self.video_analyzer.generate_video_context(\n                    transcript_text,\n                    visual_analysis,\n                    classification\n                )\n            \n            progress_bar.update(1)\n            progress_bar.set_description(f"💾 Salvando no banco: {video_name[:30]}...")\n            \n            # Salva no banco de dados\n            if self.use_mongo:\n                video_id = self.db_manager.upsert_video(video_doc)\n            else:\n                # Converte para SQLAlchemy model se necessário\n                from database import VideoRecord\n                video_record = VideoRecord(\n                    file_path=video_doc['file_path'],\n                    file_name=video_doc['file_name'],\n                    file_size=video_doc['file_size'],\n                    duration=video_doc.get('duration'),\n                    transcript_pt=transcript_text,\n                    category=video_doc.get('classification', {}).get('category'),\n                    confidence_score=video_doc.get('classification', {}).get('confidence'),\n                    keywords=json.dumps(video_doc.get('keywords', [])),\n                    video_context=video_doc.get('video_context')\n                )\n                video_id = self.db_manager.add_video(video_record)\n            \n            progress_bar.update(1)\n            progress_bar.set_description(f"✅ Concluído: {video_name[:30]}")\n            progress_bar.close()\n            \n            return video_id\n            \n        except Exception as e:\n            if progress_bar:\n                progress_bar.set_description(f"❌ Erro: {video_name[:30]} - {str(e)[:50]}")\n                progress_bar.close()\n            logger.error(f"Erro ao processar vídeo {video_path}: {str(e)}")\n            return None
+                progress_bar.set_description(f"✅ Já processado: {video_name[:30]}")
+                progress_bar.update(7)
+                progress_bar.close()
+                return existing_record.get('_id') if self.use_mongo else existing_record.id
+            
+            progress_bar.update(1)
+            progress_bar.set_description(f"📊 Criando registro: {video_name[:30]}...")
+            
+            # Cria documento para o vídeo
+            video_doc = {
+                'file_path': video_path,
+                'file_name': os.path.basename(video_path),
+                'file_size': os.path.getsize(video_path),
+                'directory': str(Path(video_path).parent)
+            }
+            
+            # Obtém duração do vídeo
+            duration = self.transcription_engine.get_video_duration(video_path)
+            if duration:
+                video_doc['duration'] = duration
+            
+            progress_bar.update(1)
+            progress_bar.set_description(f"🎤 Transcrevendo: {video_name[:30]}...")
+            
+            # Transcrição
+            transcription_results = self.transcription_engine.transcribe_video(
+                video_path, languages=['pt'], progress_callback=progress_bar
+            )
+            
+            if not transcription_results:
+                progress_bar.set_description(f"❌ Falha na transcrição: {video_name[:30]}")
+                progress_bar.close()
+                return None
+            
+            video_doc['transcript'] = transcription_results
+            
+            progress_bar.update(1)
+            progress_bar.set_description(f"👁️ Analisando visual: {video_name[:30]}...")
+            
+            # Análise visual
+            frames = self.video_analyzer.extract_video_frames(video_path)
+            visual_analysis = self.video_analyzer.analyze_visual_content(frames)
+            video_doc['visual_analysis'] = visual_analysis
+            
+            progress_bar.update(1)
+            progress_bar.set_description(f"🏷️ Classificando: {video_name[:30]}...")
+            
+            # Classificação
+            transcript_text = transcription_results.get('pt', {}).get('text', '')
+            if transcript_text:
+                classification = self.video_analyzer.classify_content(
+                    transcript_text, 
+                    visual_analysis
+                )
+                video_doc['classification'] = classification
+                
+                # Extração de keywords
+                keywords = self.video_analyzer.extract_keywords(transcript_text)
+                video_doc['keywords'] = keywords
+                
+                # Geração de contexto
+                video_doc['video_context'] = self.video_analyzer.generate_video_context(
+                    transcript_text,
+                    visual_analysis,
+                    classification
+                )
+            
+            progress_bar.update(1)
+            progress_bar.set_description(f"💾 Salvando no banco: {video_name[:30]}...")
+            
+            # Salva no banco de dados
+            if self.use_mongo:
+                video_id = self.db_manager.upsert_video(video_doc)
+            else:
+                # Converte para SQLAlchemy model se necessário
+                from database import VideoRecord
+                video_record = VideoRecord(
+                    file_path=video_doc['file_path'],
+                    file_name=video_doc['file_name'],
+                    file_size=video_doc['file_size'],
+                    duration=video_doc.get('duration'),
+                    transcript_pt=transcript_text,
+                    category=video_doc.get('classification', {}).get('category'),
+                    confidence_score=video_doc.get('classification', {}).get('confidence'),
+                    keywords=json.dumps(video_doc.get('keywords', [])),
+                    video_context=video_doc.get('video_context')
+                )
+                video_id = self.db_manager.add_video(video_record)
+            
+            progress_bar.update(1)
+            progress_bar.set_description(f"✅ Concluído: {video_name[:30]}")
+            progress_bar.close()
+            
+            return video_id
+            
+        except Exception as e:
+            if progress_bar:
+                progress_bar.set_description(f"❌ Erro: {video_name[:30]} - {str(e)[:50]}")
+                progress_bar.close()
+            logger.error(f"Erro ao processar vídeo {video_path}: {str(e)}")
+            return None
+    
+    def process_image(self, image_path, progress_bar=None):
+        """
+        Processa uma única imagem: análise visual, geração de legenda e categorização
+        """
+        try:
+            image_name = os.path.basename(image_path)
+            
+            if progress_bar is None:
+                progress_bar = tqdm(total=4, desc=f"Processando {image_name[:30]}...", 
+                                  unit="etapa", leave=True)
+            
+            progress_bar.set_description(f"📁 Verificando: {image_name[:30]}...")
+            
+            # Verifica se a imagem já foi processada
+            if self.use_mongo:
+                existing_record = self.db_manager.get_image_by_path(image_path)
+                if existing_record:
+                    progress_bar.set_description(f"✅ Já processado: {image_name[:30]}")
+                    progress_bar.update(4)
+                    progress_bar.close()
+                    return existing_record.get('_id')
+            
+            progress_bar.update(1)
+            progress_bar.set_description(f"🖼️ Analisando imagem: {image_name[:30]}...")
+            
+            # Análise completa da imagem
+            image_analysis = self.image_analyzer.describe_image(image_path)
+            if not image_analysis:
+                progress_bar.set_description(f"❌ Falha na análise: {image_name[:30]}")
+                progress_bar.close()
+                return None
+            
+            progress_bar.update(1)
+            progress_bar.set_description(f"🏷️ Categorizando: {image_name[:30]}...")
+            
+            # Categorização e persistência
+            image_id = self._save_image_analysis(image_path, image_analysis)
+            
+            progress_bar.update(2)
+            progress_bar.set_description(f"✅ Concluído: {image_name[:30]}")
+            progress_bar.close()
+            
+            return image_id
+            
+        except Exception as e:
+            if progress_bar:
+                progress_bar.set_description(f"❌ Erro: {image_name[:30]} - {str(e)[:50]}")
+                progress_bar.close()
+            logger.error(f"Erro ao processar imagem {image_path}: {str(e)}")
+            return None
+    
+    def _save_image_analysis(self, image_path, image_analysis):
+        """
+        Categoriza a imagem já descrita e grava o documento no banco
+        """
+        # Categorização
+        categorization = self.image_analyzer.categorize_image(
+            image_analysis['caption'],
+            image_analysis['visual_features'],
+            image_analysis['classification']
+        )
+        
+        # Monta documento para persistência
+        image_doc = {
+            'file_path': image_path,
+            'file_name': os.path.basename(image_path),
+            'file_size': os.path.getsize(image_path),
+            'directory': str(Path(image_path).parent),
+            'caption': image_analysis['caption'],
+            'keywords': image_analysis['keywords'],
+            'visual_features': image_analysis['visual_features'],
+            'perceptual_hash': image_analysis.get('perceptual_hash'),
+            'classification': {
+                **image_analysis['classification'],
+                **categorization
+            }
+        }
+        
+        if image_analysis.get('duplicate_of'):
+            image_doc['duplicate_of'] = image_analysis['duplicate_of']
+        
+        # Salva no banco
+        if self.use_mongo:
+            return self.db_manager.upsert_image(image_doc)
+        # SQLite não tem suporte nativo a imagens no esquema atual
+        logger.warning("Processamento de imagens requer MongoDB")
+        return None
+    
+    def _process_images(self, image_paths, overall_progress):
+        """
+        Fase de imagens do diretório: as já salvas são puladas e as demais
+        são descritas em lotes (ImageAnalyzer.iter_describe_images)
+        """
+        image_ids = []
+        pending = []
+        for image_path in image_paths:
+            existing_record = self.db_manager.get_image_by_path(image_path) if self.use_mongo else None
+            if existing_record:
+                image_ids.append(existing_record.get('_id'))
+                overall_progress.update(1)
+            else:
+                pending.append(image_path)
+        
+        for i, (image_path, image_analysis) in enumerate(self.image_analyzer.iter_describe_images(pending)):
+            overall_progress.set_description(f"🖼️ [{i+1}/{len(pending)}] Processando imagens")
+            try:
+                if image_analysis:
+                    image_id = self._save_image_analysis(image_path, image_analysis)
+                    if image_id:
+                        image_ids.append(image_id)
+            except Exception as e:
+                logger.error(f"Erro ao processar imagem {image_path}: {str(e)}")
+            overall_progress.update(1)
+        
+        return image_ids
+    
+    def process_directory(self, directory_path, recursive=True, include_images=True):
+        """
+        Processa todos os vídeos e imagens em um diretório
+        """
+        try:
+            print(f"📁 Escaneando diretório: {directory_path}")
+            
+            directory = Path(directory_path)
+            
+            # Busca por arquivos de vídeo
+            video_paths = []
+            if recursive:
+                for ext in config.VIDEO_EXTENSIONS:
+                    video_paths.extend(list(directory.glob(f"**/*{ext}")))
+            else:
+                for ext in config.VIDEO_EXTENSIONS:
+                    video_paths.extend(list(directory.glob(f"*{ext}")))
+            
+            # Busca por arquivos de imagem (se habilitado)
+            image_paths = []
+            if include_images and self.use_mongo:
+                image_extensions = ['.jpg', '.jpeg', '.png', '.bmp', '.webp', '.tiff', '.gif']
+                if recursive:
+                    for ext in image_extensions:
+                        image_paths.extend(list(directory.glob(f"**/*{ext}")))
+                else:
+                    for ext in image_extensions:
+                        image_paths.extend(list(directory.glob(f"*{ext}")))
+            
+            total_files = len(video_paths) + len(image_paths)
+            
+            if total_files == 0:
+                print(f"⚠️  Nenhum arquivo encontrado em: {directory_path}")
+                return []
+            
+            print(f"🎬 Encontrados {len(video_paths)} vídeos e {len(image_paths)} imagens para processamento\n")
+            
+            # Barra de progresso geral
+            overall_progress = tqdm(
+                total=total_files,
+                desc="📺 Processamento Geral",
+                unit="arquivo",
+                position=0,
+                leave=True
+            )
+            
+            results = {'videos': [], 'images': []}
+            
+            # Processa vídeos
+            for i, video_path in enumerate(video_paths):
+                try:
+                    overall_progress.set_description(f"📺 [{i+1}/{len(video_paths)}] Processando vídeos")
+                    video_id = self.process_video(str(video_path))
+                    if video_id:
+                        results['videos'].append(video_id)
+                    overall_progress.update(1)
+                except Exception as e:
+                    logger.error(f"Erro ao processar vídeo {video_path}: {str(e)}")
+                    overall_progress.update(1)
+            
+            # Processa imagens em lotes
+            if image_paths:
+                results['images'].extend(self._process_images([str(p) for p in image_paths], overall_progress))
+            
+            overall_progress.set_description(
+                f"✅ Processamento concluído: {len(results['videos'])} vídeos, {len(results['images'])} imagens"
+            )
+            overall_progress.close()
+            
+            print(f"\n🎉 Processamento concluído! {len(results['videos'])} vídeos e {len(results['images'])} imagens processados.")
+            return results
+            
+        except Exception as e:
+            logger.error(f"Erro ao processar diretório {directory_path}: {str(e)}")
+            return {'videos': [], 'images': []}
+    
+    def get_duplicate_clusters(self, directory=None, max_distance=config.IMAGE_DEDUP_MAX_DISTANCE):
+        """
+        Grupos de imagens quase idênticas por diretório: {diretório: [[caminhos]]}
+        """
+        if not self.use_mongo:
+            logger.warning("Relatório de duplicatas de imagens requer MongoDB")
+            return {}
+        
+        by_directory = {}
+        for image_doc in self.db_manager.get_image_hashes(directory):
+            by_directory.setdefault(image_doc.get('directory') or str(Path(image_doc['file_path']).parent), []).append(image_doc)
+        
+        report = {}
+        for image_directory, images in sorted(by_directory.items()):
+            clusters = duplicate_clusters(images, max_distance)
+            if clusters:
+                report[image_directory] = clusters
+        return report
+    
+    def search_content(self, query, content_type="all", limit=10):
+        """
+        Busca unificada em vídeos e/ou imagens
+        """
+        results = {'videos': [], 'images': []}
+        
+        if content_type in ["all", "videos"]:
+            if self.use_mongo:
+                video_results = self.db_manager.search_videos_text(query, limit)
+                results['videos'] = video_results
+            else:
+                video_results = self.search_engine.search_by_text(query, limit)
+                results['videos'] = [r['video'] for r in video_results]
+        
+        if content_type in ["all", "images"] and self.use_mongo:
+            image_results = self.db_manager.search_images_text(query, limit)
+            results['images'] = image_results
+        
+        return results
+    
+    def get_directory_summary(self, directory):
+        """
+        Retorna resumo de um diretório específico
+        """
+        if self.use_mongo:
+            return self.db_manager.get_directory_summary(directory)
+        else:
+            # Implementação simples para SQLite
+            videos = [v for v in self.db_manager.get_all_videos() 
+                     if str(Path(v.file_path).parent) == directory]
+            
+            summary = {
+                'directory': directory,
+                'videos': {
+                    'count': len(videos),
+                    'total_duration': sum(v.duration or 0 for v in videos),
+                    'categories': {}
+                },
+                'images': {'count': 0, 'categories': {}}  # SQLite não suporta imagens
+            }
+            
+            for video in videos:
+                category = video.category or 'outros'
+                summary['videos']['categories'][category] = summary['videos']['categories'].get(category, 0) + 1
+            
+            return summary
+    
+    def search_by_directory(self, directory, content_type="all"):
+        """
+        Busca todo conteúdo de um diretório específico
+        """
+        results = {'videos': [], 'images': []}
+        
+        if content_type in ["all", "videos"]:
+            if self.use_mongo:
+                results['videos'] = self.db_manager.get_videos_by_directory(directory)
+            else:
+                all_videos = self.db_manager.get_all_videos()
+                results['videos'] = [v for v in all_videos 
+                                   if str(Path(v.file_path).parent) == directory]
+        
+        if content_type in ["all", "images"] and self.use_mongo:
+            results['images'] = self.db_manager.get_images_by_directory(directory)
+        
+        return results
+
+class MongoSearchEngine:
+    """
+    Motor de busca adaptado para MongoDB
+    """
+    
+    def __init__(self, mongo_manager):
+        self.db = mongo_manager
+        self.logger = logging.getLogger(__name__)
+    
+    def search_by_text(self, query, limit=10):
+        """
+        Busca textual usando índices do MongoDB
+        """
+        try:
+            results = self.db.search_videos_text(query, limit)
+            return [{'video': r, 'similarity_score': r.get('score', 0)} for r in results]
+        except Exception as e:
+            self.logger.error(f"Erro na busca textual: {e}")
+            return []
     
-    def process_image(self, image_path, progress_bar=None):\n        \"\"\"\n        Processa uma única imagem: análise visual, geração de legenda e categorização\n        \"\"\"\n        try:\n            image_name = os.path.basename(image_path)\n            \n            if progress_bar is None:\n                progress_bar = tqdm(total=4, desc=f"Processando {image_name[:30]}...", \n                                  unit="etapa", leave=True)\n            \n            progress_bar.set_description(f"📁 Verificando: {image_name[:30]}...")\n            \n            # Verifica se a imagem já foi processada\n            if self.use_mongo:\n                existing_record = self.db_manager.get_image_by_path(image_path)\n                if existing_record:\n                    progress_bar.set_description(f"✅ Já processado: {image_name[:30]}")\n                    progress_bar.update(4)\n                    progress_bar.close()\n                    return existing_record.get('_id')\n            \n            progress_bar.update(1)\n            progress_bar.set_description(f"🖼️ Analisando imagem: {image_name[:30]}...")\n            \n            # Análise completa da imagem\n            image_analysis = self.image_analyzer.describe_image(image_path)\n            if not image_analysis:\n                progress_bar.set_description(f"❌ Falha na análise: {image_name[:30]}")\n                progress_bar.close()\n                return None\n            \n            progress_bar.update(1)\n            progress_bar.set_description(f"🏷️ Categorizando: {image_name[:30]}...")\n            \n            # Categorização\n            categorization = self.image_analyzer.categorize_image(\n                image_analysis['caption'],\n                image_analysis['visual_features'],\n                image_analysis['classification']\n            )\n            \n            # Monta documento para persistência\n            image_doc = {\n                'file_path': image_path,\n                'file_name': os.path.basename(image_path),\n                'file_size': os.path.getsize(image_path),\n                'directory': str(Path(image_path).parent),\n                'caption': image_analysis['caption'],\n                'keywords': image_analysis['keywords'],\n                'visual_features': image_analysis['visual_features'],\n                'classification': {\n                    **image_analysis['classification'],\n                    **categorization\n                }\n            }\n            \n            progress_bar.update(1)\n            progress_bar.set_description(f"💾 Salvando no banco: {image_name[:30]}...")\n            \n            # Salva no banco\n            if self.use_mongo:\n                image_id = self.db_manager.upsert_image(image_doc)\n            else:\n                # SQLite não tem suporte nativo a imagens no esquema atual\n                logger.warning("Processamento de imagens requer MongoDB")\n                image_id = None\n            \n            progress_bar.update(1)\n            progress_bar.set_description(f"✅ Concluído: {image_name[:30]}")\n            progress_bar.close()\n            \n            return image_id\n            \n        except Exception as e:\n            if progress_bar:\n                progress_bar.set_description(f"❌ Erro: {image_name[:30]} - {str(e)[:50]}")\n                progress_bar.close()\n            logger.error(f"Erro ao processar imagem {image_path}: {str(e)}")\n            return None
-    \n    def process_directory(self, directory_path, recursive=True, include_images=True):\n        \"\"\"\n        Processa todos os vídeos e imagens em um diretório\n        \"\"\"\n        try:\n            print(f"📁 Escaneando diretório: {directory_path}")\n            \n            directory = Path(directory_path)\n            \n            # Busca por arquivos de vídeo\n            video_paths = []\n            if recursive:\n                for ext in config.VIDEO_EXTENSIONS:\n                    video_paths.extend(list(directory.glob(f"**/*{ext}")))\n            else:\n                for ext in config.VIDEO_EXTENSIONS:\n                    video_paths.extend(list(directory.glob(f"*{ext}")))\n            \n            # Busca por arquivos de imagem (se habilitado)\n            image_paths = []\n            if include_images and self.use_mongo:\n                image_extensions = ['.jpg', '.jpeg', '.png', '.bmp', '.webp', '.tiff', '.gif']\n                if recursive:\n                    for ext in image_extensions:\n                        image_paths.extend(list(directory.glob(f"**/*{ext}")))\n                else:\n                    for ext in image_extensions:\n                        image_paths.extend(list(directory.glob(f"*{ext}")))\n            \n            total_files = len(video_paths) + len(image_paths)\n            \n            if total_files == 0:\n                print(f"⚠️  Nenhum arquivo encontrado em: {directory_path}")\n                return []\n            \n            print(f"🎬 Encontrados {len(video_paths)} vídeos e {len(image_paths)} imagens para processamento\\n")\n            \n            # Barra de progresso geral\n            overall_progress = tqdm(\n                total=total_files,\n                desc="📺 Processamento Geral",\n                unit="arquivo",\n                position=0,\n                leave=True\n            )\n            \n            results = {'videos': [], 'images': []}\n            \n            # Processa vídeos\n            for i, video_path in enumerate(video_paths):\n                try:\n                    overall_progress.set_description(f"📺 [{i+1}/{len(video_paths)}] Processando vídeos")\n                    video_id = self.process_video(str(video_path))\n                    if video_id:\n                        results['videos'].append(video_id)\n                    overall_progress.update(1)\n                except Exception as e:\n                    logger.error(f"Erro ao processar vídeo {video_path}: {str(e)}")\n                    overall_progress.update(1)\n            \n            # Processa imagens\n            for i, image_path in enumerate(image_paths):\n                try:\n                    overall_progress.set_description(f"🖼️ [{i+1}/{len(image_paths)}] Processando imagens")\n                    image_id = self.process_image(str(image_path))\n                    if image_id:\n                        results['images'].append(image_id)\n                    overall_progress.update(1)\n                except Exception as e:\n                    logger.error(f"Erro ao processar imagem {image_path}: {str(e)}")\n                    overall_progress.update(1)\n            \n            overall_progress.set_description(\n                f"✅ Processamento concluído: {len(results['videos'])} vídeos, {len(results['images'])} imagens"\n            )\n            overall_progress.close()\n            \n            print(f"\\n🎉 Processamento concluído! {len(results['videos'])} vídeos e {len(results['images'])} imagens processados.")\n            return results\n            \n        except Exception as e:\n            logger.error(f"Erro ao processar diretório {directory_path}: {str(e)}")\n            return {'videos': [], 'images': []}\n    \n    def search_content(self, query, content_type="all", limit=10):\n        \"\"\"\n        Busca unificada em vídeos e/ou imagens\n        \"\"\"\n        results = {'videos': [], 'images': []}\n        \n        if content_type in ["all", "videos"]:\n            if self.use_mongo:\n                video_results = self.db_manager.search_videos_text(query, limit)\n                results['videos'] = video_results\n            else:\n                video_results = self.search_engine.search_by_text(query, limit)\n                results['videos'] = [r['video'] for r in video_results]\n        \n        if content_type in ["all", "images"] and self.use_mongo:\n            image_results = self.db_manager.search_images_text(query, limit)\n            results['images'] = image_results\n        \n        return results\n    \n    def get_directory_summary(self, directory):\n        \"\"\"\n        Retorna resumo de um diretório específico\n        \"\"\"\n        if self.use_mongo:\n            return self.db_manager.get_directory_summary(directory)\n        else:\n            # Implementação simples para SQLite\n            videos = [v for v in self.db_manager.get_all_videos() \n                     if str(Path(v.file_path).parent) == directory]\n            \n            summary = {\n                'directory': directory,\n                'videos': {\n                    'count': len(videos),\n                    'total_duration': sum(v.duration or 0 for v in videos),\n                    'categories': {}\n                },\n                'images': {'count': 0, 'categories': {}}  # SQLite não suporta imagens\n            }\n            \n            for video in videos:\n                category = video.category or 'outros'\n                summary['videos']['categories'][category] = summary['videos']['categories'].get(category, 0) + 1\n            \n            return summary
-    \n    def search_by_directory(self, directory, content_type="all"):\n        \"\"\"\n        Busca todo conteúdo de um diretório específico\n        \"\"\"\n        results = {'videos': [], 'images': []}\n        \n        if content_type in ["all", "videos"]:\n            if self.use_mongo:\n                results['videos'] = self.db_manager.get_videos_by_directory(directory)\n            else:\n                all_videos = self.db_manager.get_all_videos()\n                results['videos'] = [v for v in all_videos \n                                   if str(Path(v.file_path).parent) == directory]\n        \n        if content_type in ["all", "images"] and self.use_mongo:\n            results['images'] = self.db_manager.get_images_by_directory(directory)\n        \n        return results\n\nclass MongoSearchEngine:\n    \"\"\"\n    Motor de busca adaptado para MongoDB\n    \"\"\"\n    \n    def __init__(self, mongo_manager):\n        self.db = mongo_manager\n        self.logger = logging.getLogger(__name__)\n    \n    def search_by_text(self, query, limit=10):\n        \"\"\"\n        Busca textual usando índices do MongoDB\n        \"\"\"\n        try:\n            results = self.db.search_videos_text(query, limit)\n            return [{'video': r, 'similarity_score': r.get('score', 0)} for r in results]\n        except Exception as e:\n            self.logger.error(f"Erro na busca textual: {e}")\n            return []\n    \n    def search_by_category(self, category):\n        \"\"\"\n        Busca por categoria\n        \"\"\"\n        try:\n            videos = self.db.get_videos_by_category(category)\n            return [{'video': v, 'confidence': v.get('classification', {}).get('confidence', 0)} \n                   for v in videos]\n        except Exception as e:\n            self.logger.error(f"Erro na busca por categoria: {e}")\n            return []\n    \n    def get_content_summary(self):\n        \"\"\"\n        Resumo global do conteúdo\n        \"\"\"\n        try:\n            return self.db.get_global_summary()\n        except Exception as e:\n            self.logger.error(f"Erro ao gerar resumo: {e}")\n            return {}\n\ndef main():\n    # Configuração dos argumentos de linha de comando\n    parser = argparse.ArgumentParser(description='Orquestrador estendido com suporte a imagens e MongoDB')\n    \n    # Opção global para banco\n    parser.add_argument('--use-sqlite', action='store_true', \n                       help='Usar SQLite em vez de MongoDB')\n    \n    # Subcomandos\n    subparsers = parser.add_subparsers(dest='command', help='Comando a ser executado')\n    \n    # Comando para processar diretório\n    process_parser = subparsers.add_parser('process', help='Processar vídeos e imagens')\n    process_parser.add_argument('directory', help='Diretório contendo arquivos para processamento')\n    process_parser.add_argument('--recursive', '-r', action='store_true', \n                               help='Buscar arquivos recursivamente em subdiretórios')\n    process_parser.add_argument('--videos-only', action='store_true', \n                               help='Processar apenas vídeos')\n    \n    # Comando para buscar conteúdo\n    search_parser = subparsers.add_parser('search', help='Buscar vídeos e imagens')\n    search_parser.add_argument('--query', '-q', help='Termo de busca textual')\n    search_parser.add_argument('--category', '-c', help='Buscar por categoria')\n    search_parser.add_argument('--keywords', '-k', help='Buscar por palavras-chave (separadas por vírgula)')\n    search_parser.add_argument('--directory', '-d', help='Buscar em diretório específico')\n    search_parser.add_argument('--type', choices=['all', 'videos', 'images'], default='all',\n                              help='Tipo de conteúdo a buscar')\n    \n    # Comando para resumo\n    summary_parser = subparsers.add_parser('summary', help='Mostrar resumo do conteúdo')\n    summary_parser.add_argument('--directory', '-d', help='Resumo de diretório específico')\n    \n    # Parseia os argumentos\n    args = parser.parse_args()\n    \n    # Inicializa o orquestrador\n    use_mongo = not args.use_sqlite\n    orchestrator = ExtendedOrchestrator(use_mongo=use_mongo)\n    \n    # Executa o comando especificado\n    if args.command == 'process':\n        start_time = time.time()\n        include_images = not args.videos_only\n        results = orchestrator.process_directory(args.directory, args.recursive, include_images)\n        elapsed_time = time.time() - start_time\n        logger.info(f"Processamento concluído em {elapsed_time:.2f} segundos")\n        \n    elif args.command == 'search':\n        if args.directory:\n            results = orchestrator.search_by_directory(args.directory, args.type)\n            print(f"\\nConteúdo do diretório '{args.directory}':")\n            \n            if results['videos']:\n                print(f"\\n📺 Vídeos ({len(results['videos'])}):")\n                for i, video in enumerate(results['videos'], 1):\n                    file_name = video.get('file_name') if use_mongo else video.file_name\n                    category = video.get('classification', {}).get('category', 'outros') if use_mongo else video.category\n                    print(f"  {i}. {file_name} (Categoria: {category})")\n            \n            if results['images']:\n                print(f"\\n🖼️ Imagens ({len(results['images'])}):")\n                for i, image in enumerate(results['images'], 1):\n                    file_name = image.get('file_name')\n                    category = image.get('classification', {}).get('category', 'outros')\n                    caption = image.get('caption', '')[:100] + ('...' if len(image.get('caption', '')) > 100 else '')\n                    print(f"  {i}. {file_name} (Categoria: {category})")\n                    if caption:\n                        print(f"     Descrição: {caption}")\n        \n        elif args.query:\n            results = orchestrator.search_content(args.query, args.type)\n            print(f"\\nResultados da busca por '{args.query}':")\n            \n            if results['videos']:\n                print(f"\\n📺 Vídeos encontrados:")\n                for i, video in enumerate(results['videos'], 1):\n                    if use_mongo:\n                        file_name = video.get('file_name')\n                        context = video.get('video_context', '')[:150]\n                        score = video.get('score', 0)\n                    else:\n                        file_name = video.file_name\n                        context = video.video_context[:150] if video.video_context else ''\n                        score = 0\n                    \n                    print(f"\\n{i}. {file_name}")\n                    print(f"   Score: {score:.4f}")\n                    print(f"   Contexto: {context}...")\n            \n            if results['images']:\n                print(f"\\n🖼️ Imagens encontradas:")\n                for i, image in enumerate(results['images'], 1):\n                    file_name = image.get('file_name')\n                    caption = image.get('caption', '')[:150]\n                    score = image.get('score', 0)\n                    \n                    print(f"\\n{i}. {file_name}")\n                    print(f"   Score: {score:.4f}")\n                    print(f"   Descrição: {caption}...")\n        \n        else:\n            print("Erro: Especifique um critério de busca (--query, --category, --keywords ou --directory)")\n    \n    elif args.command == 'summary':\n        if args.directory:\n            summary = orchestrator.get_directory_summary(args.directory)\n            print(f"\\n=== RESUMO DO DIRETÓRIO: {args.directory} ===")\n            \n            videos = summary.get('videos', {})\n            images = summary.get('images', {})\n            \n            print(f"📺 Vídeos: {videos.get('count', 0)}")\n            if videos.get('total_duration'):\n                print(f"   Duração total: {videos['total_duration']/3600:.1f} horas")\n            \n            print(f"🖼️ Imagens: {images.get('count', 0)}")\n            \n            print("\\nCategorias de vídeos:")\n            for category, count in videos.get('categories', {}).items():\n                print(f"  - {category}: {count}")\n            \n            print("\\nCategorias de imagens:")\n            for category, count in images.get('categories', {}).items():\n                print(f"  - {category}: {count}")\n        \n        else:\n            if use_mongo:\n                summary = orchestrator.db_manager.get_global_summary()\n            else:\n                # Fallback para search engine original\n                summary = orchestrator.search_engine.get_content_summary()\n            \n            print("\\n=== RESUMO GLOBAL DO CONTEÚDO ===")\n            \n            if use_mongo:\n                videos = summary.get('videos', {})\n                images = summary.get('images', {})\n                \n                print(f"📺 Total de vídeos: {videos.get('total_count', 0)}")\n                print(f"   Duração total: {videos.get('total_duration_hours', 0):.1f} horas")\n                print(f"   Diretórios: {len(videos.get('directories', []))}")\n                \n                print(f"🖼️ Total de imagens: {images.get('total_count', 0)}")\n                print(f"   Diretórios: {len(images.get('directories', []))}")\n                \n                print("\\nCategorias de vídeos:")\n                for category, count in videos.get('categories', {}).items():\n                    print(f"  - {category}: {count}")\n                \n                print("\\nCategorias de imagens:")\n                for category, count in images.get('categories', {}).items():\n                    print(f"  - {category}: {count}")\n            else:\n                # Formato original do SQLite\n                print(f"Total de vídeos: {summary.get('total_videos', 0)}")\n                print(f"Duração total: {summary.get('total_duration_hours', 0):.1f} horas")\n                \n                print("\\nVídeos por categoria:")\n                for category, count in summary.get('categories', {}).items():\n                    print(f"  - {category}: {count} vídeos")\n    \n    else:\n        parser.print_help()\n\nif __name__ == "__main__":\n    main()\n"}}
-</function_results>
+    def search_by_category(self, category):
+        """
+        Busca por categoria
+        """
+        try:
+            videos = self.db.get_videos_by_category(category)
+            return [{'video': v, 'confidence': v.get('classification', {}).get('confidence', 0)} 
+                   for v in videos]
+        except Exception as e:
+            self.logger.error(f"Erro na busca por categoria: {e}")
+            return []
+    
+    def get_content_summary(self):
+        """
+        Resumo global do conteúdo
+        """
+        try:
+            return self.db.get_global_summary()
+        except Exception as e:
+            self.logger.error(f"Erro ao gerar resumo: {e}")
+            return {}
 
-Agora vou atualizar o arquivo de configuração para incluir as novas opções:
+def main():
+    # Configuração dos argumentos de linha de comando
+    parser = argparse.ArgumentParser(description='Orquestrador estendido com suporte a imagens e MongoDB')
+    
+    # Opção global para banco
+    parser.add_argument('--use-sqlite', action='store_true', 
+                       help='Usar SQLite em vez de MongoDB')
+    
+    # Subcomandos
+    subparsers = parser.add_subparsers(dest='command', help='Comando a ser executado')
+    
+    # Comando para processar diretório
+    process_parser = subparsers.add_parser('process', help='Processar vídeos e imagens')
+    process_parser.add_argument('directory', help='Diretório contendo arquivos para processamento')
+    process_parser.add_argument('--recursive', '-r', action='store_true', 
+                               help='Buscar arquivos recursivamente em subdiretórios')
+    process_parser.add_argument('--videos-only', action='store_true', 
+                               help='Processar apenas vídeos')
+    
+    # Comando para buscar conteúdo
+    search_parser = subparsers.add_parser('search', help='Buscar vídeos e imagens')
+    search_parser.add_argument('--query', '-q', help='Termo de busca textual')
+    search_parser.add_argument('--category', '-c', help='Buscar por categoria')
+    search_parser.add_argument('--keywords', '-k', help='Buscar por palavras-chave (separadas por vírgula)')
+    search_parser.add_argument('--directory', '-d', help='Buscar em diretório específico')
+    search_parser.add_argument('--type', choices=['all', 'videos', 'images'], default='all',
+                              help='Tipo de conteúdo a buscar')
+    
+    # Comando para resumo
+    summary_parser = subparsers.add_parser('summary', help='Mostrar resumo do conteúdo')
+    summary_parser.add_argument('--directory', '-d', help='Resumo de diretório específico')
+    
+    # Comando para relatório de imagens duplicadas
+    duplicates_parser = subparsers.add_parser('duplicates', help='Listar grupos de imagens quase idênticas')
+    duplicates_parser.add_argument('--directory', '-d', help='Relatório de diretório específico')
+    duplicates_parser.add_argument('--max-distance', type=int, default=config.IMAGE_DEDUP_MAX_DISTANCE,
+                                   help='Distância de Hamming máxima entre hashes perceptuais')
+    
+    # Parseia os argumentos
+    args = parser.parse_args()
+    
+    # Inicializa o orquestrador
+    use_mongo = not args.use_sqlite
+    orchestrator = ExtendedOrchestrator(use_mongo=use_mongo)
+    
+    # Executa o comando especificado
+    if args.command == 'process':
+        start_time = time.time()
+        include_images = not args.videos_only
+        results = orchestrator.process_directory(args.directory, args.recursive, include_images)
+        elapsed_time = time.time() - start_time
+        logger.info(f"Processamento concluído em {elapsed_time:.2f} segundos")
+        get_model_registry().print_stats()
+        
+    elif args.command == 'search':
+        if args.directory:
+            results = orchestrator.search_by_directory(args.directory, args.type)
+            print(f"\nConteúdo do diretório '{args.directory}':")
+            
+            if results['videos']:
+                print(f"\n📺 Vídeos ({len(results['videos'])}):")
+                for i, video in enumerate(results['videos'], 1):
+                    file_name = video.get('file_name') if use_mongo else video.file_name
+                    category = video.get('classification', {}).get('category', 'outros') if use_mongo else video.category
+                    print(f"  {i}. {file_name} (Categoria: {category})")
+            
+            if results['images']:
+                print(f"\n🖼️ Imagens ({len(results['images'])}):")
+                for i, image in enumerate(results['images'], 1):
+                    file_name = image.get('file_name')
+                    category = image.get('classification', {}).get('category', 'outros')
+                    caption = image.get('caption', '')[:100] + ('...' if len(image.get('caption', '')) > 100 else '')
+                    print(f"  {i}. {file_name} (Categoria: {category})")
+                    if caption:
+                        print(f"     Descrição: {caption}")
+        
+        elif args.query:
+            results = orchestrator.search_content(args.query, args.type)
+            print(f"\nResultados da busca por '{args.query}':")
+            
+            if results['videos']:
+                print(f"\n📺 Vídeos encontrados:")
+                for i, video in enumerate(results['videos'], 1):
+                    if use_mongo:
+                        file_name = video.get('file_name')
+                        context = video.get('video_context', '')[:150]
+                        score = video.get('score', 0)
+                    else:
+                        file_name = video.file_name
+                        context = video.video_context[:150] if video.video_context else ''
+                        score = 0
+                    
+                    print(f"\n{i}. {file_name}")
+                    print(f"   Score: {score:.4f}")
+                    print(f"   Contexto: {context}...")
+            
+            if results['images']:
+                print(f"\n🖼️ Imagens encontradas:")
+                for i, image in enumerate(results['images'], 1):
+                    file_name = image.get('file_name')
+                    caption = image.get('caption', '')[:150]
+                    score = image.get('score', 0)
+                    
+                    print(f"\n{i}. {file_name}")
+                    print(f"   Score: {score:.4f}")
+                    print(f"   Descrição: {caption}...")
+        
+        else:
+            print("Erro: Especifique um critério de busca (--query, --category, --keywords ou --directory)")
+    
+    elif args.command == 'summary':
+        if args.directory:
+            summary = orchestrator.get_directory_summary(args.directory)
+            print(f"\n=== RESUMO DO DIRETÓRIO: {args.directory} ===")
+            
+            videos = summary.get('videos', {})
+            images = summary.get('images', {})
+            
+            print(f"📺 Vídeos: {videos.get('count', 0)}")
+            if videos.get('total_duration'):
+                print(f"   Duração total: {videos['total_duration']/3600:.1f} horas")
+            
+            print(f"🖼️ Imagens: {images.get('count', 0)}")
+            
+            print("\nCategorias de vídeos:")
+            for category, count in videos.get('categories', {}).items():
+                print(f"  - {category}: {count}")
+            
+            print("\nCategorias de imagens:")
+            for category, count in images.get('categories', {}).items():
+                print(f"  - {category}: {count}")
+        
+        else:
+            if use_mongo:
+                summary = orchestrator.db_manager.get_global_summary()
+            else:
+                # Fallback para search engine original
+                summary = orchestrator.search_engine.get_content_summary()
+            
+            print("\n=== RESUMO GLOBAL DO CONTEÚDO ===")
+            
+            if use_mongo:
+                videos = summary.get('videos', {})
+                images = summary.get('images', {})
+                
+                print(f"📺 Total de vídeos: {videos.get('total_count', 0)}")
+                print(f"   Duração total: {videos.get('total_duration_hours', 0):.1f} horas")
+                print(f"   Diretórios: {len(videos.get('directories', []))}")
+                
+                print(f"🖼️ Total de imagens: {images.get('total_count', 0)}")
+                print(f"   Diretórios: {len(images.get('directories', []))}")
+                
+                print("\nCategorias de vídeos:")
+                for category, count in videos.get('categories', {}).items():
+                    print(f"  - {category}: {count}")
+                
+                print("\nCategorias de imagens:")
+                for category, count in images.get('categories', {}).items():
+                    print(f"  - {category}: {count}")
+            else:
+                # Formato original do SQLite
+                print(f"Total de vídeos: {summary.get('total_videos', 0)}")
+                print(f"Duração total: {summary.get('total_duration_hours', 0):.1f} horas")
+                
+                print("\nVídeos por categoria:")
+                for category, count in summary.get('categories', {}).items():
+                    print(f"  - {category}: {count} vídeos")
+    
+    elif args.command == 'duplicates':
+        report = orchestrator.get_duplicate_clusters(args.directory, args.max_distance)
+        print("\n=== IMAGENS QUASE IDÊNTICAS ===")
+        if not report:
+            print("Nenhum grupo de duplicatas encontrado")
+        for directory, clusters in report.items():
+            duplicates = sum(len(cluster) - 1 for cluster in clusters)
+            print(f"\n📁 {directory}: {len(clusters)} grupos, {duplicates} duplicatas")
+            for i, cluster in enumerate(clusters, 1):
+                print(f"  {i}. {len(cluster)} imagens")
+                for path in cluster:
+                    print(f"     - {os.path.relpath(path, directory)}")
+    
+    else:
+        parser.print_help()
 
-<function_calls>
-<invoke name="edit_files">
-<parameter name="title">Adiciona configurações para MongoDB e processamento de imagens
+if __name__ == "__main__":
+    main()
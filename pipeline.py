@@ -0,0 +1,158 @@
+import logging
+import queue
+import threading
+import time
+import config
+
+# Marcador de fim de fila entre estágios
+_END = object()
+
+
+class PipelineStage:
+    """
+    Estágio do pipeline: aplica `func` a cada item usando `workers` threads.
+    A função recebe o item e retorna o item transformado, ou None para
+    descartá-lo (falha ou item que não deve seguir adiante).
+    """
+
+    def __init__(self, name, func, workers=1, label=None):
+        self.name = name
+        self.func = func
+        self.workers = max(1, int(workers))
+        self.label = label or name
+
+        # Estatísticas do estágio
+        self.processed = 0
+        self.failed = 0
+        self.busy_time = 0.0
+        self.first_start = None
+        self.last_end = None
+        self._lock = threading.Lock()
+
+    def _record(self, started, ended, ok):
+        with self._lock:
+            if self.first_start is None or started < self.first_start:
+                self.first_start = started
+            if self.last_end is None or ended > self.last_end:
+                self.last_end = ended
+            self.busy_time += ended - started
+            if ok:
+                self.processed += 1
+            else:
+                self.failed += 1
+
+    def stats(self):
+        """
+        Retorna estatísticas de vazão do estágio
+        """
+        wall_time = 0.0
+        if self.first_start is not None and self.last_end is not None:
+            wall_time = self.last_end - self.first_start
+        total = self.processed + self.failed
+        return {
+            'stage': self.name,
+            'label': self.label,
+            'workers': self.workers,
+            'processed': self.processed,
+            'failed': self.failed,
+            'busy_time': self.busy_time,
+            'wall_time': wall_time,
+            'throughput': self.processed / wall_time if wall_time > 0 else 0.0,
+            'avg_item_time': self.busy_time / total if total else 0.0
+        }
+
+
+class StagedPipeline:
+    """
+    Pipeline em estágios com filas limitadas entre eles.
+
+    Cada estágio roda em seu próprio conjunto de threads; as filas com
+    tamanho máximo aplicam contrapressão para que um estágio rápido (ex.:
+    decodificação) não acumule trabalho indefinidamente à frente de um
+    estágio lento (ex.: transcrição).
+    """
+
+    def __init__(self, stages, queue_size=config.PIPELINE_QUEUE_SIZE, on_item_done=None):
+        self.logger = logging.getLogger(__name__)
+        self.stages = stages
+        self.queue_size = max(1, int(queue_size))
+        self.on_item_done = on_item_done
+        self._callback_lock = threading.Lock()
+
+    def _notify(self, item, ok):
+        if self.on_item_done:
+            with self._callback_lock:
+                self.on_item_done(item, ok)
+
+    def _worker(self, stage, index, in_queue, out_queue, remaining, remaining_lock, results):
+        is_last = index == len(self.stages) - 1
+
+        while True:
+            item = in_queue.get()
+            if item is _END:
+                break
+
+            started = time.time()
+            try:
+                output = stage.func(item)
+            except Exception as e:
+                self.logger.error(f"Erro no estágio '{stage.name}': {str(e)}")
+                output = None
+            stage._record(started, time.time(), output is not None)
+
+            if output is None:
+                self._notify(item, False)
+            elif is_last:
+                results.append(output)
+                self._notify(output, True)
+            else:
+                out_queue.put(output)
+
+        # O último worker a sair propaga o fim para o próximo estágio
+        with remaining_lock:
+            remaining[index] -= 1
+            finished = remaining[index] == 0
+        if finished and not is_last:
+            for _ in range(self.stages[index + 1].workers):
+                out_queue.put(_END)
+
+    def run(self, items):
+        """
+        Executa todos os itens pelo pipeline e retorna a lista de saídas do
+        último estágio (na ordem de conclusão)
+        """
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        queues.append(None)
+        remaining = [stage.workers for stage in self.stages]
+        remaining_lock = threading.Lock()
+        results = []
+
+        threads = []
+        for index, stage in enumerate(self.stages):
+            for n in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._worker,
+                    args=(stage, index, queues[index], queues[index + 1],
+                          remaining, remaining_lock, results),
+                    name=f"pipeline-{stage.name}-{n}",
+                    daemon=True
+                )
+                thread.start()
+                threads.append(thread)
+
+        # Alimenta o primeiro estágio (bloqueia quando a fila enche)
+        for item in items:
+            queues[0].put(item)
+        for _ in range(self.stages[0].workers):
+            queues[0].put(_END)
+
+        for thread in threads:
+            thread.join()
+
+        return results
+
+    def stats(self):
+        """
+        Estatísticas de todos os estágios, na ordem do pipeline
+        """
+        return [stage.stats() for stage in self.stages]
@@ -1,24 +1,48 @@
 import logging
 import json
+import math
+import re
+import heapq
+from collections import Counter, defaultdict
 from database import DatabaseManager, VideoRecord
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
+
+# Mesmo padrão de token e stop words do TfidfVectorizer usado antes
+_TOKEN_RE = re.compile(r"(?u)\b\w\w+\b")
+SEARCH_STOP_WORDS = {'de', 'da', 'do', 'para', 'com', 'em', 'no', 'na', 'um', 'uma', 'o', 'a', 'e', 'que'}
 
 class ContentSearchEngine:
     def __init__(self, db_manager):
         self.db_manager = db_manager
         self.logger = logging.getLogger(__name__)
-        self.vectorizer = TfidfVectorizer(
-            stop_words=['de', 'da', 'do', 'para', 'com', 'em', 'no', 'na', 'um', 'uma', 'o', 'a', 'e', 'que']
-        )
         self.corpus = []
         self.video_ids = []
-        self._update_search_index()
+        self.idf = {}
+        self.postings = {}
+        # O índice TF-IDF só é montado na primeira busca textual
+        self._index_stale = True
     
     def _update_search_index(self):
         """
-        Atualiza o índice de busca com todos os vídeos do banco
+        Marca o índice como desatualizado (novos vídeos no banco); ele é
+        reconstruído na próxima busca textual
+        """
+        self._index_stale = True
+    
+    def _tokenize(self, text):
+        return [t for t in _TOKEN_RE.findall(text.lower()) if t not in SEARCH_STOP_WORDS]
+    
+    def _weigh(self, term_counts):
+        """
+        Vetor TF-IDF normalizado (L2) de um documento ou consulta
+        """
+        vector = {term: count * self.idf[term] for term, count in term_counts.items() if term in self.idf}
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        return {term: w / norm for term, w in vector.items()} if norm else {}
+    
+    def _build_search_index(self):
+        """
+        Monta o índice de busca com todos os vídeos do banco: TF-IDF
+        (IDF suavizado, norma L2) em um índice invertido termo -> vídeos
         """
         try:
             videos = self.db_manager.get_all_videos()
@@ -43,42 +67,51 @@ class ContentSearchEngine:
                     self.corpus.append(search_text.strip())
                     self.video_ids.append(video.id)
             
-            # Cria a matriz TF-IDF
-            if self.corpus:
-                self.tfidf_matrix = self.vectorizer.fit_transform(self.corpus)
-            else:
-                self.tfidf_matrix = None
+            # Frequência de documentos e IDF de cada termo
+            documents = [Counter(self._tokenize(text)) for text in self.corpus]
+            document_frequency = Counter()
+            for counts in documents:
+                document_frequency.update(counts.keys())
+            total = len(documents)
+            self.idf = {term: math.log((1 + total) / (1 + df)) + 1 for term, df in document_frequency.items()}
+            
+            # Índice invertido: só os vídeos que contêm os termos da consulta são pontuados
+            postings = defaultdict(list)
+            for index, counts in enumerate(documents):
+                for term, weight in self._weigh(counts).items():
+                    postings[term].append((index, weight))
+            self.postings = dict(postings)
+            self._index_stale = False
                 
         except Exception as e:
             self.logger.error(f"Erro ao atualizar índice de busca: {str(e)}")
     
     def search_by_text(self, query, limit=10):
         """
-        Busca por similaridade textual usando TF-IDF
+        Busca por similaridade textual usando TF-IDF (similaridade cosseno)
         """
         try:
-            if not self.corpus or self.tfidf_matrix is None:
+            if self._index_stale:
+                self._build_search_index()
+            if not self.corpus:
                 return []
             
-            # Transforma a query usando o mesmo vectorizer
-            query_vec = self.vectorizer.transform([query.lower()])
-            
-            # Calcula similaridade coseno
-            similarities = cosine_similarity(query_vec, self.tfidf_matrix).flatten()
-            
-            # Ordena por similaridade
-            similar_indices = similarities.argsort()[::-1]
+            # Similaridade cosseno = produto escalar dos vetores normalizados
+            similarities = defaultdict(float)
+            for term, query_weight in self._weigh(Counter(self._tokenize(query))).items():
+                for index, weight in self.postings.get(term, ()):
+                    similarities[index] += query_weight * weight
             
             results = []
-            for idx in similar_indices[:limit]:
-                if similarities[idx] > 0:  # Só retorna resultados com similaridade > 0
-                    video_id = self.video_ids[idx]
-                    video = self.db_manager.session.query(VideoRecord).filter_by(id=video_id).first()
-                    if video:
-                        results.append({
-                            'video': video,
-                            'similarity_score': float(similarities[idx])
-                        })
+            # Só retorna resultados com similaridade > 0
+            for index in heapq.nlargest(limit, similarities, key=similarities.get):
+                video_id = self.video_ids[index]
+                video = self.db_manager.session.query(VideoRecord).filter_by(id=video_id).first()
+                if video:
+                    results.append({
+                        'video': video,
+                        'similarity_score': float(similarities[index])
+                    })
             
             return results
             
@@ -0,0 +1,92 @@
+import re
+import unicodedata
+from collections import deque
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def normalize_text(text):
+    """
+    Minúsculas e sem acentos ("Educação" -> "educacao")
+    """
+    text = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(c for c in text if not unicodedata.combining(c))
+
+
+def tokenize(text):
+    """
+    Palavras normalizadas do texto (a fronteira de palavra vem da tokenização)
+    """
+    return _WORD_RE.findall(normalize_text(text))
+
+
+class KeywordMatcher:
+    """
+    Autômato Aho-Corasick sobre sequências de palavras, compilado uma vez a
+    partir de um dicionário {categoria: [palavras-chave]}.
+    Uma única passada pelo texto conta as ocorrências de todas as
+    palavras-chave (inclusive expressões como "passo a passo") de todas as
+    categorias, casando palavras inteiras e ignorando acentos.
+    """
+
+    def __init__(self, category_keywords):
+        self.categories = list(category_keywords)
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+        for index, category in enumerate(self.categories):
+            for keyword in category_keywords[category]:
+                tokens = tokenize(keyword)
+                if tokens:
+                    self._add(tokens, index)
+        self._build_failure_links()
+
+    def _add(self, tokens, category_index):
+        state = 0
+        for token in tokens:
+            next_state = self._goto[state].get(token)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][token] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(category_index)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(token, 0)
+                # Herda as saídas dos sufixos (ex.: "jogo" dentro de "video jogo")
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def count(self, text):
+        """
+        Número de ocorrências de palavras-chave por categoria (todas as
+        categorias presentes no dict, com zero quando não há ocorrência)
+        """
+        counts = [0] * len(self.categories)
+        if text:
+            goto, fail, output = self._goto, self._fail, self._output
+            state = 0
+            for token in tokenize(text):
+                while state and token not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(token, 0)
+                for category_index in output[state]:
+                    counts[category_index] += 1
+        return dict(zip(self.categories, counts))
+
+    def count_many(self, texts):
+        """
+        Versão em lote de count (uma contagem por texto, na mesma ordem)
+        """
+        return [self.count(text) for text in texts]
@@ -1,11 +1,691 @@
-import whisper
 import os
 import logging
 import signal
+import subprocess
+import tempfile
 import threading
-import torch
-from moviepy.video.io.VideoFileClip import VideoFileClip
+import time
+import wave
+import bisect
+import hashlib
+import json
+import multiprocessing
+from collections import Counter, OrderedDict
+import multiprocessing.connection
+import queue
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import numpy as np
 import config
+from media_probe import get_media_probe, find_ffmpeg
+from model_registry import get_model_registry
+
+# Taxa de amostragem esperada pelo Whisper (mono, float32 em [-1, 1])
+SAMPLE_RATE = 16000
+# Janela de 30 s do Whisper (whisper.audio.N_SAMPLES), sem importar o whisper
+WHISPER_WINDOW_SAMPLES = 30 * SAMPLE_RATE
+
+# torch, whisper e moviepy são importados só nas funções que os usam: quem
+# importa este módulo apenas para consultar metadados não paga a carga deles
+
+
+def split_audio_chunks(audio, chunk_duration=config.CHUNK_DURATION, overlap=config.CHUNK_OVERLAP,
+                       search_window=config.CHUNK_SILENCE_SEARCH, sample_rate=SAMPLE_RATE):
+    """
+    Divide o PCM em janelas sobrepostas, deslocando cada corte para o trecho
+    mais silencioso (menor energia em quadros de 100 ms) perto do ponto nominal.
+    Retorna lista de (início, fim) em amostras.
+    """
+    total = len(audio)
+    chunk = int(chunk_duration * sample_rate)
+    overlap = int(overlap * sample_rate)
+    search = int(search_window * sample_rate)
+    frame = sample_rate // 10
+    
+    bounds = []
+    start = 0
+    while start < total:
+        nominal_end = start + chunk
+        if nominal_end >= total:
+            bounds.append((start, total))
+            break
+        
+        # Procura o quadro de menor energia na vizinhança do corte nominal
+        lo = max(start + chunk // 2, nominal_end - search)
+        hi = min(total, nominal_end + search)
+        end = nominal_end
+        n_frames = (hi - lo) // frame
+        if n_frames > 0:
+            window = audio[lo:lo + n_frames * frame].reshape(n_frames, frame)
+            energy = np.mean(window ** 2, axis=1)
+            end = lo + int(np.argmin(energy)) * frame + frame // 2
+        
+        bounds.append((start, end))
+        start = max(end - overlap, start + 1)
+    
+    return bounds
+
+
+def merge_chunk_results(chunk_results, bounds, sample_rate=SAMPLE_RATE):
+    """
+    Junta as transcrições dos blocos, corrigindo os timestamps para a linha do
+    tempo original. Na sobreposição entre blocos vizinhos cada segmento fica
+    com o bloco que cobre o seu ponto médio.
+    """
+    segments = []
+    languages = Counter()
+    
+    for i, result in enumerate(chunk_results):
+        if not result:
+            continue
+        offset = bounds[i][0] / sample_rate
+        lower = 0.0 if i == 0 else (bounds[i][0] + bounds[i - 1][1]) / 2 / sample_rate
+        upper = float('inf') if i == len(bounds) - 1 else (bounds[i + 1][0] + bounds[i][1]) / 2 / sample_rate
+        languages[result['language']] += 1
+        
+        for segment in result['segments']:
+            segment = dict(segment)
+            segment['start'] += offset
+            segment['end'] += offset
+            if 'words' in segment:
+                segment['words'] = [
+                    {**word, 'start': word['start'] + offset, 'end': word['end'] + offset}
+                    for word in segment['words']
+                ]
+            midpoint = (segment['start'] + segment['end']) / 2
+            if lower <= midpoint < upper:
+                segments.append(segment)
+    
+    segments.sort(key=lambda seg: seg['start'])
+    for index, segment in enumerate(segments):
+        segment['id'] = index
+    
+    return {
+        'text': ''.join(segment['text'] for segment in segments),
+        'language': languages.most_common(1)[0][0] if languages else None,
+        'segments': segments
+    }
+
+
+def detect_speech_regions(audio, sample_rate=SAMPLE_RATE):
+    """
+    Detecção de voz (VAD) por energia e forma do espectro.
+    Um quadro é fala quando tem energia acima do ruído de fundo estimado, não é
+    ruído "plano" (flatness espectral baixa) e concentra energia na banda de voz
+    (150-4000 Hz). Trechos com energia quase constante (música contínua) são
+    descartados. Retorna lista de (início, fim) em amostras.
+    """
+    frame = int(sample_rate * config.VAD_FRAME_MS / 1000)
+    n_frames = len(audio) // frame
+    if n_frames == 0:
+        return []
+    
+    frames = audio[:n_frames * frame].reshape(n_frames, frame)
+    energy_db = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+    
+    # Limiar adaptativo: acima do ruído de fundo, mas sem exigir mais que os picos
+    noise_floor = np.percentile(energy_db, 10)
+    peak = np.percentile(energy_db, 95)
+    threshold = max(config.VAD_MIN_ENERGY_DB, min(noise_floor + config.VAD_ENERGY_MARGIN_DB, peak - 6))
+    
+    # Features espectrais em blocos para limitar memória em áudios longos
+    window = np.hanning(frame).astype(np.float32)
+    freqs = np.fft.rfftfreq(frame, 1.0 / sample_rate)
+    voice_band = (freqs >= 150) & (freqs <= 4000)
+    flatness = np.empty(n_frames, dtype=np.float32)
+    band_ratio = np.empty(n_frames, dtype=np.float32)
+    for i in range(0, n_frames, 8192):
+        power = np.abs(np.fft.rfft(frames[i:i + 8192] * window, axis=1)) ** 2 + 1e-12
+        flatness[i:i + 8192] = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+        band_ratio[i:i + 8192] = power[:, voice_band].sum(axis=1) / power.sum(axis=1)
+    
+    is_speech = (
+        (energy_db > threshold)
+        & (flatness < config.VAD_MAX_SPECTRAL_FLATNESS)
+        & (band_ratio > config.VAD_MIN_SPEECH_BAND_RATIO)
+    )
+    
+    # Agrupa quadros consecutivos em trechos
+    edges = np.diff(np.concatenate(([0], is_speech.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    
+    # Une trechos separados por pausas curtas
+    min_silence = config.VAD_MIN_SILENCE_MS / config.VAD_FRAME_MS
+    regions = []
+    for start, end in zip(starts, ends):
+        if regions and start - regions[-1][1] < min_silence:
+            regions[-1][1] = end
+        else:
+            regions.append([start, end])
+    
+    # Descarta trechos curtos demais ou sem modulação de energia típica da fala
+    min_speech = config.VAD_MIN_SPEECH_MS / config.VAD_FRAME_MS
+    padding = int(config.VAD_PADDING_MS / config.VAD_FRAME_MS)
+    speech = []
+    for start, end in regions:
+        if end - start < min_speech:
+            continue
+        if np.std(energy_db[start:end]) < config.VAD_MIN_ENERGY_MODULATION_DB:
+            continue
+        start = int(max(0, start - padding)) * frame
+        end = int(min(n_frames, end + padding)) * frame
+        if speech and start <= speech[-1][1]:
+            speech[-1] = (speech[-1][0], end)
+        else:
+            speech.append((start, end))
+    
+    return speech
+
+
+def compact_speech(audio, regions, sample_rate=SAMPLE_RATE):
+    """
+    Concatena os trechos de fala. Retorna o PCM compactado e o mapa
+    [(início compactado, início original, duração)] em segundos.
+    """
+    pieces = []
+    speech_map = []
+    position = 0
+    for start, end in regions:
+        pieces.append(audio[start:end])
+        speech_map.append((position / sample_rate, start / sample_rate, (end - start) / sample_rate))
+        position += end - start
+    return np.concatenate(pieces), speech_map
+
+
+def remap_timestamps(result, speech_map):
+    """
+    Converte os timestamps do áudio compactado de volta para a linha do tempo
+    original do vídeo
+    """
+    compact_starts = [entry[0] for entry in speech_map]
+    
+    def to_original(t):
+        index = max(0, bisect.bisect_right(compact_starts, t) - 1)
+        compact_start, original_start, _ = speech_map[index]
+        return original_start + (t - compact_start)
+    
+    for segment in result.get('segments', []):
+        segment['start'] = to_original(segment['start'])
+        segment['end'] = to_original(segment['end'])
+        for word in segment.get('words', []):
+            word['start'] = to_original(word['start'])
+            word['end'] = to_original(word['end'])
+    return result
+
+
+def no_speech_result(language=None, no_audio=False):
+    """
+    Resultado registrado quando o VAD não encontra fala no áudio
+    (ou quando o arquivo nem possui faixa de áudio)
+    """
+    result = {
+        'text': '',
+        'language': language,
+        'segments': [],
+        'no_speech': True
+    }
+    if no_audio:
+        result['no_audio'] = True
+    return result
+
+
+def audio_fingerprint(audio):
+    """
+    Impressão digital do PCM decodificado (BLAKE2b sobre as amostras int16).
+    Cópias, arquivos renomeados e remuxes que preservam o áudio geram a mesma
+    impressão, independentemente do caminho.
+    """
+    pcm = np.clip(np.round(audio * 32767), -32768, 32767).astype(np.int16)
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(pcm.tobytes())
+    return digest.hexdigest()
+
+
+def audio_signature(audio, segments=config.AUDIO_SIGNATURE_SEGMENTS):
+    """
+    Assinatura perceptual do áudio: energia (dBFS) de `segments` trechos
+    iguais da duração, quantizada em 0,5 dB, em hex. Ao contrário de
+    audio_fingerprint, sobrevive a recompressão e mudança de bitrate.
+    Retorna None sem PCM em memória ou quando a energia quase não varia
+    (silêncio, tom constante): não distinguiria duas gravações.
+    """
+    if not isinstance(audio, np.ndarray) or len(audio) < segments:
+        return None
+    usable = len(audio) // segments * segments
+    # Um trecho por vez: sem cópia em float64 do áudio inteiro
+    power = np.array([np.dot(part, part) / len(part) for part in audio[:usable].reshape(segments, -1)],
+                     dtype=np.float64)
+    levels = 10 * np.log10(power + 1e-10)
+    if levels.std() < config.AUDIO_SIGNATURE_MIN_STD_DB:
+        return None
+    return np.clip(np.round((levels + 100) * 2), 0, 255).astype(np.uint8).tobytes().hex()
+
+
+def audio_signature_similarity(first, second):
+    """
+    Correlação (Pearson) entre as curvas de energia de duas assinaturas
+    """
+    first = np.frombuffer(bytes.fromhex(first), dtype=np.uint8).astype(np.float64)
+    second = np.frombuffer(bytes.fromhex(second), dtype=np.uint8).astype(np.float64)
+    if len(first) != len(second) or first.std() == 0 or second.std() == 0:
+        return 0.0
+    return float(np.corrcoef(first, second)[0, 1])
+
+
+class TranscriptionCache:
+    """
+    Cache persistente de transcrições endereçado por conteúdo.
+    Cada entrada é um JSON em disco; o acesso atualiza o mtime do arquivo e
+    as entradas menos usadas recentemente são removidas quando o tamanho
+    total passa de max_bytes.
+    """
+    
+    def __init__(self, cache_dir=config.TRANSCRIPTION_CACHE_DIR,
+                 max_bytes=config.TRANSCRIPTION_CACHE_MAX_MB * 1024 * 1024):
+        self.logger = logging.getLogger(__name__)
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        
+        # Índice LRU (chave -> tamanho), do acesso mais antigo ao mais recente
+        entries = []
+        for name in os.listdir(cache_dir):
+            if name.endswith('.json'):
+                stat = os.stat(os.path.join(cache_dir, name))
+                entries.append((stat.st_mtime, name[:-5], stat.st_size))
+        entries.sort()
+        self._index = OrderedDict((key, size) for _, key, size in entries)
+        self._total_bytes = sum(self._index.values())
+    
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+    
+    def get(self, key):
+        """
+        Retorna o resultado armazenado ou None
+        """
+        with self._lock:
+            if key not in self._index:
+                self.misses += 1
+                return None
+            try:
+                path = self._path(key)
+                with open(path, 'r', encoding='utf-8') as f:
+                    value = json.load(f)
+                os.utime(path)
+                self._index.move_to_end(key)
+                self.hits += 1
+                return value
+            except Exception as e:
+                self.logger.warning(f"Entrada de cache inválida {key}: {e}")
+                self._remove(key)
+                self.misses += 1
+                return None
+    
+    def put(self, key, value):
+        """
+        Armazena um resultado e aplica o limite de tamanho (LRU)
+        """
+        data = json.dumps(value, ensure_ascii=False, default=float).encode('utf-8')
+        with self._lock:
+            try:
+                path = self._path(key)
+                temp_path = f"{path}.tmp"
+                with open(temp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(temp_path, path)
+            except Exception as e:
+                self.logger.warning(f"Erro ao gravar cache de transcrição: {e}")
+                return
+            
+            self._total_bytes += len(data) - self._index.pop(key, 0)
+            self._index[key] = len(data)
+            while self._total_bytes > self.max_bytes and len(self._index) > 1:
+                self._remove(next(iter(self._index)))
+    
+    def _remove(self, key):
+        self._total_bytes -= self._index.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+    
+    def stats(self):
+        """
+        Contadores de acertos/falhas e ocupação do cache
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._index),
+                'size_mb': self._total_bytes / (1024 * 1024)
+            }
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_transcription_cache():
+    """
+    Cache compartilhado por todos os motores de transcrição do processo
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = TranscriptionCache()
+        return _shared_cache
+
+
+class RealTimeFactorStats:
+    """
+    Fator de tempo real (segundos de processamento por segundo de áudio)
+    medido por modelo/dispositivo e persistido em JSON entre execuções.
+    Os prazos e o ETA da transcrição são calculados a partir dele.
+    """
+    
+    def __init__(self, path=config.TRANSCRIPTION_RTF_FILE):
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self._lock = threading.Lock()
+        self._stats = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._stats = json.load(f)
+            except Exception as e:
+                self.logger.warning(f"Estatísticas de RTF inválidas em {path}: {e}")
+    
+    def expected(self, key):
+        """
+        RTF esperado (média móvel das medições ou config.TRANSCRIPTION_DEFAULT_RTF)
+        """
+        with self._lock:
+            entry = self._stats.get(key)
+        return entry['rtf'] if entry else config.TRANSCRIPTION_DEFAULT_RTF
+    
+    def deadline(self, key, audio_seconds):
+        """
+        Prazo em segundos: duração x RTF esperado x fator de segurança + margem fixa
+        """
+        return (audio_seconds * self.expected(key) * config.TRANSCRIPTION_DEADLINE_SAFETY
+                + config.TRANSCRIPTION_DEADLINE_MARGIN)
+    
+    def record(self, key, audio_seconds, elapsed):
+        """
+        Registra uma medição e grava o arquivo de estatísticas
+        """
+        if audio_seconds < config.TRANSCRIPTION_RTF_MIN_AUDIO:
+            return
+        rtf = elapsed / audio_seconds
+        alpha = config.TRANSCRIPTION_RTF_SMOOTHING
+        with self._lock:
+            entry = self._stats.get(key)
+            if entry:
+                entry['rtf'] = (1 - alpha) * entry['rtf'] + alpha * rtf
+                entry['samples'] += 1
+            else:
+                entry = self._stats[key] = {'rtf': rtf, 'samples': 1}
+            entry['audio_seconds'] = entry.get('audio_seconds', 0) + audio_seconds
+            try:
+                temp_path = f"{self.path}.tmp"
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self._stats, f, indent=2)
+                os.replace(temp_path, self.path)
+            except Exception as e:
+                self.logger.warning(f"Erro ao gravar estatísticas de RTF: {e}")
+
+
+_shared_rtf_stats = None
+_shared_rtf_stats_lock = threading.Lock()
+
+
+def get_rtf_stats():
+    """
+    Estatísticas de RTF compartilhadas por todos os motores do processo
+    """
+    global _shared_rtf_stats
+    with _shared_rtf_stats_lock:
+        if _shared_rtf_stats is None:
+            _shared_rtf_stats = RealTimeFactorStats()
+        return _shared_rtf_stats
+
+
+def _replace_whisper_linear(module):
+    """
+    Troca as camadas whisper.model.Linear por torch.nn.Linear (mesmos pesos):
+    a quantização dinâmica só reconhece o tipo exato nn.Linear
+    """
+    import torch
+    for name, child in module.named_children():
+        if isinstance(child, torch.nn.Linear) and type(child) is not torch.nn.Linear:
+            linear = torch.nn.Linear(child.in_features, child.out_features, bias=child.bias is not None)
+            linear.weight = child.weight
+            linear.bias = child.bias
+            setattr(module, name, linear)
+        else:
+            _replace_whisper_linear(child)
+
+
+def load_whisper_model(model_size, device, quantize=False):
+    """
+    Carrega o Whisper; com quantize=True (apenas CPU) as camadas lineares
+    passam por quantização dinâmica int8
+    """
+    import torch
+    import whisper
+    model = whisper.load_model(model_size, device=device)
+    if quantize and device == "cpu":
+        engines = torch.backends.quantized.supported_engines
+        if 'fbgemm' not in engines and 'qnnpack' in engines:
+            torch.backends.quantized.engine = 'qnnpack'
+        _replace_whisper_linear(model)
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model
+
+
+def _worker_transcribe(model, audio, language=None, task="transcribe"):
+    result = model.transcribe(
+        audio,
+        language=language,
+        task=task,
+        word_timestamps=True,
+        fp16=model.device.type != "cpu"
+    )
+    return {
+        'text': result['text'],
+        'language': result['language'],
+        'segments': result['segments']
+    }
+
+
+def _worker_detect_language(model, audio):
+    if not model.is_multilingual:
+        return {'en': 1.0}
+    import whisper
+    segment = whisper.pad_or_trim(audio)
+    mel = whisper.log_mel_spectrogram(segment, model.dims.n_mels).to(model.device)
+    _, probs = model.detect_language(mel)
+    return dict(probs)
+
+
+_WORKER_JOBS = {
+    'transcribe': _worker_transcribe,
+    'detect_language': _worker_detect_language
+}
+
+
+def _transcription_worker_main(model_size, device, num_threads, quantize, jobs, results):
+    """
+    Processo worker: carrega o modelo uma vez e atende jobs até receber None
+    """
+    import torch
+    torch.set_num_threads(num_threads)
+    try:
+        model = load_whisper_model(model_size, device, quantize)
+    except Exception as e:
+        results.send(('error', f"Erro ao carregar modelo: {e}"))
+        return
+    results.send(('ready', None))
+    
+    while True:
+        job = jobs.recv()
+        if job is None:
+            break
+        kind, kwargs = job
+        try:
+            results.send(('ok', _WORKER_JOBS[kind](model, **kwargs)))
+        except Exception as e:
+            results.send(('error', f"{type(e).__name__}: {e}"))
+
+
+class _TranscriptionWorker:
+    """
+    Um processo worker com seus pipes de job e de resultado
+    """
+    
+    def __init__(self, context, model_size, device, num_threads, quantize=False):
+        job_reader, self.jobs = context.Pipe(duplex=False)
+        self.results, result_writer = context.Pipe(duplex=False)
+        self.process = context.Process(
+            target=_transcription_worker_main,
+            args=(model_size, device, num_threads, quantize, job_reader, result_writer),
+            daemon=True
+        )
+        self.process.start()
+        # Fecha as pontas do filho no pai para detectar EOF se o worker morrer
+        job_reader.close()
+        result_writer.close()
+        self.ready = False
+    
+    def wait(self, timeout):
+        """
+        Bloqueia até chegar uma mensagem ou o processo morrer (sem polling).
+        Retorna (status, valor), ('dead', None) ou None em caso de timeout.
+        """
+        ready = multiprocessing.connection.wait([self.results, self.process.sentinel], timeout)
+        if self.results in ready:
+            try:
+                return self.results.recv()
+            except EOFError:
+                return ('dead', None)
+        if ready:
+            return ('dead', None)
+        return None
+    
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.jobs.close()
+        self.results.close()
+
+
+class TranscriptionWorkerPool:
+    """
+    Pool de processos de transcrição. Cada worker carrega o Whisper uma única
+    vez e recebe jobs por um pipe; a conclusão é sinalizada pelo próprio pipe.
+    Um job que estoura o prazo tem o processo morto e substituído, então não
+    continua consumindo CPU/GPU em segundo plano.
+    """
+    
+    def __init__(self, model_size, device, workers=1, quantize=False):
+        self.logger = logging.getLogger(__name__)
+        self.model_size = model_size
+        self.device = device
+        self.quantize = quantize
+        self.workers = max(1, workers)
+        self.num_threads = max(1, (os.cpu_count() or 1) // self.workers) if device == "cpu" else 1
+        self._context = multiprocessing.get_context("spawn")
+        self._idle = queue.Queue()
+        for _ in range(self.workers):
+            self._idle.put(self._spawn())
+    
+    def _spawn(self):
+        return _TranscriptionWorker(self._context, self.model_size, self.device, self.num_threads, self.quantize)
+    
+    def _ensure_ready(self, worker):
+        """
+        Aguarda o worker terminar de carregar o modelo (fora do prazo do job)
+        """
+        if worker.ready:
+            return
+        message = worker.wait(config.TRANSCRIPTION_WORKER_LOAD_TIMEOUT)
+        if message is None or message[0] != 'ready':
+            worker.kill()
+            detail = message[1] if message and message[1] else "processo encerrado ou sem resposta"
+            raise RuntimeError(f"Worker de transcrição não iniciou: {detail}")
+        worker.ready = True
+    
+    def run(self, kind, timeout=None, on_wait=None, on_done=None, **kwargs):
+        """
+        Executa um job em um worker livre e espera o resultado.
+        timeout: prazo em segundos (None = sem prazo); ao estourar, o worker
+        é morto e recriado e TimeoutError é levantado.
+        on_wait: função chamada com o tempo decorrido a cada
+        config.TRANSCRIPTION_PROGRESS_INTERVAL segundos (apenas exibição).
+        on_done: função chamada com o tempo de execução do job (sem contar a
+        espera por um worker livre) quando ele termina com sucesso.
+        """
+        worker = self._idle.get()
+        try:
+            self._ensure_ready(worker)
+        except Exception:
+            self._idle.put(self._spawn())
+            raise
+        
+        healthy = False
+        start_time = time.time()
+        try:
+            worker.jobs.send((kind, kwargs))
+            while True:
+                elapsed = time.time() - start_time
+                wait = None
+                if timeout is not None:
+                    wait = timeout - elapsed
+                    if wait <= 0:
+                        raise TimeoutError(f"Prazo de {timeout:.0f}s esgotado")
+                if on_wait:
+                    interval = config.TRANSCRIPTION_PROGRESS_INTERVAL
+                    wait = interval if wait is None else min(wait, interval)
+                
+                message = worker.wait(wait)
+                if message is None:
+                    if on_wait:
+                        on_wait(time.time() - start_time)
+                    continue
+                
+                status, value = message
+                if status == 'dead':
+                    raise RuntimeError("Worker de transcrição encerrou inesperadamente")
+                healthy = True
+                if status == 'ok':
+                    if on_done:
+                        on_done(time.time() - start_time)
+                    return value
+                raise RuntimeError(value)
+        finally:
+            # Timeout ou morte do worker: mata o processo e coloca outro no lugar
+            if not healthy:
+                worker.kill()
+                worker = self._spawn()
+            self._idle.put(worker)
+    
+    def close(self):
+        """
+        Encerra os workers ociosos (os ocupados são daemon e morrem com o processo)
+        """
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            worker.kill()
+
 
 class TranscriptionEngine:
     def __init__(self, model_size=config.WHISPER_MODEL):
@@ -14,22 +694,45 @@ class TranscriptionEngine:
         model_size: tiny, base, small, medium, large
         """
         self.logger = logging.getLogger(__name__)
+        self.model_size = model_size
+        self.cache = get_transcription_cache() if config.TRANSCRIPTION_CACHE_ENABLED else None
+        self.rtf_stats = get_rtf_stats()
         
         # Verifica disponibilidade de GPU
         self.device = self._get_device()
         self.logger.info(f"Usando dispositivo: {self.device}")
         
-        # Carrega o modelo com o dispositivo apropriado
-        self.model = whisper.load_model(model_size, device=self.device)
+        # Quantização int8 só se aplica à inferência em CPU
+        self.quantize = config.WHISPER_CPU_QUANTIZATION and self.device == "cpu"
+        if self.quantize:
+            self.logger.info("Whisper em modo quantizado (int8 dinâmico) na CPU")
+        elif config.WHISPER_CPU_QUANTIZATION:
+            self.logger.info("Quantização int8 ignorada: disponível apenas em CPU")
+        
+        # Workers que carregam o modelo no dispositivo apropriado (em segundo plano)
+        workers = config.TRANSCRIPTION_WORKERS if self.device == "cpu" else config.TRANSCRIPTION_GPU_WORKERS
+        self.pool = TranscriptionWorkerPool(model_size, self.device, workers, self.quantize)
         
         # Log informações sobre GPU se disponível
         if self.device != "cpu":
             self._log_gpu_info()
     
+    @property
+    def model(self):
+        """
+        Modelo Whisper no processo principal, carregado só se alguém acessar
+        (a transcrição em si roda nos processos do pool)
+        """
+        return get_model_registry().get(
+            f"whisper:{self._rtf_key()}",
+            lambda: load_whisper_model(self.model_size, self.device, self.quantize)
+        )
+    
     def _get_device(self):
         """
         Determina qual dispositivo usar (GPU ou CPU)
         """
+        import torch
         if config.USE_GPU and torch.cuda.is_available():
             try:
                 # Testa se o dispositivo especificado está disponível
@@ -52,6 +755,7 @@ class TranscriptionEngine:
         Log informações sobre a GPU sendo usada
         """
         try:
+            import torch
             gpu_id = int(self.device.split(':')[1])
             gpu_name = torch.cuda.get_device_name(gpu_id)
             gpu_memory = torch.cuda.get_device_properties(gpu_id).total_memory / (1024**3)
@@ -66,18 +770,18 @@ class TranscriptionEngine:
         """
         try:
             if audio_path is None:
-                # Salva o arquivo temporário no diretório atual com nome simples
-                import time
-                timestamp = str(int(time.time()))
-                audio_path = f"temp_audio_{timestamp}.wav"
+                # Nome único no diretório temporário (evita colisão entre workers)
+                fd, audio_path = tempfile.mkstemp(prefix="temp_audio_", suffix=".wav")
+                os.close(fd)
             
+            from moviepy.video.io.VideoFileClip import VideoFileClip
             video = VideoFileClip(video_path)
             self.logger.info(f"Extraindo áudio para: {audio_path}")
             video.audio.write_audiofile(audio_path, logger=None)
             video.close()
             
             # Verifica se o arquivo foi criado
-            if os.path.exists(audio_path):
+            if os.path.exists(audio_path) and os.path.getsize(audio_path) > 0:
                 self.logger.info(f"Arquivo de áudio criado com sucesso: {audio_path}")
                 return audio_path
             else:
@@ -87,87 +791,352 @@ class TranscriptionEngine:
             self.logger.error(f"Erro ao extrair áudio de {video_path}: {str(e)}")
             return None
     
-    def transcribe_audio_with_timeout(self, audio_path, language=None, timeout=300, progress_callback=None):
+    def decode_audio(self, video_path, sample_rate=SAMPLE_RATE):
+        """
+        Decodifica o áudio do vídeo direto para memória (PCM mono float32)
+        lendo a saída do ffmpeg em blocos, sem gravar WAV em disco
+        """
+        ffmpeg = find_ffmpeg()
+        if not ffmpeg:
+            self.logger.warning("ffmpeg não encontrado; usando extração via moviepy")
+            return None
+        
+        cmd = [
+            ffmpeg, '-nostdin', '-loglevel', 'error',
+            '-i', video_path,
+            '-vn', '-ac', '1', '-ar', str(sample_rate),
+            '-f', 's16le', '-acodec', 'pcm_s16le', '-'
+        ]
+        
+        try:
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            
+            # stderr é drenado em paralelo: avisos em excesso encheriam o pipe
+            # e travariam o ffmpeg enquanto o stdout é lido
+            stderr_buffer = bytearray()
+            
+            def drain_stderr():
+                while True:
+                    chunk = process.stderr.read(1 << 16)
+                    if not chunk:
+                        break
+                    stderr_buffer.extend(chunk)
+            
+            stderr_thread = threading.Thread(target=drain_stderr, daemon=True)
+            stderr_thread.start()
+            
+            buffer = bytearray()
+            while True:
+                chunk = process.stdout.read(1 << 20)
+                if not chunk:
+                    break
+                buffer.extend(chunk)
+            stderr_thread.join()
+            process.wait()
+            stderr = stderr_buffer.decode(errors='ignore').strip()
+            
+            if process.returncode != 0 and not buffer:
+                self.logger.error(f"Erro ao decodificar áudio de {video_path}: {stderr}")
+                return None
+            
+            # Descarta um eventual byte solto no fim do stream (sem copiar o buffer)
+            audio = np.frombuffer(buffer, dtype=np.int16, count=len(buffer) // 2).astype(np.float32) / 32768.0
+            self.logger.info(f"Áudio decodificado em memória: {len(audio) / sample_rate:.1f}s")
+            return audio
+            
+        except Exception as e:
+            self.logger.error(f"Erro ao decodificar áudio de {video_path}: {str(e)}")
+            return None
+    
+    def has_audio(self, video_path):
+        """
+        Consulta os metadados do container: retorna False apenas quando o
+        arquivo comprovadamente não tem faixa de áudio
+        """
+        info = get_media_probe().probe(video_path)
+        return not (info and info.get('has_audio') is False)
+    
+    def no_audio_results(self, languages):
+        """
+        Resultado por idioma para vídeos sem faixa de áudio
+        """
+        return {language: no_speech_result(language, no_audio=True) for language in languages}
+    
+    def load_audio(self, video_path):
+        """
+        Obtém o áudio do vídeo: PCM em memória quando o ffmpeg está disponível,
+        senão o caminho de um WAV temporário (liberar com release_audio)
+        """
+        audio = self.decode_audio(video_path)
+        if audio is not None:
+            return audio
+        return self.extract_audio_from_video(video_path)
+    
+    def release_audio(self, audio):
+        """
+        Remove o WAV temporário criado por load_audio (nada a fazer para PCM)
+        """
+        if isinstance(audio, str) and os.path.exists(audio):
+            os.remove(audio)
+    
+    def _describe_audio(self, audio):
+        if isinstance(audio, np.ndarray):
+            return f"áudio em memória ({len(audio) / SAMPLE_RATE:.1f}s)"
+        return audio
+    
+    def _rtf_key(self):
+        """
+        Chave das estatísticas de RTF (modelo/dispositivo/quantização)
+        """
+        key = f"{self.model_size}:{self.device}"
+        return f"{key}:int8" if self.quantize else key
+    
+    def _audio_duration(self, audio):
+        """
+        Duração em segundos do PCM em memória ou do arquivo de áudio (None se desconhecida)
+        """
+        if isinstance(audio, np.ndarray):
+            return len(audio) / SAMPLE_RATE
+        info = get_media_probe().probe(audio)
+        if info and info.get('duration'):
+            return info['duration']
+        try:
+            with wave.open(audio, 'rb') as wav:
+                return wav.getnframes() / float(wav.getframerate())
+        except Exception:
+            return None
+    
+    def transcription_deadline(self, audio_seconds):
+        """
+        Prazo para transcrever audio_seconds de áudio com o RTF medido
+        """
+        if audio_seconds is None:
+            return config.TRANSCRIPTION_UNKNOWN_DURATION_TIMEOUT
+        return self.rtf_stats.deadline(self._rtf_key(), audio_seconds)
+    
+    def transcribe_audio_with_timeout(self, audio_path, language=None, timeout=None, progress_callback=None, task="transcribe"):
+        """
+        Transcreve áudio com prazo para evitar travamento.
+        O job roda em um processo do pool; no timeout o processo é encerrado.
+        Sem timeout explícito o prazo vem da duração do áudio e do RTF medido;
+        o tempo gasto alimenta as estatísticas de RTF.
+        """
+        audio_seconds = self._audio_duration(audio_path)
+        if timeout is None:
+            timeout = self.transcription_deadline(audio_seconds)
+        key = self._rtf_key()
+        expected = audio_seconds * self.rtf_stats.expected(key) if audio_seconds else None
+        
+        def show_progress(elapsed):
+            if expected:
+                remaining = expected - elapsed
+                progress_percent = min(99, (elapsed / expected) * 100)
+                eta = f"ETA {remaining:.0f}s" if remaining > 0 else f"{-remaining:.0f}s além do previsto"
+                progress_callback.set_description(f"🎤 Transcrevendo... {progress_percent:.0f}% ({eta})")
+            else:
+                progress_callback.set_description(f"🎤 Transcrevendo... ({elapsed:.0f}s)")
+        
+        def record_rtf(elapsed):
+            if audio_seconds:
+                self.rtf_stats.record(key, audio_seconds, elapsed)
+        
+        try:
+            return self.pool.run(
+                'transcribe',
+                timeout=timeout,
+                on_wait=show_progress if progress_callback else None,
+                on_done=record_rtf,
+                audio=audio_path,
+                language=language,
+                task=task
+            )
+        except TimeoutError:
+            self.logger.error(f"Timeout na transcrição de {self._describe_audio(audio_path)} após {timeout:.0f} segundos")
+            return None
+    
+    def close(self):
+        """
+        Encerra os processos de transcrição
+        """
+        self.pool.close()
+    
+    def transcribe_audio_chunked(self, audio, language=None, progress_callback=None, task="transcribe"):
         """
-        Transcreve áudio com timeout para evitar travamento
+        Transcreve áudio longo dividindo-o em janelas sobrepostas (cortes em
+        silêncio) transcritas em paralelo pelos workers do pool.
+        Blocos que falham ou estouram o prazo são descartados, sem derrubar
+        o restante do arquivo; o resultado fica marcado com
+        incomplete=True (e não entra no cache de transcrições).
         """
-        result_container = [None]
-        exception_container = [None]
+        bounds = split_audio_chunks(audio)
+        self.logger.info(f"Transcrição em {len(bounds)} blocos de ~{config.CHUNK_DURATION}s")
         
-        def transcribe_worker():
+        key = self._rtf_key()
+        
+        def transcribe_chunk(index):
+            start, end = bounds[index]
+            chunk_seconds = (end - start) / SAMPLE_RATE
             try:
-                result = self.model.transcribe(
-                    audio_path, 
+                return self.pool.run(
+                    'transcribe',
+                    timeout=self.transcription_deadline(chunk_seconds),
+                    on_done=lambda elapsed: self.rtf_stats.record(key, chunk_seconds, elapsed),
+                    audio=audio[start:end],
                     language=language,
-                    word_timestamps=True
+                    task=task
                 )
-                result_container[0] = {
-                    'text': result['text'],
-                    'language': result['language'],
-                    'segments': result['segments']
-                }
             except Exception as e:
-                exception_container[0] = e
+                self.logger.error(f"Erro na transcrição do bloco {index + 1}/{len(bounds)}: {str(e)}")
+                return None
         
-        # Inicia thread para transcrição
-        thread = threading.Thread(target=transcribe_worker)
-        thread.daemon = True
-        thread.start()
+        chunk_results = [None] * len(bounds)
+        with ThreadPoolExecutor(max_workers=self.pool.workers) as executor:
+            futures = {executor.submit(transcribe_chunk, index): index for index in range(len(bounds))}
+            for done, future in enumerate(as_completed(futures), 1):
+                chunk_results[futures[future]] = future.result()
+                if progress_callback:
+                    progress_callback.set_description(f"🎤 Transcrevendo blocos... {done}/{len(bounds)}")
         
-        # Aguarda com timeout mostrando progresso
-        import time
-        start_time = time.time()
-        while thread.is_alive():
-            elapsed = time.time() - start_time
-            if elapsed > timeout:
-                self.logger.error(f"Timeout na transcrição de {audio_path} após {timeout} segundos")
-                return None
-            
-            if progress_callback:
-                progress_percent = min(95, (elapsed / timeout) * 100)
-                progress_callback.set_description(
-                    f"🎤 Transcrevendo... {progress_percent:.0f}% ({elapsed:.0f}s/{timeout}s)"
-                )
-            
-            time.sleep(1)
+        if not any(chunk_results):
+            return None
+        
+        result = merge_chunk_results(chunk_results, bounds)
+        missing = sum(1 for chunk in chunk_results if chunk is None)
+        if missing:
+            self.logger.warning(f"Transcrição com lacunas: {missing}/{len(bounds)} blocos falharam")
+            result['incomplete'] = True
+        return result
+    
+    def _cache_key(self, audio, languages, force_all_languages):
+        """
+        Chave do cache: impressão digital do PCM + modelo + opções que
+        alteram o resultado da transcrição
+        """
+        options = {
+            'model': f"{self.model_size}:int8" if self.quantize else self.model_size,
+            'languages': list(languages),
+            'force_all_languages': force_all_languages,
+            'vad': [config.VAD_ENABLED, config.VAD_ENERGY_MARGIN_DB, config.VAD_MIN_ENERGY_DB,
+                    config.VAD_MAX_SPECTRAL_FLATNESS, config.VAD_MIN_SPEECH_BAND_RATIO,
+                    config.VAD_MIN_ENERGY_MODULATION_DB, config.VAD_MIN_SPEECH_MS,
+                    config.VAD_MIN_SILENCE_MS, config.VAD_PADDING_MS],
+            'multilingual_min_prob': config.MULTILINGUAL_MIN_LANGUAGE_PROB,
+            'word_timestamps': True
+        }
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(audio_fingerprint(audio).encode())
+        digest.update(json.dumps(options, sort_keys=True).encode())
+        return digest.hexdigest()
+    
+    def _prepare_speech(self, audio):
+        """
+        Aplica o VAD ao PCM. Retorna (áudio só com fala, mapa de timestamps),
+        (None, None) quando não há fala, ou o áudio original se o VAD estiver
+        desligado.
+        """
+        if not config.VAD_ENABLED:
+            return audio, None
+        
+        regions = detect_speech_regions(audio)
+        if not regions:
+            self.logger.info("Nenhuma fala detectada; transcrição ignorada")
+            return None, None
+        
+        speech, speech_map = compact_speech(audio, regions)
+        self.logger.info(
+            f"VAD: {len(regions)} trechos de fala, "
+            f"{len(speech) / SAMPLE_RATE:.1f}s de {len(audio) / SAMPLE_RATE:.1f}s"
+        )
+        return speech, speech_map
+    
+    def detect_language(self, audio):
+        """
+        Detecta o idioma nos primeiros 30 segundos do áudio.
+        Retorna dict {idioma: probabilidade}.
+        """
+        return self.pool.run('detect_language', audio=audio[:WHISPER_WINDOW_SAMPLES])
+    
+    def _plan_languages(self, speech, languages, force_all_languages=False):
+        """
+        Decide quais execuções do Whisper são necessárias: o idioma detectado
+        (ou o primeiro pedido) sempre; os demais apenas quando a detecção indica
+        fala nesse idioma ou quando forçado. Inglês forçado sobre outro idioma
+        usa a tarefa de tradução do Whisper.
+        Retorna lista de (idioma, tarefa).
+        """
+        if len(languages) <= 1:
+            return [(language, "transcribe") for language in languages]
         
-        if exception_container[0]:
-            raise exception_container[0]
+        probs = self.detect_language(speech)
+        detected = max(probs, key=probs.get)
+        self.logger.info(f"Idioma detectado: {detected} ({probs[detected]:.2f})")
         
-        return result_container[0]
+        primary = detected if detected in languages else languages[0]
+        plan = [(primary, "transcribe")]
+        for language in languages:
+            if language == primary:
+                continue
+            if probs.get(language, 0) >= config.MULTILINGUAL_MIN_LANGUAGE_PROB:
+                plan.append((language, "transcribe"))
+            elif force_all_languages:
+                task = "translate" if language == 'en' and detected != 'en' else "transcribe"
+                plan.append((language, task))
+            else:
+                self.logger.info(f"Idioma '{language}' não detectado ({probs.get(language, 0):.2f}); execução ignorada")
+        return plan
     
-    def transcribe_audio(self, audio_path, language=None, progress_callback=None):
+    def _transcribe_pcm(self, audio, language=None, progress_callback=None, task="transcribe"):
+        """
+        Transcreve PCM em memória, em blocos paralelos quando longo e em CPU
+        """
+        duration = len(audio) / SAMPLE_RATE
+        
+        # Áudios longos em CPU são divididos em blocos paralelos
+        if (config.CHUNKED_TRANSCRIPTION and self.device == "cpu"
+                and duration > config.CHUNKED_TRANSCRIPTION_MIN_DURATION):
+            return self.transcribe_audio_chunked(audio, language, progress_callback, task)
+        
+        timeout = self.transcription_deadline(duration)
+        self.logger.info(f"Iniciando transcrição de {duration:.1f}s com prazo de {timeout:.0f} segundos...")
+        return self.transcribe_audio_with_timeout(audio, language, timeout, progress_callback, task)
+    
+    def transcribe_audio(self, audio, language=None, progress_callback=None):
         """
         Transcreve áudio para texto
+        audio: PCM em memória (np.ndarray a 16 kHz) ou caminho de arquivo de áudio
         language: 'pt' para português, 'en' para inglês, None para auto-detect
         """
         try:
-            # Verifica se o arquivo existe antes de tentar transcrever
-            if not os.path.exists(audio_path):
-                self.logger.error(f"Arquivo de áudio não encontrado para transcrição: {audio_path}")
-                return None
-            
-            self.logger.info(f"Iniciando transcrição do arquivo: {audio_path}")
-            
-            # Verificação adicional antes de chamar o Whisper
-            file_size = os.path.getsize(audio_path)
-            self.logger.info(f"Tamanho do arquivo: {file_size} bytes")
-            
-            # Verifica se o arquivo é muito grande (mais de 100MB)
-            if file_size > 100 * 1024 * 1024:  # 100MB
-                self.logger.warning(f"Arquivo muito grande ({file_size/1024/1024:.1f}MB). Pode demorar muito para processar.")
-                timeout = 600  # 10 minutos para arquivos grandes
+            if isinstance(audio, np.ndarray):
+                self.logger.info(f"Iniciando transcrição de {self._describe_audio(audio)}")
+                
+                # Envia ao Whisper apenas os trechos com fala
+                speech, speech_map = self._prepare_speech(audio)
+                if speech is None:
+                    return no_speech_result(language)
+                
+                result = self._transcribe_pcm(speech, language, progress_callback)
+                if result and speech_map:
+                    remap_timestamps(result, speech_map)
             else:
-                timeout = 300  # 5 minutos para arquivos normais
-            
-            self.logger.info(f"Iniciando transcrição com timeout de {timeout} segundos...")
-            
-            # Pausa para garantir que o arquivo seja totalmente liberado
-            import time
-            time.sleep(1)
-            
-            # Usa transcrição com timeout
-            result = self.transcribe_audio_with_timeout(audio_path, language, timeout, progress_callback)
+                audio_path = audio
+                # Verifica se o arquivo existe antes de tentar transcrever
+                if not os.path.exists(audio_path):
+                    self.logger.error(f"Arquivo de áudio não encontrado para transcrição: {audio_path}")
+                    return None
+                
+                self.logger.info(f"Iniciando transcrição do arquivo: {audio_path}")
+                
+                # Prazo proporcional à duração do áudio e ao RTF medido
+                duration = self._audio_duration(audio_path)
+                timeout = self.transcription_deadline(duration)
+                if duration is None:
+                    self.logger.warning(f"Duração do áudio desconhecida; usando prazo de {timeout:.0f} segundos")
+                else:
+                    self.logger.info(f"Iniciando transcrição de {duration:.1f}s com prazo de {timeout:.0f} segundos...")
+                
+                # Usa transcrição com timeout
+                result = self.transcribe_audio_with_timeout(audio_path, language, timeout, progress_callback)
             
             if result:
                 self.logger.info(f"Transcrição concluída com sucesso: {len(result['text'])} caracteres")
@@ -175,58 +1144,104 @@ class TranscriptionEngine:
             return result
             
         except Exception as e:
-            self.logger.error(f"Erro na transcrição de {audio_path}: {str(e)}")
+            self.logger.error(f"Erro na transcrição de {self._describe_audio(audio)}: {str(e)}")
             return None
     
-    def transcribe_video(self, video_path, languages=['pt', 'en'], progress_callback=None):
+    def transcribe_languages(self, audio, languages=['pt', 'en'], progress_callback=None, force_all_languages=False):
         """
-        Pipeline completo: extrai áudio do vídeo e transcreve
+        Transcreve áudio já carregado nos idiomas pedidos.
+        Para PCM em memória o VAD e a detecção de idioma rodam uma única vez e
+        o segundo idioma só é transcrito quando necessário (ver _plan_languages)
+        ou quando force_all_languages=True.
         """
         results = {}
+        language_names = {'pt': "português", 'en': "inglês"}
+        
+        if not isinstance(audio, np.ndarray):
+            # Arquivo de áudio (fallback): uma execução por idioma
+            for language in languages:
+                if progress_callback:
+                    progress_callback.set_description(f"🎤 Transcrevendo em {language_names.get(language, language)}...")
+                result = self.transcribe_audio(audio, language=language, progress_callback=progress_callback)
+                if result:
+                    results[language] = result
+            return results
+        
+        # Consulta o cache pela impressão digital do áudio + modelo e opções
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self._cache_key(audio, languages, force_all_languages)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.logger.info(f"Transcrição recuperada do cache ({cache_key[:12]})")
+                return cached
+        
+        speech, speech_map = self._prepare_speech(audio)
+        if speech is None:
+            results = {language: no_speech_result(language) for language in languages}
+            if cache_key:
+                self.cache.put(cache_key, results)
+            return results
+        
+        plan = self._plan_languages(speech, languages, force_all_languages)
+        for language, task in plan:
+            if progress_callback:
+                action = "Traduzindo para" if task == "translate" else "Transcrevendo em"
+                progress_callback.set_description(f"🎤 {action} {language_names.get(language, language)}...")
+            
+            result = self._transcribe_pcm(speech, language, progress_callback, task)
+            if result:
+                if speech_map:
+                    remap_timestamps(result, speech_map)
+                result['task'] = task
+                self.logger.info(f"Transcrição '{language}' concluída: {len(result['text'])} caracteres")
+                results[language] = result
+        
+        # Só resultados completos entram no cache (todos os idiomas, sem blocos perdidos)
+        complete = len(results) == len(plan) and not any(result.get('incomplete') for result in results.values())
+        if cache_key and complete:
+            self.cache.put(cache_key, results)
+        
+        return results
+    
+    def transcribe_video(self, video_path, languages=['pt', 'en'], progress_callback=None, force_all_languages=False):
+        """
+        Pipeline completo: decodifica o áudio do vídeo e transcreve
+        """
+        # Sem faixa de áudio não há o que decodificar nem transcrever
+        if not self.has_audio(video_path):
+            self.logger.info(f"Vídeo sem faixa de áudio: {video_path}")
+            return self.no_audio_results(languages)
         
         if progress_callback:
             progress_callback.set_description(f"🎤 Extraindo áudio...")
         
-        # Extrai áudio do vídeo
-        audio_path = self.extract_audio_from_video(video_path)
-        if not audio_path:
+        # Decodifica o áudio (em memória, ou WAV temporário como fallback)
+        audio = self.load_audio(video_path)
+        if audio is None:
             return None
         
         try:
-            # Transcreve em português
-            if 'pt' in languages:
-                if progress_callback:
-                    progress_callback.set_description(f"🎤 Transcrevendo em português...")
-                pt_result = self.transcribe_audio(audio_path, language='pt', progress_callback=progress_callback)
-                if pt_result:
-                    results['pt'] = pt_result
-            
-            # Transcreve em inglês
-            if 'en' in languages:
-                if progress_callback:
-                    progress_callback.set_description(f"🎤 Transcrevendo em inglês...")
-                en_result = self.transcribe_audio(audio_path, language='en', progress_callback=progress_callback)
-                if en_result:
-                    results['en'] = en_result
-            
-            # Remove arquivo de áudio temporário
-            if os.path.exists(audio_path):
-                os.remove(audio_path)
-            
-            return results
+            return self.transcribe_languages(audio, languages, progress_callback, force_all_languages)
             
         except Exception as e:
             self.logger.error(f"Erro no pipeline de transcrição: {str(e)}")
-            # Limpa arquivo temporário em caso de erro
-            if os.path.exists(audio_path):
-                os.remove(audio_path)
             return None
+        
+        finally:
+            # Remove arquivo de áudio temporário, se houver
+            self.release_audio(audio)
     
     def get_video_duration(self, video_path):
         """
         Obtém a duração do vídeo em segundos
         """
+        info = get_media_probe().probe(video_path)
+        if info and info.get('duration'):
+            return info['duration']
+        
         try:
+            from moviepy.video.io.VideoFileClip import VideoFileClip
             video = VideoFileClip(video_path)
             duration = video.duration
             video.close()
@@ -1,107 +1,599 @@
 import cv2
 import numpy as np
-from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
 import logging
 import json
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import math
+import time
+import subprocess
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import config
+from media_probe import get_media_probe, find_ffmpeg
+from visual_features import VisualFeatureEngine
+from text_matcher import KeywordMatcher
+from keyword_model import get_keyword_model
+
+# Impressão digital perceptual: um dHash de 64 bits (16 dígitos hex) por posição
+FINGERPRINT_HASH_DIGITS = 16
+FINGERPRINT_BANDS = 4  # faixas de 16 bits por hash usadas no índice de busca
+
+
+def frame_dhash(frame):
+    """
+    dHash de 64 bits do frame: tons de cinza reduzidos para 9x8 e
+    comparação de cada pixel com o vizinho da direita. Insensível a
+    resolução, bitrate e pequenas diferenças de compressão.
+    """
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int(''.join('1' if bit else '0' for bit in bits), 2)
+
+
+def split_fingerprint(fingerprint):
+    """
+    Lista de hashes (int) de uma impressão digital em hex
+    """
+    return [int(fingerprint[i:i + FINGERPRINT_HASH_DIGITS], 16)
+            for i in range(0, len(fingerprint), FINGERPRINT_HASH_DIGITS)]
+
+
+def fingerprint_bands(fingerprint):
+    """
+    Chaves do índice de quase-duplicatas: cada hash é dividido em faixas de
+    16 bits ("posição:faixa:valor"). Dois frames a até 3 bits de distância
+    têm pelo menos uma faixa idêntica.
+    """
+    bits = 64 // FINGERPRINT_BANDS
+    mask = (1 << bits) - 1
+    return [f"{position}:{band}:{(value >> (band * bits)) & mask:04x}"
+            for position, value in enumerate(split_fingerprint(fingerprint))
+            for band in range(FINGERPRINT_BANDS)]
+
+
+def fingerprint_is_informative(fingerprint):
+    """
+    False para impressões digitais que não distinguem vídeos: frames lisos
+    (preto, uma cor só) têm dHash ~0, e uma capa estática repete o mesmo hash
+    em todas as posições. Dois vídeos diferentes com a mesma capa teriam
+    similaridade 1.0.
+    """
+    hashes = split_fingerprint(fingerprint or '')
+    if not hashes:
+        return False
+    flat_bits = config.VIDEO_FINGERPRINT_FLAT_BITS
+    flat = sum(1 for value in hashes if min(bin(value).count('1'), 64 - bin(value).count('1')) <= flat_bits)
+    if flat * 2 >= len(hashes):
+        return False
+    return any(bin(value ^ hashes[0]).count('1') > config.VIDEO_FINGERPRINT_STATIC_BITS for value in hashes[1:])
+
+
+def fingerprint_similarity(first, second):
+    """
+    Similaridade entre 0 e 1: 1 - distância de Hamming média por posição
+    """
+    first, second = split_fingerprint(first), split_fingerprint(second)
+    if not first or len(first) != len(second):
+        return 0.0
+    distance = sum(bin(a ^ b).count('1') for a, b in zip(first, second))
+    return 1 - distance / (64 * len(first))
+
+
+def coarse_to_fine_order(count):
+    """
+    Ordem de visita de `count` amostras em que qualquer prefixo cobre a linha
+    do tempo de forma uniforme: extremos e depois pontos médios. Se o
+    orçamento de tempo acabar no meio, as amostras lidas continuam espalhadas.
+    """
+    if count <= 2:
+        return list(range(count))
+    order = [0, count - 1]
+    intervals = deque([(0, count - 1)])
+    while intervals:
+        low, high = intervals.popleft()
+        if high - low < 2:
+            continue
+        middle = (low + high) // 2
+        order.append(middle)
+        intervals.append((low, middle))
+        intervals.append((middle, high))
+    return order
+
+
+class SceneDetector:
+    """
+    Detector incremental de cortes: recebe frames (já reduzidos) um a um com
+    seu instante e compara o histograma de cinza com o do frame anterior.
+    Guarda apenas o último histograma, então a memória é constante.
+    """
+    
+    def __init__(self, threshold=config.SCENE_DETECTION_THRESHOLD,
+                 min_scene_duration=config.SCENE_MIN_DURATION):
+        self.threshold = threshold
+        self.min_scene_duration = min_scene_duration
+        self.boundaries = []
+        self._prev_hist = None
+        self._last_cut = None
+    
+    def feed(self, frame, timestamp, frame_index=None):
+        """
+        Processa um frame; retorna o corte detectado (dict) ou None
+        """
+        gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        hist = cv2.calcHist([gray], [0], None, [64], [0, 256])
+        prev_hist, self._prev_hist = self._prev_hist, hist
+        if prev_hist is None:
+            return None
+        
+        correlation = cv2.compareHist(hist, prev_hist, cv2.HISTCMP_CORREL)
+        if correlation >= self.threshold:
+            return None
+        if self._last_cut is not None and timestamp - self._last_cut < self.min_scene_duration:
+            return None
+        
+        self._last_cut = timestamp
+        boundary = {'time': float(timestamp), 'frame': frame_index, 'score': float(1 - correlation)}
+        self.boundaries.append(boundary)
+        return boundary
+
+
+class StreamingVideoAnalysis:
+    """
+    Consumidor de frames para a leitura única (MediaReader): guarda apenas o
+    frame mais próximo de cada instante de amostragem e alimenta o detector
+    de cortes à medida que os frames chegam. Com fingerprint_positions, guarda
+    também os frames mais próximos das posições da impressão digital (as
+    mesmas frações da duração de VideoAnalyzer.compute_fingerprint), para que
+    ela saia desta leitura sem abrir o vídeo de novo.
+    """
+    
+    def __init__(self, analyzer, duration, num_frames, fingerprint_positions=0):
+        self.analyzer = analyzer
+        self.duration = duration
+        self.targets = np.linspace(0, duration or 0, num_frames)
+        self.samples = [None] * num_frames
+        self.distances = [float('inf')] * num_frames
+        self.scene_detector = SceneDetector() if config.SCENE_DETECTION_ENABLED else None
+        
+        # Sem duração não há posições fixas para a impressão digital
+        positions = fingerprint_positions if duration else 0
+        self.fingerprint_targets = np.linspace(0, duration or 0, positions + 2)[1:-1]
+        self.fingerprint_samples = [None] * positions
+        self.fingerprint_distances = [float('inf')] * positions
+    
+    def _keep_nearest(self, targets, samples, distances, frame, timestamp):
+        index = int(np.abs(targets - timestamp).argmin())
+        distance = abs(targets[index] - timestamp)
+        if distance < distances[index]:
+            distances[index] = distance
+            samples[index] = frame
+    
+    def feed(self, frame, timestamp):
+        self._keep_nearest(self.targets, self.samples, self.distances, frame, timestamp)
+        if len(self.fingerprint_targets):
+            self._keep_nearest(self.fingerprint_targets, self.fingerprint_samples,
+                               self.fingerprint_distances, frame, timestamp)
+        
+        if self.scene_detector is not None:
+            width = config.SCENE_DETECTION_WIDTH
+            if frame.shape[1] > width:
+                height = max(1, int(frame.shape[0] * width / frame.shape[1]))
+                frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+            self.scene_detector.feed(frame, timestamp)
+    
+    def result(self):
+        """
+        Mesmo formato de VideoAnalyzer.analyze_video
+        """
+        kept = [i for i, frame in enumerate(self.samples) if frame is not None]
+        frames = [self.samples[i] for i in kept]
+        timestamps = [float(self.targets[i]) for i in kept]
+        analysis = self.analyzer.analyze_visual_content(frames, timestamps, self.duration)
+        if analysis and self.scene_detector is not None:
+            self.analyzer._apply_scene_boundaries(analysis, self.scene_detector.boundaries, self.duration)
+        return analysis
+    
+    def fingerprint(self):
+        """
+        Impressão digital (mesmo formato de compute_fingerprint) a partir dos
+        frames recebidos; None se alguma posição ficou sem frame
+        """
+        if not self.fingerprint_samples or any(frame is None for frame in self.fingerprint_samples):
+            return None
+        return ''.join(f"{frame_dhash(frame):0{FINGERPRINT_HASH_DIGITS}x}" for frame in self.fingerprint_samples)
+
 
 class VideoAnalyzer:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         
-        # Inicializa pipeline de classificação de texto para português
+        # Estatísticas de documentos do corpus de vídeos para extração de keywords
+        self.keyword_model = get_keyword_model('videos')
+        
+        # Estatísticas visuais em resolução reduzida (detector de faces compartilhado)
+        self.visual_engine = VisualFeatureEngine()
+        
+        # Palavras-chave das categorias compiladas uma única vez
+        self.category_matcher = KeywordMatcher(config.VIDEO_CATEGORY_KEYWORDS)
+    
+    def frame_budget(self, duration):
+        """
+        Número de frames a amostrar pela duração: config.FRAME_SAMPLING_PER_MINUTE
+        limitado a [FRAME_SAMPLING_MIN_FRAMES, FRAME_SAMPLING_MAX_FRAMES]
+        (FRAME_SAMPLING_DEFAULT_FRAMES quando a duração é desconhecida)
+        """
+        if not duration:
+            return config.FRAME_SAMPLING_DEFAULT_FRAMES
+        frames = math.ceil(duration / 60 * config.FRAME_SAMPLING_PER_MINUTE)
+        return max(config.FRAME_SAMPLING_MIN_FRAMES, min(config.FRAME_SAMPLING_MAX_FRAMES, frames))
+    
+    def choose_sampling_strategy(self, video_path, num_frames=10):
+        """
+        Escolhe a estratégia de amostragem pelo GOP e pela distância entre as
+        amostras (config.FRAME_SAMPLING_STRATEGY='auto'). Um seek decodifica
+        em média meio GOP; percorrer o stream decodifica todos os frames entre
+        as amostras:
+        - GOP curto: 'seek' exato
+        - amostras a menos de meio GOP umas das outras: 'sequential'
+        - GOP longo e amostras a mais de um GOP: 'keyframe' (um frame
+          decodificado por amostra, exige ffprobe); senão 'seek'
+        """
+        if config.FRAME_SAMPLING_STRATEGY != 'auto':
+            return config.FRAME_SAMPLING_STRATEGY
+        
+        probe = get_media_probe()
+        info = probe.probe(video_path) or {}
+        fps = info.get('fps')
+        frame_count = info.get('frame_count')
+        if not fps or not frame_count:
+            return 'seek'
+        
+        gop = probe.gop_seconds(video_path)
+        gop_frames = gop * fps if gop else config.FRAME_SAMPLING_DEFAULT_GOP
+        frames_between = frame_count / max(1, num_frames)
+        
+        if gop_frames <= config.FRAME_SAMPLING_SEEK_MAX_GOP:
+            return 'seek'
+        if frames_between <= gop_frames / 2:
+            return 'sequential'
+        if gop is not None and frames_between > gop_frames:
+            return 'keyframe'
+        return 'seek'
+    
+    def sample_frames(self, video_path, num_frames=None, strategy=None,
+                      time_budget=config.FRAME_SAMPLING_TIME_BUDGET):
+        """
+        Amostra frames distribuídos ao longo do vídeo.
+        num_frames=None usa o orçamento pela duração (frame_budget); depois de
+        time_budget segundos de decodificação (e ao menos
+        config.FRAME_SAMPLING_MIN_FRAMES frames) a amostragem para.
+        Retorna (frames, timestamps em segundos).
+        """
         try:
-            self.text_classifier = pipeline(
-                "text-classification",
-                model="cardiffnlp/twitter-roberta-base-sentiment-latest",
-                return_all_scores=True
-            )
+            start = time.time()
+            # Número de frames vem do cache de metadados (lido uma vez por arquivo)
+            info = get_media_probe().probe(video_path)
+            if info and info.get('has_video') is False:
+                return [], []
+            
+            cap = cv2.VideoCapture(video_path)
+            try:
+                total_frames = (info or {}).get('frame_count') or int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+                fps = (info or {}).get('fps') or cap.get(cv2.CAP_PROP_FPS) or 0
+                
+                if total_frames == 0:
+                    return [], []
+                
+                if num_frames is None:
+                    duration = (info or {}).get('duration') or (total_frames / fps if fps else None)
+                    num_frames = self.frame_budget(duration)
+                deadline = start + time_budget if time_budget else None
+                
+                frame_indices = np.linspace(0, total_frames-1, num_frames, dtype=int)
+                strategy = strategy or self.choose_sampling_strategy(video_path, num_frames)
+                
+                if strategy == 'keyframe' and fps:
+                    result = self._sample_keyframes(cap, video_path, frame_indices, fps, deadline)
+                    if result is not None:
+                        return result
+                    strategy = 'seek'
+                
+                if strategy == 'sequential':
+                    frames, indices = self._sample_sequential(cap, frame_indices, deadline)
+                else:
+                    frames, indices = self._sample_seek(cap, frame_indices, deadline)
+                
+                if deadline and time.time() > deadline and len(indices) < len(set(int(idx) for idx in frame_indices)):
+                    self.logger.info(f"Orçamento de {time_budget}s atingido: {len(frames)} de {num_frames} frames em {video_path}")
+                
+                timestamps = [idx / fps if fps else 0.0 for idx in indices]
+                return frames, timestamps
+            finally:
+                cap.release()
+            
         except Exception as e:
-            self.logger.warning(f"Erro ao carregar modelo de classificação: {e}")
-            self.text_classifier = None
+            self.logger.error(f"Erro ao extrair frames de {video_path}: {str(e)}")
+            return [], []
+    
+    def _over_budget(self, deadline, frames_read):
+        return deadline is not None and frames_read >= config.FRAME_SAMPLING_MIN_FRAMES and time.time() > deadline
+    
+    def _sample_seek(self, cap, frame_indices, deadline=None):
+        # Visita do grosso para o fino; o resultado volta à ordem temporal
+        sampled = []
+        for position in coarse_to_fine_order(len(frame_indices)):
+            if self._over_budget(deadline, len(sampled)):
+                break
+            idx = int(frame_indices[position])
+            cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
+            ret, frame = cap.read()
+            if ret:
+                sampled.append((idx, frame))
+        sampled.sort(key=lambda item: item[0])
+        return [frame for _, frame in sampled], [idx for idx, _ in sampled]
+    
+    def _sample_sequential(self, cap, frame_indices, deadline=None):
+        # grab() só avança o stream; retrieve() converte apenas os frames escolhidos
+        # (o stream é lido em ordem, então um orçamento esgotado corta o final)
+        wanted = set(int(idx) for idx in frame_indices)
+        last = max(wanted)
+        frames, indices = [], []
+        position = 0
+        while position <= last:
+            if self._over_budget(deadline, len(frames)):
+                break
+            if not cap.grab():
+                break
+            if position in wanted:
+                ret, frame = cap.retrieve()
+                if ret:
+                    frames.append(frame)
+                    indices.append(position)
+            position += 1
+        return frames, indices
+    
+    def _sample_keyframes(self, cap, video_path, frame_indices, fps, deadline=None):
+        # Cada amostra vai para o keyframe onde o seek cai: decodifica um frame só
+        targets = [idx / fps for idx in frame_indices]
+        keyframes = get_media_probe().keyframe_times(video_path, targets)
+        if not keyframes:
+            return None
         
-        # Vectorizador para extração de keywords
-        self.vectorizer = TfidfVectorizer(
-            max_features=100,
-            stop_words=['de', 'da', 'do', 'para', 'com', 'em', 'no', 'na', 'um', 'uma', 'o', 'a', 'e', 'que']
-        )
+        keyframes = sorted(set(t for t in keyframes if t is not None))
+        sampled = []
+        for position in coarse_to_fine_order(len(keyframes)):
+            if self._over_budget(deadline, len(sampled)):
+                break
+            keyframe = keyframes[position]
+            cap.set(cv2.CAP_PROP_POS_FRAMES, int(round(keyframe * fps)))
+            ret, frame = cap.read()
+            if ret:
+                sampled.append((keyframe, frame))
+        sampled.sort(key=lambda item: item[0])
+        return [frame for _, frame in sampled], [keyframe for keyframe, _ in sampled]
     
-    def extract_video_frames(self, video_path, num_frames=10):
+    def _scan_scene_segment(self, video_path, start, end, size, source_fps, keyframes_only=False):
         """
-        Extrai frames representativos do vídeo para análise visual
+        Percorre o trecho [start, end) (s) com um ffmpeg que já entrega os
+        frames em config.SCENE_DETECTION_FPS quadros por segundo, reduzidos
+        para `size` e em tons de cinza (filtros fps + scale): nenhum frame em
+        resolução cheia é convertido ou copiado para o Python. Com
+        keyframes_only, o decoder pula tudo que não é keyframe
+        (-skip_frame nokey) e os cortes ficam com a resolução do GOP.
+        Começa uma amostra antes de `start` para detectar um corte exatamente
+        na emenda entre segmentos. Retorna None se o ffmpeg não estiver disponível.
         """
+        ffmpeg = find_ffmpeg()
+        if ffmpeg is None:
+            return None
+        
+        rate = config.SCENE_DETECTION_FPS
+        lead = min(start, 1.0 / rate)
+        origin = start - lead
+        width, height = size
+        cmd = [ffmpeg, '-nostdin', '-loglevel', 'error']
+        if keyframes_only:
+            cmd += ['-skip_frame', 'nokey']
+        cmd += [
+            '-ss', f"{origin:.3f}", '-t', f"{end - origin:.3f}", '-i', video_path,
+            '-map', '0:v:0', '-vf', f"fps={rate},scale={width}:{height}",
+            '-pix_fmt', 'gray', '-f', 'rawvideo', 'pipe:1'
+        ]
+        
+        detector = SceneDetector()
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        # stderr drenado em paralelo para o ffmpeg nunca bloquear
+        stderr_buffer = bytearray()
+        stderr_thread = threading.Thread(target=lambda: stderr_buffer.extend(process.stderr.read()), daemon=True)
+        stderr_thread.start()
+        
+        frame_bytes = width * height
+        index = 0
         try:
-            cap = cv2.VideoCapture(video_path)
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            while True:
+                data = process.stdout.read(frame_bytes)
+                if len(data) < frame_bytes:
+                    break
+                frame = np.frombuffer(data, dtype=np.uint8).reshape(height, width)
+                timestamp = origin + index / rate
+                detector.feed(frame, timestamp, int(round(timestamp * source_fps)))
+                index += 1
+        finally:
+            process.stdout.close()
+            stderr_thread.join()
+            process.wait()
+        
+        if process.returncode != 0 and not index:
+            self.logger.warning(f"ffmpeg falhou na detecção de cenas de {video_path}: "
+                                f"{stderr_buffer.decode(errors='ignore').strip()}")
+            return None
+        return [b for b in detector.boundaries if b['time'] >= start]
+    
+    def _scan_scene_segment_opencv(self, video_path, start, end, step, width):
+        """
+        Fallback sem ffmpeg: percorre os frames [start, end) com grab(),
+        decodificando em cor e reduzindo apenas um a cada `step`. O passo é
+        contado a partir da posição real do primeiro frame lido (o seek do
+        OpenCV pode não ser exato).
+        """
+        detector = SceneDetector()
+        cap = cv2.VideoCapture(video_path)
+        try:
+            fps = cap.get(cv2.CAP_PROP_FPS) or 0
+            target = max(0, start - step)
+            if target:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+            position = int(cap.get(cv2.CAP_PROP_POS_FRAMES) or 0)
             
-            if total_frames == 0:
+            first = position
+            while position < end:
+                if not cap.grab():
+                    break
+                if (position - first) % step == 0:
+                    ret, frame = cap.retrieve()
+                    if ret:
+                        height = max(1, int(frame.shape[0] * width / frame.shape[1]))
+                        small = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+                        detector.feed(small, position / fps if fps else 0.0, position)
+                position += 1
+        finally:
+            cap.release()
+        
+        return [b for b in detector.boundaries if b['frame'] >= start]
+    
+    def detect_scenes(self, video_path, workers=config.SCENE_DETECTION_WORKERS):
+        """
+        Detecção de cortes no vídeo inteiro em baixa resolução e com salto de
+        frames (config.SCENE_DETECTION_FPS amostras por segundo). A linha do
+        tempo é dividida em segmentos analisados em paralelo, cada um por um
+        processo ffmpeg (ou pelo OpenCV, sem ffmpeg). Se o GOP do arquivo for
+        de até config.SCENE_DETECTION_KEYFRAME_MAX_GOP segundos, só os
+        keyframes são decodificados.
+        Retorna lista de cortes {'time', 'frame', 'score'} em ordem.
+        """
+        try:
+            info = get_media_probe().probe(video_path) or {}
+            fps = info.get('fps')
+            frame_count = info.get('frame_count')
+            if not fps or not frame_count:
                 return []
             
-            frame_indices = np.linspace(0, total_frames-1, num_frames, dtype=int)
-            frames = []
+            duration = info.get('duration') or frame_count / fps
+            segment_count = max(1, min(workers, int(duration // config.SCENE_MIN_SEGMENT_DURATION)))
+            width = config.SCENE_DETECTION_WIDTH
             
-            for idx in frame_indices:
-                cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
-                ret, frame = cap.read()
-                if ret:
-                    frames.append(frame)
+            segments = None
+            if info.get('width') and info.get('height'):
+                # Segmentos alinhados ao intervalo de amostragem; altura par para o scale
+                interval = 1.0 / config.SCENE_DETECTION_FPS
+                edges = [round(duration * i / segment_count / interval) * interval
+                         for i in range(segment_count)] + [duration]
+                size = (width, max(2, int(round(info['height'] * width / info['width'] / 2)) * 2))
+                gop = get_media_probe().gop_seconds(video_path) if config.SCENE_DETECTION_KEYFRAME_MAX_GOP else None
+                keyframes_only = gop is not None and gop <= config.SCENE_DETECTION_KEYFRAME_MAX_GOP
+                with ThreadPoolExecutor(max_workers=segment_count) as executor:
+                    futures = [
+                        executor.submit(self._scan_scene_segment, video_path, edges[i], edges[i + 1],
+                                        size, fps, keyframes_only)
+                        for i in range(segment_count)
+                    ]
+                    segments = [future.result() for future in futures]
+                if any(segment is None for segment in segments):
+                    segments = None
             
-            cap.release()
-            return frames
+            if segments is None:
+                step = max(1, int(round(fps / config.SCENE_DETECTION_FPS)))
+                edges = [int(frame_count * i / segment_count) // step * step for i in range(segment_count)] + [frame_count]
+                with ThreadPoolExecutor(max_workers=segment_count) as executor:
+                    futures = [
+                        executor.submit(self._scan_scene_segment_opencv, video_path, edges[i], edges[i + 1],
+                                        step, width)
+                        for i in range(segment_count)
+                    ]
+                    segments = [future.result() for future in futures]
+            
+            # Junta os segmentos respeitando a duração mínima de cena nas emendas
+            boundaries = []
+            for boundary in (b for segment in segments for b in segment):
+                if boundaries and boundary['time'] - boundaries[-1]['time'] < config.SCENE_MIN_DURATION:
+                    continue
+                boundaries.append(boundary)
+            return boundaries
             
         except Exception as e:
-            self.logger.error(f"Erro ao extrair frames de {video_path}: {str(e)}")
+            self.logger.error(f"Erro na detecção de cenas de {video_path}: {str(e)}")
             return []
     
-    def analyze_visual_content(self, frames):
+    def analyze_video(self, video_path):
+        """
+        Análise visual completa de um vídeo: estatísticas dos frames amostrados
+        e, com config.SCENE_DETECTION_ENABLED, cortes detectados no stream inteiro
+        """
+        duration = (get_media_probe().probe(video_path) or {}).get('duration')
+        frames, timestamps = self.sample_frames(video_path)
+        analysis = self.analyze_visual_content(frames, timestamps, duration)
+        if not analysis or not config.SCENE_DETECTION_ENABLED:
+            return analysis
+        
+        boundaries = self.detect_scenes(video_path)
+        return self._apply_scene_boundaries(analysis, boundaries, duration)
+    
+    def _apply_scene_boundaries(self, analysis, boundaries, duration):
+        analysis['scene_changes'] = len(boundaries)
+        analysis['scene_boundaries'] = [b['time'] for b in boundaries]
+        if duration:
+            analysis['scene_change_rate'] = len(boundaries) / (duration / 60)
+        return analysis
+    
+    def stream_analysis(self, video_path, num_frames=None):
         """
-        Análise básica do conteúdo visual (cores, movimento, etc.)
+        Cria o consumidor de frames para analisar o vídeo (e tirar a impressão
+        digital) durante a leitura única do container (ver media_reader.MediaReader)
+        """
+        duration = (get_media_probe().probe(video_path) or {}).get('duration')
+        positions = config.VIDEO_FINGERPRINT_POSITIONS if config.VIDEO_FINGERPRINT_ENABLED else 0
+        return StreamingVideoAnalysis(self, duration, num_frames or self.frame_budget(duration), positions)
+    
+    def compute_fingerprint(self, video_path, positions=config.VIDEO_FINGERPRINT_POSITIONS):
+        """
+        Impressão digital perceptual do vídeo: dHash de frames em posições
+        fixas da linha do tempo (frações da duração, sem o primeiro e o último
+        frame), concatenados em hex. Retorna None se não houver frames suficientes.
+        """
+        try:
+            # Keyframes variam entre codificações: aqui os frames precisam ser exatos
+            strategy = self.choose_sampling_strategy(video_path, positions + 2)
+            if strategy == 'keyframe':
+                strategy = 'seek'
+            frames, _ = self.sample_frames(video_path, positions + 2, strategy, time_budget=None)
+            frames = frames[1:-1]
+            if len(frames) != positions:
+                return None
+            return ''.join(f"{frame_dhash(frame):0{FINGERPRINT_HASH_DIGITS}x}" for frame in frames)
+        except Exception as e:
+            self.logger.error(f"Erro ao calcular impressão digital de {video_path}: {str(e)}")
+            return None
+    
+    def extract_video_frames(self, video_path, num_frames=None):
+        """
+        Extrai frames representativos do vídeo para análise visual
+        (num_frames=None: orçamento adaptativo pela duração)
+        """
+        frames, _ = self.sample_frames(video_path, num_frames)
+        return frames
+    
+    def analyze_visual_content(self, frames, timestamps=None, duration=None):
+        """
+        Análise básica do conteúdo visual (cores, movimento, etc.).
+        Com os instantes dos frames, cada um pesa pelo trecho do vídeo que
+        representa, então a densidade de amostragem não muda as médias.
         """
         if not frames:
             return {}
         
-        analysis = {
-            'brightness': [],
-            'dominant_colors': [],
-            'has_faces': False,
-            'scene_changes': 0
-        }
-        
         try:
-            prev_hist = None
-            
-            for frame in frames:
-                # Análise de brilho
-                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                brightness = np.mean(gray)
-                analysis['brightness'].append(brightness)
-                
-                # Análise de cores dominantes (simplificada)
-                colors = frame.reshape(-1, 3)
-                dominant_color = np.mean(colors, axis=0)
-                analysis['dominant_colors'].append(dominant_color.tolist())
-                
-                # Detecção básica de faces
-                face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-                faces = face_cascade.detectMultiScale(gray, 1.1, 4)
-                if len(faces) > 0:
-                    analysis['has_faces'] = True
-                
-                # Análise de mudanças de cena
-                hist = cv2.calcHist([gray], [0], None, [256], [0, 256])
-                if prev_hist is not None:
-                    correlation = cv2.compareHist(hist, prev_hist, cv2.HISTCMP_CORREL)
-                    if correlation < 0.7:  # Threshold para mudança de cena
-                        analysis['scene_changes'] += 1
-                prev_hist = hist
-            
-            # Calcular médias
-            analysis['avg_brightness'] = np.mean(analysis['brightness'])
-            analysis['brightness_variance'] = np.var(analysis['brightness'])
-            
-            return analysis
+            return self.visual_engine.analyze(frames, timestamps, duration)
             
         except Exception as e:
             self.logger.error(f"Erro na análise visual: {str(e)}")
@@ -109,27 +601,14 @@ class VideoAnalyzer:
     
     def extract_keywords(self, text, max_keywords=20):
         """
-        Extrai palavras-chave do texto usando TF-IDF
+        Extrai palavras-chave do texto usando TF-IDF sobre o corpus de vídeos
         """
         if not text or len(text.strip()) < 10:
             return []
         
         try:
-            # Preprocessa o texto
-            text_clean = text.lower().strip()
-            
-            # Extrai keywords usando TF-IDF
-            tfidf_matrix = self.vectorizer.fit_transform([text_clean])
-            feature_names = self.vectorizer.get_feature_names_out()
-            tfidf_scores = tfidf_matrix.toarray()[0]
-            
-            # Cria lista de (palavra, score) e ordena por score
-            word_scores = list(zip(feature_names, tfidf_scores))
-            word_scores.sort(key=lambda x: x[1], reverse=True)
-            
-            # Retorna as top palavras-chave
-            keywords = [word for word, score in word_scores[:max_keywords] if score > 0]
-            return keywords
+            # TF do texto x IDF do corpus (o texto entra no corpus antes)
+            return self.keyword_model.extract(text, max_keywords)
             
         except Exception as e:
             self.logger.error(f"Erro na extração de keywords: {str(e)}")
@@ -140,54 +619,9 @@ class VideoAnalyzer:
         Classifica o conteúdo baseado na transcrição e análise visual
         """
         try:
-            # Palavras-chave por categoria
-            category_keywords = {
-                'educacao': ['aula', 'ensino', 'aprender', 'estudar', 'explicar', 'conhecimento', 'educação'],
-                'entretenimento': ['diversão', 'entretenimento', 'filme', 'série', 'comédia', 'drama'],
-                'noticias': ['notícia', 'jornal', 'informação', 'reportagem', 'atualidade'],
-                'esportes': ['futebol', 'basquete', 'esporte', 'jogo', 'competição', 'atleta'],
-                'tecnologia': ['tecnologia', 'computador', 'software', 'programação', 'digital'],
-                'culinaria': ['receita', 'cozinhar', 'comida', 'ingrediente', 'culinária'],
-                'musica': ['música', 'cantar', 'instrumento', 'banda', 'som', 'melodia'],
-                'gaming': ['game', 'jogo', 'jogar', 'gamer', 'gameplay', 'videogame'],
-                'tutorial': ['como fazer', 'tutorial', 'passo a passo', 'ensinar', 'guia'],
-                'documentario': ['documentário', 'história', 'realidade', 'investigação'],
-                'adulto': ['sexo', 'adulto', 'íntimo', 'sensual', 'erótico', 'pornô'],
-                'outros': []
-            }
-            
-            text_lower = transcript.lower()
-            scores = {}
-            
-            # Calcula score para cada categoria
-            for category, keywords in category_keywords.items():
-                score = 0
-                for keyword in keywords:
-                    if keyword in text_lower:
-                        score += text_lower.count(keyword)
-                
-                # Adiciona bonus baseado em análise visual se disponível
-                if visual_analysis and category == 'adulto':
-                    # Critérios visuais para conteúdo adulto (básico)
-                    if visual_analysis.get('has_faces') and visual_analysis.get('avg_brightness', 0) > 100:
-                        score += 2
-                
-                scores[category] = score
-            
-            # Encontra a categoria com maior score
-            if max(scores.values()) == 0:
-                predicted_category = 'outros'
-                confidence = 0.5
-            else:
-                predicted_category = max(scores, key=scores.get)
-                total_score = sum(scores.values())
-                confidence = scores[predicted_category] / total_score if total_score > 0 else 0.5
-            
-            return {
-                'category': predicted_category,
-                'confidence': confidence,
-                'scores': scores
-            }
+            # Uma passada pela transcrição conta as palavras-chave de todas as categorias
+            counts = self.category_matcher.count(transcript)
+            return self._score_categories(counts, visual_analysis)
             
         except Exception as e:
             self.logger.error(f"Erro na classificação de conteúdo: {str(e)}")
@@ -197,6 +631,43 @@ class VideoAnalyzer:
                 'scores': {}
             }
     
+    def classify_many(self, transcripts, visual_analyses=None):
+        """
+        Classificação em lote (ex.: reclassificar transcrições já salvas).
+        Retorna uma classificação por transcrição, na mesma ordem.
+        """
+        visual_analyses = visual_analyses or [None] * len(transcripts)
+        return [
+            self._score_categories(counts, visual_analysis)
+            for counts, visual_analysis in zip(self.category_matcher.count_many(transcripts), visual_analyses)
+        ]
+    
+    def _score_categories(self, counts, visual_analysis):
+        scores = {}
+        for category, score in counts.items():
+            # Adiciona bonus baseado em análise visual se disponível
+            if visual_analysis and category == 'adulto':
+                # Critérios visuais para conteúdo adulto (básico)
+                if visual_analysis.get('has_faces') and visual_analysis.get('avg_brightness', 0) > 100:
+                    score += 2
+            
+            scores[category] = score
+        
+        # Encontra a categoria com maior score
+        if max(scores.values()) == 0:
+            predicted_category = 'outros'
+            confidence = 0.5
+        else:
+            predicted_category = max(scores, key=scores.get)
+            total_score = sum(scores.values())
+            confidence = scores[predicted_category] / total_score if total_score > 0 else 0.5
+        
+        return {
+            'category': predicted_category,
+            'confidence': confidence,
+            'scores': scores
+        }
+    
     def generate_video_context(self, transcript, visual_analysis, classification):
         """
         Gera contexto do vídeo baseado em todas as análises
@@ -224,10 +695,25 @@ class VideoAnalyzer:
                 elif brightness < 50:
                     context_parts.append("Vídeo com pouca iluminação")
                 
-                scene_changes = visual_analysis.get('scene_changes', 0)
-                if scene_changes > 5:
+                # Com a detecção no stream inteiro usa cortes por minuto;
+                # senão, o número de mudanças entre os frames amostrados
+                if 'scene_change_rate' in visual_analysis:
+                    rate = visual_analysis['scene_change_rate']
+                    dynamic = rate > config.SCENE_DYNAMIC_RATE
+                    static = rate < config.SCENE_STATIC_RATE
+                elif 'scene_change_fraction' in visual_analysis:
+                    # Fração de pares consecutivos com mudança (mesmos limiares
+                    # de antes, que valiam para 10 frames / 9 pares)
+                    fraction = visual_analysis['scene_change_fraction']
+                    dynamic = fraction > 5 / 9
+                    static = fraction < 2 / 9
+                else:
+                    scene_changes = visual_analysis.get('scene_changes', 0)
+                    dynamic = scene_changes > 5
+                    static = scene_changes < 2
+                if dynamic:
                     context_parts.append("Vídeo dinâmico com várias cenas")
-                elif scene_changes < 2:
+                elif static:
                     context_parts.append("Vídeo estático ou poucas cenas")
             
             # Classificação
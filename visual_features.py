@@ -0,0 +1,159 @@
+import cv2
+import numpy as np
+import logging
+import threading
+import config
+
+# Pesos BT.601 na ordem BGR do OpenCV (mesma conversão de cv2.COLOR_BGR2GRAY)
+_GRAY_WEIGHTS = np.array([0.114, 0.587, 0.299], dtype=np.float32)
+
+_face_detector = None
+_face_detector_lock = threading.Lock()
+
+
+def get_face_detector():
+    """
+    Detector Haar de faces carregado uma única vez por processo
+    """
+    global _face_detector
+    with _face_detector_lock:
+        if _face_detector is None:
+            _face_detector = SharedFaceDetector()
+        return _face_detector
+
+
+class SharedFaceDetector:
+    """
+    Detector Haar com um CascadeClassifier por thread: o classificador não
+    garante uso concorrente, mas a carga é barata e as instâncias são
+    independentes, então os workers de análise detectam faces em paralelo
+    """
+
+    def __init__(self, cascade_file='haarcascade_frontalface_default.xml'):
+        self.cascade_path = cv2.data.haarcascades + cascade_file
+        self._local = threading.local()
+
+    @property
+    def classifier(self):
+        classifier = getattr(self._local, 'classifier', None)
+        if classifier is None:
+            classifier = self._local.classifier = cv2.CascadeClassifier(self.cascade_path)
+        return classifier
+
+    def detect(self, gray, scale_factor=1.1, min_neighbors=4):
+        return self.classifier.detectMultiScale(gray, scale_factor, min_neighbors)
+
+
+class VisualFeatureEngine:
+    """
+    Extrai as estatísticas visuais de um conjunto de frames:
+    os frames são reduzidos para uma resolução fixa de análise e empilhados,
+    e brilho, cor média e histogramas saem de uma única passada NumPy.
+    """
+
+    def __init__(self, analysis_width=config.VISUAL_ANALYSIS_WIDTH):
+        self.logger = logging.getLogger(__name__)
+        self.analysis_width = analysis_width
+        self.face_detector = get_face_detector()
+
+    def prepare(self, frames):
+        """
+        Reduz os frames para a largura de análise (proporção do primeiro
+        frame) e retorna um array (N, altura, largura, 3) uint8
+        """
+        height, width = frames[0].shape[:2]
+        target_width = min(width, self.analysis_width)
+        target_height = max(1, int(round(height * target_width / width)))
+        size = (target_width, target_height)
+
+        stacked = np.empty((len(frames), target_height, target_width, 3), dtype=np.uint8)
+        for i, frame in enumerate(frames):
+            if frame.shape[1] != target_width or frame.shape[0] != target_height:
+                frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+            stacked[i] = frame
+        return stacked
+
+    def has_faces(self, frames, width=config.FACE_DETECTION_WIDTH):
+        """
+        Procura faces frame a frame e para no primeiro frame com detecção.
+        Usa os frames originais reduzidos só até `width` (0 = resolução
+        cheia): na largura de análise, faces pequenas deixariam de ser achadas.
+        """
+        for frame in frames:
+            if width and frame.shape[1] > width:
+                height = max(1, int(round(frame.shape[0] * width / frame.shape[1])))
+                frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+            if len(self.face_detector.detect(gray)) > 0:
+                return True
+        return False
+
+    def frame_weights(self, count, timestamps=None, duration=None):
+        """
+        Peso de cada frame = trecho da linha do tempo que ele representa (do
+        ponto médio com o anterior ao ponto médio com o seguinte), normalizado.
+        Cada trecho é limitado ao intervalo mediano de amostragem: se o
+        orçamento de tempo interrompeu a amostragem, o último frame não
+        herda todo o resto do vídeo que não foi coberto (nem o primeiro o
+        início, se a amostragem começou tarde).
+        Sem instantes, todos os frames pesam igual.
+        """
+        if not timestamps or len(timestamps) != count or count < 2:
+            return np.full(count, 1.0 / count)
+        times = np.asarray(timestamps, dtype=np.float64)
+        end = max(duration or 0, times[-1])
+        edges = np.concatenate(([0.0], (times[1:] + times[:-1]) / 2, [end]))
+        spans = np.clip(np.diff(edges), 0, None)
+        interval = np.median(np.diff(times))
+        if interval > 0:
+            spans = np.minimum(spans, interval)
+        total = spans.sum()
+        return spans / total if total > 0 else np.full(count, 1.0 / count)
+    
+    def analyze(self, frames, timestamps=None, duration=None):
+        """
+        Retorna brightness, dominant_colors, has_faces, scene_changes,
+        avg_brightness e brightness_variance (mesmas chaves de
+        VideoAnalyzer.analyze_visual_content), mais scene_change_fraction e
+        frames_analyzed. Médias e variância são ponderadas pelo trecho de
+        vídeo de cada frame (frame_weights).
+        """
+        stacked = self.prepare(frames)
+        count = len(stacked)
+        weights = self.frame_weights(count, timestamps, duration)
+
+        # Tons de cinza de todos os frames de uma vez
+        gray = np.rint(stacked @ _GRAY_WEIGHTS).astype(np.uint8)
+
+        brightness = gray.reshape(count, -1).mean(axis=1)
+        dominant_colors = stacked.reshape(count, -1, 3).mean(axis=1)
+
+        # Histogramas de 256 tons de todos os frames em um único bincount
+        offsets = (np.arange(count, dtype=np.int64) * 256)[:, None]
+        hists = np.bincount(
+            (gray.reshape(count, -1) + offsets).ravel(), minlength=count * 256
+        ).reshape(count, 256).astype(np.float64)
+
+        # Correlação entre histogramas consecutivos (como cv2.HISTCMP_CORREL)
+        scene_changes = 0
+        scene_change_fraction = 0.0
+        if count > 1:
+            centered = hists - hists.mean(axis=1, keepdims=True)
+            numerator = (centered[1:] * centered[:-1]).sum(axis=1)
+            denominator = np.sqrt((centered[1:] ** 2).sum(axis=1) * (centered[:-1] ** 2).sum(axis=1))
+            correlation = np.divide(numerator, denominator, out=np.ones_like(numerator), where=denominator > 0)
+            scene_changes = int((correlation < config.SCENE_CHANGE_CORRELATION).sum())
+            scene_change_fraction = scene_changes / (count - 1)
+        
+        avg_brightness = float(np.dot(weights, brightness))
+
+        return {
+            'brightness': brightness.tolist(),
+            'dominant_colors': dominant_colors.tolist(),
+            'has_faces': self.has_faces(frames),
+            'scene_changes': scene_changes,
+            'scene_change_fraction': scene_change_fraction,
+            'avg_brightness': avg_brightness,
+            'brightness_variance': float(np.dot(weights, (brightness - avg_brightness) ** 2)),
+            'frames_analyzed': count
+        }
@@ -11,7 +11,16 @@ from orchestrator import VideoOrchestrator
 import config
 
 app = Flask(__name__)
-orchestrator = VideoOrchestrator()
+# Consultas usam o orquestrador somente leitura (sem carregar modelos de IA)
+orchestrator = VideoOrchestrator(read_only=True)
+_processing_orchestrator = None
+
+def get_processing_orchestrator():
+    """Orquestrador completo, criado só no primeiro processamento"""
+    global _processing_orchestrator
+    if _processing_orchestrator is None:
+        _processing_orchestrator = VideoOrchestrator()
+    return _processing_orchestrator
 
 @app.route('/')
 def index():
@@ -29,7 +38,8 @@ def process_videos():
         if directory and os.path.exists(directory):
             try:
                 # Processa em background (em produção, use Celery ou similar)
-                results = orchestrator.process_directory(directory, recursive)
+                results = get_processing_orchestrator().process_directory(directory, recursive)
+                orchestrator.search_engine._update_search_index()
                 return jsonify({
                     'success': True,
                     'message': f'{len(results)} vídeos processados com sucesso',